@@ -1,25 +1,89 @@
+import click
 from dotenv import load_dotenv
-from flask import Flask, jsonify, make_response, Response, request
-from werkzeug.exceptions import BadRequest, Unauthorized
+from flask import Flask, g, jsonify, make_response, Response, request, stream_with_context
+from werkzeug.exceptions import BadRequest
 import logging
+import os
+import secrets
 
 from weather_app.db import db
 from weather_app.models import favorite_locations_model
+from weather_app.models.location_model import Location
 from weather_app.models.user_model import User
-from weather_app.utils.sql_utils import check_database_connection, check_table_exists
+from weather_app.utils.async_weather_client import AsyncWeatherClient
+from weather_app.utils.circuit_breaker import circuit_stats
+from weather_app.utils.prefetch import PrefetchScheduler
+from weather_app.utils.session_tokens import get_revocation_list, issue_token, require_session_token
+from weather_app.utils.sql_utils import check_database_health
 from weather_app.utils.weather_client import WeatherClient
+from weather_app.utils.weather_results import format_text, WeatherJSONProvider
 
-from config import TestConfig
-from weather_app.utils.weather_client import WeatherClient 
+from config import get_config
 # Load environment variables from .env file
 load_dotenv()
-def create_app(config_class=TestConfig):
-    app = Flask(__name__)
-    app.config.from_object(config_class)
+# Tables that must exist for /api/db-check to report healthy
+DB_CHECK_TABLES = ("users", "favorite_locations")
 
+def create_app(config_class=None):
+    app = Flask(__name__)
+    app.json = WeatherJSONProvider(app)  # Serialize weather results with to_dict, not dataclasses.asdict
+    # Without an explicit config class, APP_CONFIG selects one (production by default)
+    app.config.from_object(config_class or get_config())
+
+    if not app.config.get('SECRET_KEY'):
+        # Tokens signed with a per-process key are only accepted by the worker that issued them
+        if app.config.get('REQUIRE_SECRET_KEY'):
+            raise ValueError("SECRET_KEY must be set; a random per-process key would make every other worker "
+                             "reject the session tokens it signs")
+        app.logger.warning("SECRET_KEY is not set; using a random key for session tokens")
+        app.config['SECRET_KEY'] = secrets.token_hex(32)
+
+    # The schema is created once with `flask db-init`, not on every worker start
     db.init_app(app)  # Initialize db with app
-    with app.app_context():
-            db.create_all()  # Recreate all tables
+
+    # One pooled, keep-alive weather client shared by every request in this process
+    weather_client = WeatherClient.from_config(app.config)
+    app.extensions['weather_client'] = weather_client
+
+    if app.config.get('WEATHER_PREFETCH_ENABLED'):
+        # Keep favorite locations warm from inside this process
+        scheduler = PrefetchScheduler(app, weather_client)
+        app.extensions['prefetch_scheduler'] = scheduler
+        if not app.config.get('WEATHER_PREFETCH_DEFERRED'):
+            scheduler.start()
+        # Otherwise this is a preloading gunicorn master, which must not fork a running thread;
+        # post_fork in gunicorn.conf.py starts the scheduler in each worker
+
+    @app.cli.command('db-init')
+    def db_init() -> None:
+        """
+        Command to create any missing tables. Existing tables and their rows are left alone.
+        """
+        db.create_all()
+        click.echo(f"Database schema is up to date ({len(db.metadata.tables)} tables).")
+
+    @app.cli.command('backfill-locations')
+    def backfill_locations() -> None:
+        """
+        Command to link existing favorite locations to the shared location catalog.
+
+        Run after sql/migrations/001_create_locations.sql.
+        """
+        linked = favorite_locations_model.FavoriteLocations.backfill_location_ids()
+        geocoded = Location.fill_coordinates_from_geocode_cache()
+        click.echo(f"Linked {linked} favorite locations; copied coordinates into {geocoded} locations.")
+
+    @app.cli.command('prefetch-weather')
+    @click.option('--once', is_flag=True, help='Run a single prefetch pass and exit.')
+    def prefetch_weather(once: bool) -> None:
+        """
+        Command to keep the cached weather for favorite locations warm.
+        """
+        scheduler = PrefetchScheduler(app, weather_client)
+        if once:
+            click.echo(scheduler.run_once())
+        else:
+            scheduler.run_forever()
 
     ####################################################
     #
@@ -39,10 +103,29 @@ def create_app(config_class=TestConfig):
         return make_response(jsonify({'status': 'healthy'}), 200)
 
 
+    @app.route('/api/weather-stats', methods=['GET'])
+    def weather_stats() -> Response:
+        """
+        Route to report how the weather client reuses connections and cached responses, and how much upstream quota it uses.
+
+        Returns:
+            JSON response with connection, cache, request coalescing, rate limit and circuit breaker statistics.
+        """
+        app.logger.info('Weather stats')
+        return make_response(jsonify({
+            'connections': weather_client.connection_stats(),
+            'cache': weather_client.cache.stats,
+            'sharing': weather_client.cache.sharing_stats(),
+            'coalescing': weather_client.cache.coalescing_stats(),
+            'rate_limits': weather_client.rate_limiter.stats(),
+            'circuits': circuit_stats(),
+        }), 200)
+
+
     @app.route('/api/db-check', methods=['GET'])
     def db_check() -> Response:
         """
-        Route to check if the database connection and songs table are functional.
+        Route to check if the database connection and the users and favorite_locations tables are functional.
 
         Returns:
             JSON response indicating the database health status.
@@ -50,18 +133,10 @@ def create_app(config_class=TestConfig):
             404 error if there is an issue with the database.
         """
         try:
-            app.logger.info("Checking database connection...")
-            check_database_connection()
-            app.logger.info("Database connection is OK.")
-            app.logger.info("Checking if songs table exists...")
-            check_table_exists("favorite_locations")
-            app.logger.info("Favorite_locations table exists.")
-            app.logger.info("Checking if users table exists")
-            check_table_exists("users")
-            app.logger.info("Users table exists")
-            app.logger.info("Checking if favorite_locations table exists")
-            check_table_exists("favorite_locations")
-            app.logger.info("Favorite_locations table exists")
+            app.logger.info("Checking database connection and tables...")
+            # One pooled query covers the connection and every table; results are reused for a few seconds
+            check_database_health(DB_CHECK_TABLES)
+            app.logger.info("Database connection is OK and tables %s exist.", ", ".join(DB_CHECK_TABLES))
             return make_response(jsonify({'database_status': 'healthy'}), 200)
         except Exception as e:
             return make_response(jsonify({'error': str(e)}), 404)
@@ -130,24 +205,96 @@ def create_app(config_class=TestConfig):
             return make_response(jsonify({'error': str(e)}), 500)
 
 
+    @app.route('/api/delete-favorite-by-id/<int:user_id>/<int:favorite_id>', methods=['DELETE'])
+    def delete_location_by_id(user_id: int, favorite_id: int) -> Response:
+        """
+        Route to delete a favorite location by its ID.
+
+        Path Parameter:
+            - user_id (int): The ID of the user.
+            - favorite_id (int): The ID of the favorite location to delete
+
+        Returns:
+            JSON response indicating success of the operation or error message.
+        """
+        try:
+            app.logger.info(f"Deleting location by ID: {favorite_id}")
+            favorite_locations_model.FavoriteLocations.delete_favorite_by_id(user_id=user_id, favorite_id=favorite_id)
+            return make_response(jsonify({'status': 'success'}), 200)
+        except ValueError as e:
+            app.logger.error(f"Error deleting location: {e}")
+            return make_response(jsonify({'error': str(e)}), 404)
+        except Exception as e:
+            app.logger.error(f"Error deleting location: {e}")
+            return make_response(jsonify({'error': str(e)}), 500)
+
+
+    @app.route('/api/favorites/bulk', methods=['POST', 'DELETE'])
+    def bulk_favorites() -> Response:
+        """
+        Route to add (POST) or delete (DELETE) many favorite locations in one transaction.
+
+        Expected JSON Input:
+            - user_id (int): The user ID.
+            - location_names (list[str]): The locations to add or delete.
+
+        Returns:
+            JSON response with the outcome of each location, in input order.
+        Raises:
+            400 error if input validation fails or the user does not exist.
+            500 error if there is an issue writing the favorites.
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            user_id = data.get('user_id')
+            location_names = data.get('location_names')
+            if not isinstance(user_id, int) or not isinstance(location_names, list):
+                app.logger.error('Invalid input: user_id and a list of location_names are required')
+                return make_response(jsonify({'error': 'Invalid input, user_id and a list of location_names are required'}), 400)
+
+            model = favorite_locations_model.FavoriteLocations
+            if request.method == 'POST':
+                app.logger.info('Adding %d locations to favorites', len(location_names))
+                results = model.add_favorites_bulk(user_id, location_names)
+            else:
+                app.logger.info('Deleting %d locations from favorites', len(location_names))
+                results = model.delete_favorites_bulk(user_id, location_names)
+            return make_response(jsonify({'status': 'success', 'results': results}), 200)
+        except ValueError as e:
+            app.logger.error("Invalid bulk favorites request: %s", str(e))
+            return make_response(jsonify({'error': str(e)}), 400)
+        except Exception as e:
+            app.logger.error("Failed to update favorites: %s", str(e))
+            return make_response(jsonify({'error': str(e)}), 500)
+
+
     @app.route('/api/get-favorites', methods=['GET'])
     def get_all_favorites() -> Response:
         """
-        Route to retrieve all favorites for specific user,
+        Route to retrieve one page of a user's favorites, in ID order.
 
-        Query Parameter:
+        Query Parameters:
+            - user_id (int): The user's ID.
+            - after_id (int, optional): The next_cursor of the previous page; omit for the first page.
+            - limit (int, optional): The page size.
 
         Returns:
-            JSON response with the list of songs or error message.
+            JSON response with the page of locations and the next_cursor (null on the last page), or error message.
         """
         try:
-            user_id = request.args.get("user_id")
-            if not user_id:
+            user_id = request.args.get("user_id", type=int)
+            after_id = request.args.get("after_id", default=0, type=int)
+            limit = request.args.get("limit", type=int)
+            if user_id is None:
                 app.logger.error("Invalid input: 'user_id' is required.")
-                
-            app.logger.info("Retrieving all favorites from the user's favorites")
-            locations = favorite_locations_model.FavoriteLocations.get_favorites(user_id=user_id)
-            return make_response(jsonify({'status': 'success', 'locations': locations}), 200)
+                return make_response(jsonify({'error': "Invalid input: 'user_id' is required"}), 400)
+
+            app.logger.info("Retrieving a page of favorites from the user's favorites")
+            page = favorite_locations_model.FavoriteLocations.get_favorites_page(user_id, after_id=after_id, limit=limit)
+            return make_response(jsonify({'status': 'success', **page}), 200)
+        except ValueError as e:
+            app.logger.error(f"Invalid page request: {e}")
+            return make_response(jsonify({'error': str(e)}), 400)
         except Exception as e:
             app.logger.error(f"Error retrieving locations: {e}")
             return make_response(jsonify({'error': str(e)}), 500)
@@ -166,7 +313,7 @@ def create_app(config_class=TestConfig):
         """
         try:
             app.logger.info(f"Retrieving weather at location: {location_id}")
-            weather = favorite_locations_model.FavoriteLocations.get_favorite_by_id(location_id, WeatherClient())
+            weather = favorite_locations_model.FavoriteLocations.get_favorite_by_id(location_id, weather_client)
             return make_response(jsonify({'status': 'success', 'song': weather}), 200)
         except Exception as e:
             app.logger.error(f"Error retrieving location by ID: {e}")
@@ -179,6 +326,7 @@ def create_app(config_class=TestConfig):
 
         Query Parameter:
             - location_name (str): The name of the desired location
+            - format (str, optional): "text" to render the weather as a human-readable string
 
         Returns:
             JSON response with the weather data or error message.
@@ -188,23 +336,125 @@ def create_app(config_class=TestConfig):
             if not location_name:
                 return make_response(jsonify({'error': "'location_name' query parameter is required"}), 400)
 
-            weather_client = WeatherClient()
             app.logger.info(f"Retrieving weather by location name: {location_name}")
             weather = favorite_locations_model.FavoriteLocations.get_weather_for_favorite(location_name, weather_client)
+            if request.args.get('format') == 'text':
+                weather = format_text(location_name, weather)
             return make_response(jsonify({'status': 'success', 'weather': weather}), 200)
         except Exception as e:
             app.logger.error(f"Error retrieving weather at location '{location_name}': {e}")
             return make_response(jsonify({'error': str(e)}), 500)
         
 
+    @app.route('/api/get-weather-dashboard', methods=['GET'])
+    def get_weather_dashboard() -> Response:
+        """
+        Route to retrieve the overview, daily, hourly and alerts views for a location.
+
+        All four views are derived from one OneCall document.
+
+        Query Parameter:
+            - location_name (str): The name of the desired location
+            - format (str, optional): "text" to render each view as a human-readable string
+
+        Returns:
+            JSON response with the weather views or error message.
+        """
+        location_name = request.args.get('location_name')
+        try:
+            if not location_name:
+                return make_response(jsonify({'error': "'location_name' query parameter is required"}), 400)
+
+            app.logger.info(f"Retrieving weather dashboard for location: {location_name}")
+            dashboard = favorite_locations_model.FavoriteLocations.get_weather_dashboard(location_name, weather_client)
+            if request.args.get('format') == 'text':
+                dashboard = format_text(location_name, dashboard)
+            return make_response(jsonify({'status': 'success', 'weather': dashboard}), 200)
+        except Exception as e:
+            app.logger.error(f"Error retrieving weather dashboard for '{location_name}': {e}")
+            return make_response(jsonify({'error': str(e)}), 500)
+
+
+    @app.route('/api/weather/batch', methods=['POST'])
+    def get_weather_batch() -> Response:
+        """
+        Route to retrieve the weather for many locations in one request.
+
+        Expected JSON Input:
+            - locations (list): Location names or objects with 'lat' and 'lon'.
+
+        Returns:
+            JSON response with one result per requested location, in request order.
+        Raises:
+            400 error if input validation fails.
+            500 error if there is an unexpected server-side issue.
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            locations = data.get('locations')
+            if not isinstance(locations, list) or not locations:
+                app.logger.error("Invalid input: 'locations' must be a non-empty list")
+                return make_response(jsonify({'error': "'locations' must be a non-empty list"}), 400)
+            if len(locations) > favorite_locations_model.WEATHER_BATCH_MAX_LOCATIONS:
+                app.logger.error("Invalid input: %d locations requested", len(locations))
+                return make_response(jsonify({'error': f"At most {favorite_locations_model.WEATHER_BATCH_MAX_LOCATIONS} locations can be requested at once"}), 400)
+
+            app.logger.info("Retrieving weather for a batch of %d locations", len(locations))
+            results = favorite_locations_model.FavoriteLocations.get_weather_for_locations(locations, weather_client)
+            return make_response(jsonify({'status': 'success', 'results': results}), 200)
+        except Exception as e:
+            app.logger.error(f"Error retrieving weather batch: {e}")
+            return make_response(jsonify({'error': str(e)}), 500)
+
+
+    @app.route('/api/history', methods=['GET'])
+    def get_history() -> Response:
+        """
+        Route to stream the weather summary of every date in a range.
+
+        Query Parameter:
+            - location_name (str): The name of the desired location
+            - start (str): The first date in YYYY-MM-DD format
+            - end (str): The last date in YYYY-MM-DD format
+
+        Returns:
+            NDJSON response with one line per date, in date order, streamed while missing dates are fetched.
+        Raises:
+            400 error if input validation fails.
+            500 error if there is an unexpected server-side issue.
+        """
+        location_name = request.args.get('location_name')
+        start, end = request.args.get('start'), request.args.get('end')
+        if not location_name or not start or not end:
+            app.logger.error("Invalid input: 'location_name', 'start' and 'end' are required")
+            return make_response(jsonify({'error': "'location_name', 'start' and 'end' query parameters are required"}), 400)
+
+        try:
+            app.logger.info(f"Retrieving history for {location_name} from {start} to {end}")
+            results = favorite_locations_model.FavoriteLocations.get_history(location_name, start, end, weather_client)
+        except ValueError as e:
+            app.logger.error(f"Invalid history request for '{location_name}': {e}")
+            return make_response(jsonify({'error': str(e)}), 400)
+        except Exception as e:
+            app.logger.error(f"Error retrieving history for '{location_name}': {e}")
+            return make_response(jsonify({'error': str(e)}), 500)
+
+        def generate():
+            for result in results:
+                yield app.json.dumps(result) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
     @app.route('/api/get-all-favorites-with-weather', methods=['GET'])
 
     def get_weather_for_favorites() -> Response:
         """
         Route to retrieve weather information for all favorite locations of a user.
 
-        Expected JSON Input:
+        Query Parameter:
             - user_id (int): The ID of the user.
+            - format (str, optional): "text" to render each location's weather as a human-readable string
 
         Returns:
             JSON response with the list of favorite locations and their weather data.
@@ -214,13 +464,13 @@ def create_app(config_class=TestConfig):
             if not user_id:
                 app.logger.error("Invalid input: 'user_id' is required.")
 
-            app.logger.info("Fetching weather data for all favorite locations for user_id %d", user_id)
-
-
-            
-            weather_client = WeatherClient()
+            app.logger.info("Fetching weather data for all favorite locations for user_id %s", user_id)
 
             locations_with_weather = favorite_locations_model.FavoriteLocations.get_all_favorites_with_weather(user_id, weather_client)
+            if request.args.get('format') == 'text':
+                for location in locations_with_weather:
+                    if 'weather' in location:
+                        location['weather'] = format_text(location['location_name'], location['weather'])
             return make_response(jsonify({'status': 'success', 'locations': locations_with_weather}), 200)
 
         except Exception as e:
@@ -228,6 +478,78 @@ def create_app(config_class=TestConfig):
             return make_response(jsonify({'error': str(e)}), 500)
         
 
+    ####################################################
+    #
+    # Async Weather
+    #
+    ####################################################
+
+    # Flask runs each async view on its own event loop, so every request opens a fresh
+    # AsyncWeatherClient; the response and geocode caches are still shared, and stale
+    # entries are refreshed by the shared weather client, which outlives the request.
+    def async_weather_client() -> AsyncWeatherClient:
+        return AsyncWeatherClient.from_config(app.config, cache=weather_client.cache, refresh_client=weather_client)
+
+    @app.route('/api/async/get-weather-for-favorite', methods=['GET'])
+    async def get_weather_for_favorite_async() -> Response:
+        """
+        Route to retrieve the weather at a specific location by its name, without blocking on the weather API.
+
+        Query Parameter:
+            - location_name (str): The name of the desired location
+            - format (str, optional): "text" to render the weather as a human-readable string
+
+        Returns:
+            JSON response with the weather data or error message.
+        """
+        location_name = request.args.get('location_name')
+        try:
+            if not location_name:
+                return make_response(jsonify({'error': "'location_name' query parameter is required"}), 400)
+
+            app.logger.info(f"Retrieving weather by location name: {location_name}")
+            async with async_weather_client() as client:
+                weather = await favorite_locations_model.FavoriteLocations.get_weather_for_favorite_async(location_name, client)
+            if request.args.get('format') == 'text':
+                weather = format_text(location_name, weather)
+            return make_response(jsonify({'status': 'success', 'weather': weather}), 200)
+        except Exception as e:
+            app.logger.error(f"Error retrieving weather at location '{location_name}': {e}")
+            return make_response(jsonify({'error': str(e)}), 500)
+
+
+    @app.route('/api/async/get-all-favorites-with-weather', methods=['GET'])
+    async def get_weather_for_favorites_async() -> Response:
+        """
+        Route to retrieve weather information for all favorite locations of a user, fetched concurrently on one event loop.
+
+        Query Parameter:
+            - user_id (int): The ID of the user.
+            - format (str, optional): "text" to render each location's weather as a human-readable string
+
+        Returns:
+            JSON response with the list of favorite locations and their weather data.
+        """
+        try:
+            user_id = request.args.get("user_id")
+            if not user_id:
+                app.logger.error("Invalid input: 'user_id' is required.")
+                return make_response(jsonify({'error': "'user_id' query parameter is required"}), 400)
+
+            app.logger.info("Fetching weather data for all favorite locations for user_id %s", user_id)
+            async with async_weather_client() as client:
+                locations_with_weather = await favorite_locations_model.FavoriteLocations.get_all_favorites_with_weather_async(user_id, client)
+            if request.args.get('format') == 'text':
+                for location in locations_with_weather:
+                    if 'weather' in location:
+                        location['weather'] = format_text(location['location_name'], location['weather'])
+            return make_response(jsonify({'status': 'success', 'locations': locations_with_weather}), 200)
+
+        except Exception as e:
+            app.logger.error(f"Error retrieving weather data for favorites: {e}")
+            return make_response(jsonify({'error': str(e)}), 500)
+
+
     ############################################################
     #
     # User Management
@@ -293,10 +615,13 @@ def create_app(config_class=TestConfig):
                     app.logger.error("Invalid login payload.")
                     raise BadRequest("Both username and password are required.")
             
-            if User.check_password(username, password):
-                    user_id = User.get_id_by_username(username)
+            # One query both verifies the password and returns the user's ID
+            user_id = User.authenticate(username, password)
+            if user_id is not None:
                     app.logger.info(f"User '{username}' logged in successfully")
-                    return make_response(jsonify({'status': 'success', 'message': 'Login successful', 'user_id': user_id}), 200)
+                    token, expires_at = issue_token(user_id, app.config['SECRET_KEY'])
+                    return make_response(jsonify({'status': 'success', 'message': 'Login successful', 'user_id': user_id,
+                                                  'token': token, 'expires_at': expires_at}), 200)
             else:
                 app.logger.warning(f"Invalid login attempt for username '{username}'")
                 return make_response(jsonify({'status': 'error', 'error': 'Invalid username or password'}), 401)
@@ -307,6 +632,22 @@ def create_app(config_class=TestConfig):
 
 
 
+    @app.route('/api/logout', methods=['POST'])
+    @require_session_token
+    def logout() -> Response:
+        """
+        Route to revoke the session token sent with the request.
+
+        Returns:
+            JSON response indicating the success of the logout.
+        Raises:
+            401 error if the session token is missing, invalid, expired or already revoked.
+        """
+        get_revocation_list().revoke(g.session_claims['jti'], g.session_claims['exp'])
+        app.logger.info("User %d logged out", g.user_id)
+        return make_response(jsonify({'status': 'success', 'message': 'Logged out'}), 200)
+
+
     @app.route('/api/update-password', methods=['PUT'])
     def update_password() -> Response:
         """
@@ -328,13 +669,11 @@ def create_app(config_class=TestConfig):
                 app.logger.error("Invalid input: 'username', 'old_password', and 'new_password' are required.")
                 raise BadRequest("All fields ('username', 'old_password', 'new_password') are required.")
 
-            # Verify current password
-            if not User.check_password(username=username, password=old_password):
+            # Verify the current password and update it on the same loaded row
+            if not User.change_password(username, old_password, new_password):
                 app.logger.warning(f"Password mismatch for user '{username}'.")
-                raise Unauthorized("Current password is incorrect.")
+                return make_response(jsonify({'error': 'Current password is incorrect.'}), 401)
 
-            # Update password
-            User.update_password(username=username, new_password=new_password)
             app.logger.info(f"Password updated successfully for user '{username}'.")
 
             return make_response(jsonify({'status': 'success', 'message': 'Password updated successfully'}), 200)
@@ -345,5 +684,6 @@ def create_app(config_class=TestConfig):
     return app
 
 if __name__ == '__main__':
-    app = create_app()
+    # The development server runs one process, so it does not need SECRET_KEY set
+    app = create_app(get_config(os.getenv('APP_CONFIG', 'development')))
     app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+Compares deleting favorites by loading them first with the single-statement deletes.
+
+Usage: python benchmarks/delete_favorite_benchmark.py [--favorites 2000]
+
+Each path deletes the same number of favorites, one call per favorite, from a fresh
+SQLite file using the app's pragma profile.
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from weather_app.db import db  # noqa: E402
+from weather_app.models.favorite_locations_model import FAVORITES_BULK_MAX_ITEMS, FavoriteLocations  # noqa: E402
+from weather_app.models.user_model import User  # noqa: E402
+
+
+def make_config(database_uri: str) -> type:
+    return type("BenchmarkConfig", (), {
+        "SQLALCHEMY_DATABASE_URI": database_uri,
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+    })
+
+
+def load_then_delete(user_id: int, location_name: str) -> None:
+    """The previous delete path: SELECT the row, delete the ORM object, commit."""
+    favorite = FavoriteLocations.query.filter_by(user_id=user_id, location_name=location_name).first()
+    if not favorite:
+        raise ValueError(f"Location '{location_name}' not found.")
+    db.session.delete(favorite)
+    db.session.commit()
+
+
+def add_favorites(count: int) -> list:
+    names = [f"City {i}" for i in range(count)]
+    for start in range(0, count, FAVORITES_BULK_MAX_ITEMS):
+        FavoriteLocations.add_favorites_bulk(1, names[start:start + FAVORITES_BULK_MAX_ITEMS])
+    return FavoriteLocations.get_favorites(1)
+
+
+def time_path(label: str, delete, favorites: list) -> None:
+    started = time.perf_counter()
+    for favorite in favorites:
+        delete(favorite)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<24} {elapsed / len(favorites) * 1e6:8.1f} us per delete")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--favorites", type=int, default=2000, help="favorites deleted per path")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)  # The models log every call
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app(make_config(f"sqlite:///{os.path.join(directory, 'weather_app.db')}"))
+        with app.app_context():
+            db.create_all()
+            User.create_user("benchmark", "password")
+
+            time_path("select + session.delete", lambda fav: load_then_delete(1, fav["location_name"]),
+                      add_favorites(args.favorites))
+            time_path("delete by name", lambda fav: FavoriteLocations.delete_favorite(1, fav["location_name"]),
+                      add_favorites(args.favorites))
+            time_path("delete by id", lambda fav: FavoriteLocations.delete_favorite_by_id(1, fav["id"]),
+                      add_favorites(args.favorites))
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
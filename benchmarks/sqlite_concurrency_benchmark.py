@@ -0,0 +1,109 @@
+"""
+Measures favorite read/write throughput on one SQLite file with several worker processes.
+
+Usage: python benchmarks/sqlite_concurrency_benchmark.py [--writers 4] [--readers 4] [--seconds 5]
+
+Each SQLite pragma profile (see weather_app/db.py) gets a fresh database. Writers add
+favorites and readers list them, like gunicorn workers serving add-favorite and
+get-favorites; failed operations, e.g. "database is locked", are counted separately.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+USERS = 8
+
+
+def make_config(database_uri: str) -> type:
+    return type("BenchmarkConfig", (), {
+        "SQLALCHEMY_DATABASE_URI": database_uri,
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+    })
+
+
+def worker(database_uri: str, role: str, index: int, seconds: float, results) -> None:
+    logging.disable(logging.INFO)  # The models log every call
+    from app import create_app
+    from weather_app.models.favorite_locations_model import FavoriteLocations
+
+    app = create_app(make_config(database_uri))
+    ok = failed = 0
+    with app.app_context():
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            user_id = (ok + failed) % USERS + 1
+            try:
+                if role == "writer":
+                    FavoriteLocations.add_favorite(user_id, f"city {index}-{ok + failed}")
+                else:
+                    FavoriteLocations.get_favorites(user_id)
+                ok += 1
+            except Exception:
+                failed += 1
+    results.put((role, ok, failed))
+
+
+def create_schema(database_uri: str) -> None:
+    logging.disable(logging.INFO)
+    from app import create_app
+    from weather_app.db import db
+    from weather_app.models.user_model import User
+
+    app = create_app(make_config(database_uri))
+    with app.app_context():
+        db.create_all()
+        for i in range(USERS):
+            User.create_user(f"user{i}", "password")
+
+
+def run_profile(profile: str, writers: int, readers: int, seconds: float) -> None:
+    # Spawned workers import weather_app.db afresh, so they pick up the profile
+    os.environ["SQLITE_PRAGMA_PROFILE"] = profile
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_uri = f"sqlite:///{os.path.join(directory, 'weather_app.db')}"
+        setup = context.Process(target=create_schema, args=(database_uri,))
+        setup.start()
+        setup.join()
+
+        results = context.Queue()
+        processes = [context.Process(target=worker, args=(database_uri, "writer", i, seconds, results))
+                     for i in range(writers)]
+        processes += [context.Process(target=worker, args=(database_uri, "reader", i, seconds, results))
+                      for i in range(readers)]
+        for process in processes:
+            process.start()
+        totals = {"writer": [0, 0], "reader": [0, 0]}
+        for _ in processes:
+            role, ok, failed = results.get()
+            totals[role][0] += ok
+            totals[role][1] += failed
+        for process in processes:
+            process.join()
+
+    for role, (ok, failed) in totals.items():
+        print(f"{profile:<8} {role + 's':<8} {ok / seconds:9.1f} ops/s   {failed:6d} failed")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=4, help="writer processes")
+    parser.add_argument("--readers", type=int, default=4, help="reader processes")
+    parser.add_argument("--seconds", type=float, default=5, help="duration per profile")
+    parser.add_argument("--profiles", nargs="+", default=["legacy", "wal"], help="pragma profiles to compare")
+    args = parser.parse_args()
+
+    for profile in args.profiles:
+        run_profile(profile, args.writers, args.readers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
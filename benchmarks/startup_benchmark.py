@@ -0,0 +1,64 @@
+"""
+Measures how long building the app takes, with and without creating the schema on startup.
+
+Usage: python benchmarks/startup_benchmark.py [--runs 50]
+
+Both variants run against the same SQLite file, whose schema already exists, which is
+what every worker boot after the first one used to see.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from weather_app.db import db  # noqa: E402
+
+
+def make_config(database_uri: str) -> type:
+    return type("BenchmarkConfig", (), {
+        "SQLALCHEMY_DATABASE_URI": database_uri,
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+    })
+
+
+def time_startup(config: type, create_schema: bool, runs: int) -> list:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        app = create_app(config)
+        if create_schema:
+            with app.app_context():
+                db.create_all()
+        samples.append(time.perf_counter() - started)
+        with app.app_context():
+            db.engine.dispose()
+    return samples
+
+
+def report(label: str, samples: list) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{label:<24} median {statistics.median(samples) * 1000:7.2f} ms   p95 {p95 * 1000:7.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50, help="app builds per variant")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        config = make_config(f"sqlite:///{os.path.join(directory, 'weather_app.db')}")
+        # The equivalent of `flask db-init`, run once
+        time_startup(config, create_schema=True, runs=1)
+
+        report("create_all on startup", time_startup(config, create_schema=True, runs=args.runs))
+        report("schema created once", time_startup(config, create_schema=False, runs=args.runs))
+
+
+if __name__ == "__main__":
+    main()
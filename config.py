@@ -7,9 +7,48 @@ class ProductionConfig():
                                            # But we are doing unnecessarily complicated Redis
                                            # write-throughs
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', "sqlite:////" + os.path.abspath(os.path.dirname(__file__)) + "/weather_app.db")
+    WEATHER_POOL_SIZE = int(os.getenv('WEATHER_POOL_SIZE', 10))  # Kept-alive connections per upstream host
+    WEATHER_CONNECT_TIMEOUT = float(os.getenv('WEATHER_CONNECT_TIMEOUT', 3.05))
+    WEATHER_READ_TIMEOUT = float(os.getenv('WEATHER_READ_TIMEOUT', 10))
+    WEATHER_PREFETCH_ENABLED = os.getenv('WEATHER_PREFETCH_ENABLED', 'false').lower() == 'true'  # Prefetch inside the web process
+    WEATHER_PREFETCH_DEFERRED = os.getenv('WEATHER_PREFETCH_DEFERRED', 'false').lower() == 'true'  # Set by gunicorn.conf.py when preloading
+    SECRET_KEY = os.getenv('SECRET_KEY')  # Signs session tokens; must be the same in every worker
+    REQUIRE_SECRET_KEY = True  # create_app refuses to start without SECRET_KEY
+
+class DevelopmentConfig(ProductionConfig):
+    """Development server configuration."""
+    DEBUG = True
+    REQUIRE_SECRET_KEY = False  # A single process can sign with a random key
 
 class TestConfig():
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # Use in-memory database for tests
\ No newline at end of file
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # Use in-memory database for tests
+    SECRET_KEY = 'test-secret-key'
+
+
+CONFIGS = {
+    'production': ProductionConfig,
+    'development': DevelopmentConfig,
+    'test': TestConfig,
+}
+
+
+def get_config(name=None):
+    """
+    Returns the config class selected by name, or by the APP_CONFIG environment variable.
+
+    Args:
+        name (str, optional): "production", "development" or "test". Defaults to APP_CONFIG, then "production".
+
+    Returns:
+        type: The config class.
+
+    Raises:
+        ValueError: If the name is not a known config.
+    """
+    name = (name or os.getenv('APP_CONFIG', 'production')).lower()
+    if name not in CONFIGS:
+        raise ValueError(f"Unknown APP_CONFIG '{name}'; expected one of: {', '.join(CONFIGS)}")
+    return CONFIGS[name]
@@ -10,8 +10,14 @@ if [ "$CREATE_DB" = "true" ]; then
     echo "Creating the database..."
     /app/sql/create_db.sh
 else
-    echo "Skipping database creation."
+    # Creates any missing tables once, before the workers start; existing data is kept
+    echo "Creating any missing tables..."
+    flask --app wsgi db-init
 fi
 
-# Start the Python application
-exec python app.py
+# Start the application: gunicorn by default, or the Flask development server with APP_SERVER=dev
+if [ "$APP_SERVER" = "dev" ]; then
+    exec python app.py
+else
+    exec gunicorn --config gunicorn.conf.py wsgi:app
+fi
@@ -0,0 +1,64 @@
+"""
+Gunicorn settings for serving wsgi:app in production, read from the environment.
+"""
+import multiprocessing
+import os
+
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5001")
+# Requests mostly wait on the weather API, so threaded workers keep a core busy with several requests at once
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+if workers > 1:
+    # In-memory backends are per process: every worker would cache alone and spend the whole upstream quota
+    os.environ.setdefault("WEATHER_CACHE_BACKEND", "sqlite")
+    os.environ.setdefault("RATE_LIMIT_BACKEND", "sqlite")
+    os.environ.setdefault("SESSION_REVOCATION_BACKEND", "sqlite")
+    # Every worker starts an in-process prefetch scheduler; the lock lets only one of them run passes
+    os.environ.setdefault("WEATHER_PREFETCH_LOCK_PATH", "./db/prefetch.lock")
+    if os.environ["RATE_LIMIT_BACKEND"] == "memory":
+        raise ValueError(f"RATE_LIMIT_BACKEND=memory would give each of the {workers} workers its own upstream "
+                         "quota; use the sqlite backend or set GUNICORN_WORKERS=1")
+    if os.environ["SESSION_REVOCATION_BACKEND"] == "memory":
+        raise ValueError(f"SESSION_REVOCATION_BACKEND=memory would let {workers - 1} of the {workers} workers accept "
+                         "a logged-out token; use the sqlite backend or set GUNICORN_WORKERS=1")
+worker_class = "gthread"
+# Seconds an idle client connection is kept open for its next request
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# Seconds a silent worker may run before it is killed and restarted
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+# Seconds workers get to finish in-flight requests on restart or shutdown
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+# Recycle workers periodically so slow leaks cannot grow without bound
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+# Build the app once in the master and fork workers from it: faster worker starts and shared memory pages
+preload_app = os.getenv("GUNICORN_PRELOAD", "false").lower() == "true"
+if preload_app:
+    # Threads do not survive a fork, so the master leaves the prefetch scheduler to the workers (see post_fork)
+    os.environ["WEATHER_PREFETCH_DEFERRED"] = "true"
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    """
+    Gives a worker forked from a preloaded master its own connections and background threads.
+
+    Database connections and the weather client's HTTP session inherited from the master
+    are dropped, so no two processes share a socket, and the in-process prefetch scheduler,
+    which the master leaves unstarted, is started.
+    """
+    if not preload_app:
+        return
+    from weather_app.db import db
+    from wsgi import app
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+    app.extensions["weather_client"].reset_session()
+    scheduler = app.extensions.get("prefetch_scheduler")
+    if scheduler is not None:
+        scheduler.start()
@@ -1,5 +1,8 @@
 DROP TABLE IF EXISTS users;
 DROP TABLE IF EXISTS favorite_locations;
+DROP TABLE IF EXISTS geocode_cache;
+DROP TABLE IF EXISTS locations;
+DROP TABLE IF EXISTS weather_history;
 
 CREATE TABLE users (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -8,10 +11,47 @@ CREATE TABLE users (
     salt TEXT NOT NULL
 );
 
+CREATE TABLE locations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    normalized_name TEXT NOT NULL UNIQUE,
+    display_name TEXT NOT NULL,
+    latitude REAL,
+    longitude REAL,
+    provider TEXT,
+    geocoded_at TIMESTAMP
+);
+
 CREATE TABLE favorite_locations (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     user_id INTEGER NOT NULL,
     location_name TEXT NOT NULL,
+    location_id INTEGER,
     UNIQUE(user_id, location_name),
-    FOREIGN KEY (user_id) REFERENCES users(id)
+    FOREIGN KEY (user_id) REFERENCES users(id),
+    FOREIGN KEY (location_id) REFERENCES locations(id)
+);
+
+CREATE INDEX ix_favorite_locations_location_id ON favorite_locations (location_id);
+CREATE INDEX ix_favorite_locations_user_id_id ON favorite_locations (user_id, id);
+
+CREATE TABLE geocode_cache (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    normalized_name TEXT NOT NULL UNIQUE,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    provider TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE weather_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    location_id INTEGER NOT NULL,
+    date DATE NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    precipitation REAL NOT NULL,
+    humidity REAL NOT NULL,
+    fetched_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT weather_history_location_date_uc UNIQUE (location_id, date),
+    FOREIGN KEY (location_id) REFERENCES locations(id)
 );
\ No newline at end of file
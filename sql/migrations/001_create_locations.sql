@@ -0,0 +1,16 @@
+-- Adds the shared location catalog and links favorite_locations to it.
+-- After running this, link the existing rows with: flask --app app backfill-locations
+
+CREATE TABLE IF NOT EXISTS locations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    normalized_name TEXT NOT NULL UNIQUE,
+    display_name TEXT NOT NULL,
+    latitude REAL,
+    longitude REAL,
+    provider TEXT,
+    geocoded_at TIMESTAMP
+);
+
+ALTER TABLE favorite_locations ADD COLUMN location_id INTEGER REFERENCES locations(id);
+
+CREATE INDEX IF NOT EXISTS ix_favorite_locations_location_id ON favorite_locations (location_id);
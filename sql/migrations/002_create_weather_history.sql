@@ -0,0 +1,14 @@
+-- Adds the permanent store of day summaries for settled past dates.
+
+CREATE TABLE IF NOT EXISTS weather_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    location_id INTEGER NOT NULL,
+    date DATE NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    precipitation REAL NOT NULL,
+    humidity REAL NOT NULL,
+    fetched_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT weather_history_location_date_uc UNIQUE (location_id, date),
+    FOREIGN KEY (location_id) REFERENCES locations(id)
+);
@@ -0,0 +1,3 @@
+-- Adds the index that serves keyset pages of a user's favorites in ID order.
+
+CREATE INDEX IF NOT EXISTS ix_favorite_locations_user_id_id ON favorite_locations (user_id, id);
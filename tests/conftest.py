@@ -3,6 +3,18 @@ import pytest
 from app import create_app
 from config import TestConfig
 from weather_app.db import db
+from weather_app.utils.circuit_breaker import reset_circuit_breakers
+from weather_app.utils.rate_limiter import get_default_rate_limiter
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    """Refill the process-wide upstream quotas so tests do not throttle each other."""
+    get_default_rate_limiter().reset()
+
+@pytest.fixture(autouse=True)
+def close_circuits():
+    """Close every upstream circuit so one test's failures do not fail the next test fast."""
+    reset_circuit_breakers()
 
 @pytest.fixture
 def app():
@@ -0,0 +1,235 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from weather_app.db import db
+from weather_app.models.favorite_locations_model import FavoriteLocations
+from weather_app.models.user_model import User
+from weather_app.utils import weather_client
+from weather_app.utils.async_weather_client import AsyncWeatherClient
+from weather_app.utils.circuit_breaker import get_circuit_breaker
+from weather_app.utils.weather_cache import MemoryCacheBackend, SQLiteCacheBackend, WeatherCache
+from weather_app.utils.weather_client import WeatherClient
+from weather_app.utils.weather_results import CurrentConditions, DaySummary
+
+from tests.test_weather_client import BOSTON, ONECALL_DOCUMENT
+
+
+DAY_SUMMARY_DOCUMENT = {
+    "date": "2024-12-11",
+    "temperature": {"max": 80, "min": 60},
+    "precipitation": {"total": 0.1},
+    "humidity": {"afternoon": 40},
+}
+
+@pytest.fixture(autouse=True)
+def boston_geocoded():
+    weather_client.geocode_lru.set("boston", BOSTON)
+    yield
+    weather_client.geocode_lru.clear()
+
+@pytest.fixture
+def requests_seen():
+    return []
+
+@pytest.fixture
+def transport(requests_seen):
+    """Fixture that answers OneCall and day_summary requests without the network."""
+    def handler(request):
+        requests_seen.append(request)
+        if request.url.path.endswith("day_summary"):
+            return httpx.Response(200, json=DAY_SUMMARY_DOCUMENT)
+        return httpx.Response(200, json=ONECALL_DOCUMENT)
+    return httpx.MockTransport(handler)
+
+def make_client(transport):
+    return AsyncWeatherClient(cache=WeatherCache(MemoryCacheBackend()), transport=transport)
+
+async def _views(client):
+    async with client:
+        return await asyncio.gather(
+            client.get_weather("Boston"),
+            client.get_daily_forecast("Boston"),
+            client.get_hourly_forecast("Boston"),
+        )
+
+def test_views_match_sync_client(transport, requests_seen):
+    """Test that the async views return the same results as WeatherClient."""
+    client = make_client(transport)
+    overview, daily, hourly = asyncio.run(_views(client))
+
+    assert overview == CurrentConditions("2024-12-11", 70, 69, 42, "clear sky", "Clear all day")
+    assert daily.high == 80 and daily.alerts == ("Wind advisory",)
+    assert hourly.time == "2024-12-11T12:00"
+    assert requests_seen[0].url.params["exclude"] == "minutely"
+
+def test_views_use_response_cache(transport, requests_seen):
+    """Test that a cached OneCall document is not fetched again."""
+    client = make_client(transport)
+    asyncio.run(_views(client))
+    count = len(requests_seen)
+
+    asyncio.run(_views(client))
+    assert len(requests_seen) == count
+    assert client.cache.stats["hits"] >= 3
+
+def test_get_date_forecast(transport):
+    """Test that the day summary is fetched and parsed."""
+    async def fetch(client):
+        async with client:
+            return await client.get_date_forecast("Boston", "2024-12-11")
+
+    assert asyncio.run(fetch(make_client(transport))) == DaySummary("2024-12-11", 80, 60, 0.1, 40)
+
+def test_http_error_is_value_error():
+    """Test that upstream failures are reported as ValueError."""
+    client = make_client(httpx.MockTransport(lambda request: httpx.Response(503)))
+
+    async def fetch():
+        async with client:
+            return await client.get_weather("Boston")
+
+    with pytest.raises(ValueError, match="Error fetching weather data for location 'Boston'"):
+        asyncio.run(fetch())
+
+def test_client_requires_context_manager(transport):
+    """Test that fetching outside `async with` fails clearly."""
+    with pytest.raises(RuntimeError):
+        asyncio.run(make_client(transport).get_weather("Boston"))
+
+def test_geocode_thread_gets_its_own_session(session, transport, mocker):
+    """Test that geocoding off the event loop does not share the caller's database session."""
+    seen = []
+
+    def fake_get_lat_long(location_name):
+        seen.append(db.session())
+        return BOSTON
+
+    mocker.patch("weather_app.utils.async_weather_client.get_lat_long", side_effect=fake_get_lat_long)
+
+    async def fetch():
+        async with make_client(transport) as client:
+            return await client.get_weather("Cambridge")
+
+    assert asyncio.run(fetch()).temperature == 70
+    assert seen and seen[0] is not db.session()
+
+def test_sqlite_cache_is_read_off_the_event_loop(transport, requests_seen, tmp_path):
+    """Test that a sqlite-backed cache is read and written on worker threads."""
+    backend = SQLiteCacheBackend(str(tmp_path / "weather_cache.db"))
+    threads = []
+    for name in ("get", "set"):
+        method = getattr(backend, name)
+        setattr(backend, name, lambda *args, method=method: threads.append(threading.get_ident()) or method(*args))
+    client = AsyncWeatherClient(cache=WeatherCache(backend), transport=transport)
+
+    asyncio.run(_views(client))
+    count = len(requests_seen)
+    asyncio.run(_views(client))
+    assert len(requests_seen) == count
+    assert threads and threading.get_ident() not in threads
+
+def test_stale_entries_refresh_through_shared_client(transport, requests_seen, mocker):
+    """Test that background refreshes use the long-lived sync client, not a per-request pool."""
+    cache = WeatherCache(MemoryCacheBackend(), ttls={"onecall": 0})
+    shared = WeatherClient(cache=cache)
+    response = mocker.Mock(json=mocker.Mock(return_value=ONECALL_DOCUMENT))
+    session_get = mocker.patch.object(shared.session, "get", return_value=response)
+    sync_clients = mocker.spy(httpx, "Client")
+
+    for _ in range(3):
+        asyncio.run(_views(AsyncWeatherClient(cache=cache, transport=transport, refresh_client=shared)))
+    for _ in range(100):
+        if session_get.called and not cache._refreshing:
+            break
+        time.sleep(0.01)
+
+    assert session_get.called and cache.stats["refreshes"] >= 1
+    sync_clients.assert_not_called()
+
+def test_all_favorites_with_weather_async_reports_errors(session, transport):
+    """Test that the async fan-out keeps order and isolates failures."""
+    User.create_user("testuser", "password123")
+    FavoriteLocations.add_favorite(1, "Boston")
+    FavoriteLocations.add_favorite(1, "Atlantis")
+    weather_client.geocode_lru.set("atlantis", (0.0, 0.0))
+
+    async def handler(request):
+        if request.url.params["lat"] == "0.0":
+            return httpx.Response(500)
+        return httpx.Response(200, json=ONECALL_DOCUMENT)
+
+    async def fetch():
+        async with make_client(httpx.MockTransport(handler)) as client:
+            return await FavoriteLocations.get_all_favorites_with_weather_async(1, client)
+
+    boston, atlantis = asyncio.run(fetch())
+    assert boston["location_name"] == "Boston" and boston["weather"].temperature == 70
+    assert "error" in atlantis and "weather" not in atlantis
+
+def test_all_favorites_with_weather_async_deadline(session):
+    """Test that a slow fetch is reported as timed out."""
+    User.create_user("testuser", "password123")
+    FavoriteLocations.add_favorite(1, "Boston")
+
+    async def handler(request):
+        await asyncio.sleep(1)
+        return httpx.Response(200, json=ONECALL_DOCUMENT)
+
+    async def fetch():
+        async with make_client(httpx.MockTransport(handler)) as client:
+            return await FavoriteLocations.get_all_favorites_with_weather_async(1, client, deadline=0.05)
+
+    (boston,) = asyncio.run(fetch())
+    assert boston["error"] == "Timed out after 0.05 seconds"
+
+def test_async_weather_route(client, mocker):
+    """Test that the async route returns structured JSON."""
+    conditions = CurrentConditions("2024-12-11", 70, 69, 42, "clear sky", "Clear all day")
+    mocker.patch.object(AsyncWeatherClient, "get_weather", return_value=conditions)
+
+    response = client.get("/api/async/get-weather-for-favorite?location_name=Boston")
+    assert response.status_code == 200
+    assert response.get_json()["weather"] == conditions.to_dict()
+
+def test_open_circuit_is_shared_with_sync_client(transport, requests_seen):
+    """Test that the async client fails fast on a circuit opened by WeatherClient failures."""
+    breaker = get_circuit_breaker("onecall")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    async def fetch():
+        async with make_client(transport) as client:
+            return await client.get_weather("Boston")
+
+    with pytest.raises(ValueError, match="Weather API 'onecall' is unavailable"):
+        asyncio.run(fetch())
+    assert requests_seen == []
+
+def test_cancelled_probe_releases_half_open_circuit(mocker):
+    """Test that cancelling the half-open probe lets the next call probe again."""
+    breaker = get_circuit_breaker("onecall")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    mocker.patch.object(breaker, "reset_seconds", 0)
+
+    async def handler(request):
+        await asyncio.sleep(1)
+        return httpx.Response(200, json=ONECALL_DOCUMENT)
+
+    async def fetch():
+        async with make_client(httpx.MockTransport(handler)) as client:
+            probe = asyncio.create_task(client.get_weather("Boston"))
+            await asyncio.sleep(0.05)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+
+    asyncio.run(fetch())
+    assert breaker.snapshot()["state"] == "half_open"
+    breaker.before_call()  # The probe slot is free again
+    breaker.record_success()
+    assert breaker.snapshot()["state"] == "closed"
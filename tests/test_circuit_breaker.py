@@ -0,0 +1,113 @@
+import time
+
+import pytest
+
+from weather_app.utils.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    backoff_delays,
+    call_with_retries,
+)
+
+
+class UpstreamDown(Exception):
+    pass
+
+def is_failure(error):
+    return isinstance(error, UpstreamDown)
+
+def fail():
+    raise UpstreamDown("503")
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(UpstreamDown):
+            breaker.call(fail, is_failure)
+
+##########################################################
+# Circuit Breaker
+##########################################################
+
+def test_opens_after_threshold_and_fails_fast():
+    """Test that consecutive failures open the circuit and later calls never reach the upstream."""
+    breaker = CircuitBreaker("onecall", failure_threshold=3, reset_seconds=60)
+    trip(breaker)
+
+    calls = []
+    with pytest.raises(CircuitOpenError, match="Weather API 'onecall' is unavailable"):
+        breaker.call(lambda: calls.append(1), is_failure)
+    assert calls == []
+    assert breaker.snapshot() == {"state": "open", "failures": 3, "opened": 1, "rejected": 1, "probes": 0}
+
+def test_success_resets_failure_count():
+    """Test that only consecutive failures count towards opening the circuit."""
+    breaker = CircuitBreaker("onecall", failure_threshold=2)
+    with pytest.raises(UpstreamDown):
+        breaker.call(fail, is_failure)
+    assert breaker.call(lambda: "ok", is_failure) == "ok"
+    with pytest.raises(UpstreamDown):
+        breaker.call(fail, is_failure)
+    assert breaker.state == "closed"
+
+def test_non_failures_do_not_count():
+    """Test that errors that say nothing about upstream health (e.g. a 404) leave the circuit closed."""
+    breaker = CircuitBreaker("onecall", failure_threshold=1)
+    with pytest.raises(KeyError):
+        breaker.call(lambda: {}["missing"], is_failure)
+    assert breaker.state == "closed"
+
+def test_half_open_probe_closes_circuit():
+    """Test that after the reset timeout one probe is let through and its success closes the circuit."""
+    breaker = CircuitBreaker("onecall", failure_threshold=1, reset_seconds=0.05)
+    trip(breaker)
+    time.sleep(0.06)
+
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+def test_failed_probe_reopens_circuit():
+    """Test that a failed probe opens the circuit for another reset timeout."""
+    breaker = CircuitBreaker("onecall", failure_threshold=1, reset_seconds=0.05)
+    trip(breaker)
+    time.sleep(0.06)
+
+    with pytest.raises(UpstreamDown):
+        breaker.call(fail, is_failure)
+    assert breaker.state == "open"
+    assert breaker.snapshot()["opened"] == 2
+
+##########################################################
+# Retries
+##########################################################
+
+def test_backoff_delays_are_jittered_and_capped():
+    """Test that each retry delay is drawn below an exponentially growing, capped ceiling."""
+    for _ in range(50):
+        delays = list(backoff_delays(attempts=5, base_delay=0.1, max_delay=0.3))
+        assert len(delays) == 4
+        for delay, ceiling in zip(delays, [0.1, 0.2, 0.3, 0.3]):
+            assert 0 <= delay <= ceiling
+
+def test_call_with_retries_recovers_from_transient_errors(mocker):
+    """Test that a transient failure is retried until it succeeds."""
+    mocker.patch("weather_app.utils.circuit_breaker.time.sleep")
+    func = mocker.Mock(side_effect=[UpstreamDown("503"), UpstreamDown("503"), "ok"])
+    assert call_with_retries(func, is_failure, attempts=3) == "ok"
+    assert func.call_count == 3
+
+def test_call_with_retries_gives_up(mocker):
+    """Test that the last error is raised once the attempts run out, and permanent errors are not retried."""
+    mocker.patch("weather_app.utils.circuit_breaker.time.sleep")
+    func = mocker.Mock(side_effect=UpstreamDown("503"))
+    with pytest.raises(UpstreamDown):
+        call_with_retries(func, is_failure, attempts=3)
+    assert func.call_count == 3
+
+    func = mocker.Mock(side_effect=KeyError("date"))
+    with pytest.raises(KeyError):
+        call_with_retries(func, is_failure, attempts=3)
+    assert func.call_count == 1
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import inspect
+
+from app import create_app
+from config import DevelopmentConfig, ProductionConfig, TestConfig, get_config
+from weather_app.db import db
+
+
+def test_get_config_defaults_to_production(monkeypatch):
+    """Test that production is the default config."""
+    monkeypatch.delenv("APP_CONFIG", raising=False)
+    assert get_config() is ProductionConfig
+
+def test_get_config_from_env(monkeypatch):
+    """Test that APP_CONFIG selects the config."""
+    monkeypatch.setenv("APP_CONFIG", "Test")
+    assert get_config() is TestConfig
+    assert get_config("production") is ProductionConfig
+
+def test_get_config_unknown(monkeypatch):
+    """Test that an unknown config name is rejected."""
+    monkeypatch.setenv("APP_CONFIG", "staging")
+    with pytest.raises(ValueError, match="Unknown APP_CONFIG 'staging'"):
+        get_config()
+
+def test_create_app_uses_env_config(monkeypatch):
+    """Test that create_app without a config class uses APP_CONFIG."""
+    monkeypatch.setenv("APP_CONFIG", "test")
+    app = create_app()
+    assert app.config["TESTING"] is True
+
+def test_production_requires_secret_key():
+    """Test that production refuses to start without SECRET_KEY, while development falls back to a random key."""
+    with pytest.raises(ValueError, match="SECRET_KEY must be set"):
+        create_app(type("NoKeyConfig", (ProductionConfig,), {"SECRET_KEY": None}))
+
+    app = create_app(type("NoKeyConfig", (DevelopmentConfig,), {"SECRET_KEY": None}))
+    assert len(app.config["SECRET_KEY"]) == 64
+    assert get_config("development") is DevelopmentConfig
+
+def test_db_init_creates_schema():
+    """Test that the schema is only created by the db-init command, which can run repeatedly."""
+    app = create_app(TestConfig)
+    with app.app_context():
+        assert inspect(db.engine).get_table_names() == []
+
+    runner = app.test_cli_runner()
+    for _ in range(2):
+        result = runner.invoke(args=["db-init"])
+        assert result.exit_code == 0
+        assert "Database schema is up to date" in result.output
+
+    with app.app_context():
+        assert {"users", "favorite_locations", "weather_history"} <= set(inspect(db.engine).get_table_names())
+        db.drop_all()
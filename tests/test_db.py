@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from weather_app import db as db_module
+
+
+def test_wal_profile_is_default(monkeypatch):
+    """Test that the WAL profile is used unless another one is selected."""
+    monkeypatch.delenv("SQLITE_PRAGMA_PROFILE", raising=False)
+    pragmas = db_module.sqlite_pragmas()
+    assert pragmas["journal_mode"] == "WAL"
+    assert pragmas["synchronous"] == "NORMAL"
+    assert set(pragmas) == {"journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size"}
+
+def test_profile_overrides(monkeypatch):
+    """Test that single pragmas can be overridden and the legacy profile sets none."""
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT", "10000")
+    assert db_module.sqlite_pragmas("wal")["busy_timeout"] == "10000"
+    assert db_module.sqlite_pragmas("legacy") == {"busy_timeout": "10000"}
+
+def test_unknown_profile():
+    """Test that an unknown profile is rejected."""
+    with pytest.raises(ValueError, match="Unknown SQLite pragma profile 'turbo'"):
+        db_module.sqlite_pragmas("turbo")
+
+def test_connect_listener_applies_pragmas(tmp_path, monkeypatch):
+    """Test that new SQLite connections get foreign keys and the profile's pragmas."""
+    monkeypatch.setattr(db_module, "SQLITE_PRAGMAS", db_module.sqlite_pragmas("wal"))
+    engine = create_engine(f"sqlite:///{tmp_path / 'weather_app.db'}")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    engine.dispose()
@@ -1,3 +1,4 @@
+import time
 import pytest
 from weather_app.models.favorite_locations_model import FavoriteLocations
 from weather_app.models.user_model import User
@@ -62,6 +63,48 @@ def test_get_favorites_empty(session, sample_user):
     favorites = FavoriteLocations.get_favorites(user_id=1)
     assert favorites == [], "Favorites should be empty for a new user."
 
+def test_get_favorites_page(session, sample_user):
+    """Test walking a user's favorites page by page with the next cursor."""
+    User.create_user(**sample_user)
+    names = [f"City {i}" for i in range(5)]
+    for name in names:
+        FavoriteLocations.add_favorite(user_id=1, location_name=name)
+
+    session.expunge_all()
+    seen, cursor = [], 0
+    while cursor is not None:
+        page = FavoriteLocations.get_favorites_page(user_id=1, after_id=cursor, limit=2)
+        assert len(page["locations"]) <= 2
+        seen.extend(location["location_name"] for location in page["locations"])
+        cursor = page["next_cursor"]
+    assert seen == names
+
+    last_page = FavoriteLocations.get_favorites_page(user_id=1, limit=5)
+    assert len(last_page["locations"]) == 5 and last_page["next_cursor"] is None
+    assert len(session.identity_map) == 0, "Pages should not load ORM objects"
+
+def test_get_favorites_page_invalid(session):
+    """Test that out-of-range page parameters are rejected."""
+    with pytest.raises(ValueError, match="limit must be between 1 and"):
+        FavoriteLocations.get_favorites_page(user_id=1, limit=0)
+    with pytest.raises(ValueError, match="after_id cannot be negative"):
+        FavoriteLocations.get_favorites_page(user_id=1, after_id=-1)
+
+def test_get_favorites_route_paginates(client, sample_user):
+    """Test that /api/get-favorites returns a page and the cursor of the next one."""
+    User.create_user(**sample_user)
+    for name in ("Boston", "Denver", "Austin"):
+        FavoriteLocations.add_favorite(user_id=1, location_name=name)
+
+    first = client.get("/api/get-favorites?user_id=1&limit=2").get_json()
+    assert [location["location_name"] for location in first["locations"]] == ["Boston", "Denver"]
+    second = client.get(f"/api/get-favorites?user_id=1&limit=2&after_id={first['next_cursor']}").get_json()
+    assert [location["location_name"] for location in second["locations"]] == ["Austin"]
+    assert second["next_cursor"] is None
+
+    assert client.get("/api/get-favorites").status_code == 400
+    assert client.get("/api/get-favorites?user_id=1&limit=100000").status_code == 400
+
 ##########################################################
 # Deleting Favorite Locations
 ##########################################################
@@ -81,6 +124,40 @@ def test_delete_non_existent_favorite_location(session, sample_user, sample_favo
     with pytest.raises(ValueError, match=f"Location '{sample_favorite_location['location_name']}' not found."):
         FavoriteLocations.delete_favorite(user_id=sample_favorite_location["user_id"], location_name=sample_favorite_location["location_name"])
 
+def test_delete_favorite_single_statement(session, sample_user, sample_favorite_location, mocker):
+    """Test that a delete runs one statement without loading the favorite."""
+    User.create_user(**sample_user)
+    FavoriteLocations.add_favorite(**sample_favorite_location)
+    session.expunge_all()
+
+    execute = mocker.spy(session, "execute")
+    FavoriteLocations.delete_favorite(**sample_favorite_location)
+    assert execute.call_count == 1
+    assert len(session.identity_map) == 0
+
+def test_delete_favorite_by_id(session, sample_user, sample_favorite_location):
+    """Test deleting a favorite by its ID, scoped to its user."""
+    User.create_user(**sample_user)
+    User.create_user("otheruser", "password123")
+    FavoriteLocations.add_favorite(**sample_favorite_location)
+    favorite_id = FavoriteLocations.get_favorites(1)[0]["id"]
+
+    with pytest.raises(ValueError, match=f"Favorite location with ID {favorite_id} not found."):
+        FavoriteLocations.delete_favorite_by_id(user_id=2, favorite_id=favorite_id)
+    FavoriteLocations.delete_favorite_by_id(user_id=1, favorite_id=favorite_id)
+    assert FavoriteLocations.get_favorites(1) == []
+    with pytest.raises(ValueError, match="not found"):
+        FavoriteLocations.delete_favorite_by_id(user_id=1, favorite_id=favorite_id)
+
+def test_delete_favorite_by_id_route(client, sample_user, sample_favorite_location):
+    """Test the delete-by-ID route."""
+    User.create_user(**sample_user)
+    FavoriteLocations.add_favorite(**sample_favorite_location)
+    favorite_id = FavoriteLocations.get_favorites(1)[0]["id"]
+
+    assert client.delete(f"/api/delete-favorite-by-id/1/{favorite_id}").status_code == 200
+    assert client.delete(f"/api/delete-favorite-by-id/1/{favorite_id}").status_code == 404
+
 ##########################################################
 # Weather Integration
 ##########################################################
@@ -119,3 +196,167 @@ def test_get_all_favorites_with_weather(session, sample_user, sample_favorite_lo
     assert len(favorites_with_weather) == 1, "There should be one favorite location with weather data."
     assert "weather" in favorites_with_weather[0], "Weather data should be included in the response."
     assert favorites_with_weather[0]["weather"] == {"temp": 72, "description": "Sunny"}, "Weather data should match the mocked data."
+
+def test_get_all_favorites_with_weather_keeps_order(session, sample_user, mock_weather_client):
+    """Test that concurrently fetched weather is returned in favorites order."""
+    User.create_user(**sample_user)
+    for location_name in ["Denver", "Boston", "Chicago"]:
+        FavoriteLocations.add_favorite(user_id=1, location_name=location_name)
+    mock_weather_client.get_weather.side_effect = lambda location_name: {"location": location_name}
+
+    favorites_with_weather = FavoriteLocations.get_all_favorites_with_weather(user_id=1, weather_client=mock_weather_client)
+    assert [fav["weather"]["location"] for fav in favorites_with_weather] == ["Denver", "Boston", "Chicago"]
+
+def test_get_all_favorites_with_weather_partial_failure(session, sample_user, mock_weather_client):
+    """Test that a failing location reports an error without failing the others."""
+    User.create_user(**sample_user)
+    FavoriteLocations.add_favorite(user_id=1, location_name="Boston")
+    FavoriteLocations.add_favorite(user_id=1, location_name="Atlantis")
+
+    def get_weather(location_name):
+        if location_name == "Atlantis":
+            raise ValueError("Location 'Atlantis' not found")
+        return {"temp": 72, "description": "Sunny"}
+    mock_weather_client.get_weather.side_effect = get_weather
+
+    boston, atlantis = FavoriteLocations.get_all_favorites_with_weather(user_id=1, weather_client=mock_weather_client)
+    assert boston["weather"] == {"temp": 72, "description": "Sunny"}
+    assert "weather" not in atlantis
+    assert "Atlantis" in atlantis["error"]
+
+def test_get_all_favorites_with_weather_deadline(session, sample_user, mock_weather_client):
+    """Test that fetches running past the deadline are reported as timed out."""
+    User.create_user(**sample_user)
+    FavoriteLocations.add_favorite(**{"user_id": 1, "location_name": "Boston"})
+    mock_weather_client.get_weather.side_effect = lambda location_name: time.sleep(0.5)
+
+    favorites_with_weather = FavoriteLocations.get_all_favorites_with_weather(user_id=1, weather_client=mock_weather_client, deadline=0.05)
+    assert favorites_with_weather[0]["error"] == "Timed out after 0.05 seconds"
+
+def test_get_all_favorites_with_weather_zero_deadline(session, sample_user, mock_weather_client):
+    """Test that an explicit zero deadline is honored rather than replaced by the default."""
+    User.create_user(**sample_user)
+    FavoriteLocations.add_favorite(**{"user_id": 1, "location_name": "Boston"})
+    mock_weather_client.get_weather.side_effect = lambda location_name: time.sleep(0.2)
+
+    started = time.monotonic()
+    favorites_with_weather = FavoriteLocations.get_all_favorites_with_weather(user_id=1, weather_client=mock_weather_client, deadline=0)
+    assert favorites_with_weather[0]["error"] == "Timed out after 0 seconds"
+    assert time.monotonic() - started < 1
+
+def test_get_daily_forecast(mock_weather_client):
+    """Test that the daily forecast is read from the weather client's daily view."""
+    mock_weather_client.get_daily_forecast.return_value = "High: 80F"
+    assert FavoriteLocations.get_daily_forecast("Boston", mock_weather_client) == "High: 80F"
+    mock_weather_client.get_daily_forecast.assert_called_once_with("Boston")
+
+def test_get_weather_dashboard_failure(mock_weather_client):
+    """Test that dashboard errors are wrapped in a ValueError."""
+    mock_weather_client.get_dashboard.side_effect = RuntimeError("upstream down")
+    with pytest.raises(ValueError, match="Error fetching weather for location 'Boston': upstream down"):
+        FavoriteLocations.get_weather_dashboard("Boston", mock_weather_client)
+
+##########################################################
+# Batch Weather
+##########################################################
+
+def test_get_weather_for_locations_dedupes(session, mock_weather_client):
+    """Test that duplicate names and coordinates are fetched once and results keep input order."""
+    mock_weather_client.get_weather.side_effect = lambda location_name: {"location": location_name}
+    mock_weather_client.get_weather_at.return_value = {"temp": 50}
+
+    results = FavoriteLocations.get_weather_for_locations(
+        ["Boston", {"lat": 41.88, "lon": -87.63}, " boston ", {"lat": "41.88", "lon": "-87.63"}],
+        mock_weather_client,
+    )
+
+    assert [result["status"] for result in results] == ["success"] * 4
+    assert results[2]["weather"] == {"location": "Boston"}
+    assert results[3]["weather"] == {"temp": 50}
+    mock_weather_client.get_weather.assert_called_once_with("Boston")
+    mock_weather_client.get_weather_at.assert_called_once_with(41.88, -87.63)
+
+def test_get_weather_for_locations_per_item_errors(session, mock_weather_client):
+    """Test that invalid and failing locations are reported per item."""
+    mock_weather_client.get_weather.side_effect = lambda location_name: {"temp": 72}
+    mock_weather_client.get_weather_at.side_effect = ValueError("upstream down")
+
+    valid, invalid, failing = FavoriteLocations.get_weather_for_locations(
+        ["Boston", {"lat": 200, "lon": 0}, {"lat": 1, "lon": 2}], mock_weather_client)
+
+    assert valid["status"] == "success"
+    assert invalid["status"] == "error" and "Invalid location" in invalid["error"]
+    assert failing == {"location": {"lat": 1, "lon": 2}, "status": "error", "error": "upstream down"}
+
+def test_get_weather_for_locations_not_found_message(session, mock_weather_client):
+    """Test the error reported for a location that cannot be geocoded, as documented in the README."""
+    mock_weather_client.get_weather.side_effect = ValueError("Location 'Atlantis' not found")
+
+    [result] = FavoriteLocations.get_weather_for_locations(["Atlantis"], mock_weather_client)
+    assert result["error"] == "Error fetching weather for location 'Atlantis': Location 'Atlantis' not found"
+
+def test_get_weather_for_locations_limit(mock_weather_client, mocker):
+    """Test that oversized batches are rejected."""
+    mocker.patch("weather_app.models.favorite_locations_model.WEATHER_BATCH_MAX_LOCATIONS", 2)
+    with pytest.raises(ValueError, match="At most 2 locations"):
+        FavoriteLocations.get_weather_for_locations(["a", "b", "c"], mock_weather_client)
+
+##########################################################
+# Bulk Favorite Locations
+##########################################################
+
+def test_add_favorites_bulk(session, sample_user):
+    """Test that a bulk add reports every item and skips existing favorites."""
+    User.create_user(**sample_user)
+    FavoriteLocations.add_favorite(user_id=1, location_name="Boston")
+
+    results = FavoriteLocations.add_favorites_bulk(1, ["Denver", "Boston", "", "Austin", "Denver", 42])
+    assert [result["status"] for result in results] == ["added", "duplicate", "invalid", "added", "duplicate", "invalid"]
+    assert [fav["location_name"] for fav in FavoriteLocations.get_favorites(1)] == ["Boston", "Denver", "Austin"]
+
+def test_add_favorites_bulk_links_catalog(session, sample_user):
+    """Test that bulk-added favorites share catalog entries with single adds."""
+    User.create_user(**sample_user)
+    FavoriteLocations.add_favorite(user_id=1, location_name="Boston")
+    FavoriteLocations.add_favorites_bulk(1, ["boston ", "New York"])
+
+    favorites = session.query(FavoriteLocations).filter_by(user_id=1).order_by(FavoriteLocations.id).all()
+    assert favorites[0].location_id == favorites[1].location_id
+    assert favorites[2].location_id is not None
+
+def test_add_favorites_bulk_one_commit(session, sample_user, mocker):
+    """Test that a bulk add commits once however many favorites it adds."""
+    User.create_user(**sample_user)
+    commit = mocker.spy(session, "commit")
+    FavoriteLocations.add_favorites_bulk(1, [f"City {i}" for i in range(100)])
+    assert commit.call_count == 1
+    assert len(FavoriteLocations.get_favorites(1)) == 100
+
+def test_add_favorites_bulk_invalid(session):
+    """Test that an unknown user or an oversized request is rejected."""
+    with pytest.raises(ValueError, match="User 1 does not exist"):
+        FavoriteLocations.add_favorites_bulk(1, ["Boston"])
+    with pytest.raises(ValueError, match="Too many locations"):
+        FavoriteLocations.add_favorites_bulk(1, ["Boston"] * 10_000)
+
+def test_delete_favorites_bulk(session, sample_user):
+    """Test that a bulk delete removes the given favorites and reports the rest."""
+    User.create_user(**sample_user)
+    FavoriteLocations.add_favorites_bulk(1, ["Boston", "Denver", "Austin"])
+
+    results = FavoriteLocations.delete_favorites_bulk(1, ["Boston", "Paris", "Austin", "Boston"])
+    assert [result["status"] for result in results] == ["deleted", "not_found", "deleted", "not_found"]
+    assert [fav["location_name"] for fav in FavoriteLocations.get_favorites(1)] == ["Denver"]
+
+def test_bulk_favorites_routes(client, sample_user):
+    """Test the bulk add and delete routes."""
+    User.create_user(**sample_user)
+    response = client.post("/api/favorites/bulk", json={"user_id": 1, "location_names": ["Boston", "Denver"]})
+    assert response.status_code == 200
+    assert [result["status"] for result in response.get_json()["results"]] == ["added", "added"]
+
+    response = client.delete("/api/favorites/bulk", json={"user_id": 1, "location_names": ["Denver"]})
+    assert response.get_json()["results"] == [{"location_name": "Denver", "status": "deleted"}]
+
+    assert client.post("/api/favorites/bulk", json={"user_id": 1, "location_names": "Boston"}).status_code == 400
+    assert client.post("/api/favorites/bulk", json={"user_id": 99, "location_names": ["Boston"]}).status_code == 400
@@ -0,0 +1,80 @@
+import os
+import runpy
+import sys
+import types
+
+import pytest
+
+from app import create_app
+from config import TestConfig
+
+CONF_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "gunicorn.conf.py")
+
+
+@pytest.fixture(autouse=True)
+def restore_environ(monkeypatch):
+    """Undo the environment variables gunicorn.conf.py sets for the app."""
+    for name in ("WEATHER_PREFETCH_DEFERRED", "WEATHER_CACHE_BACKEND", "RATE_LIMIT_BACKEND",
+                 "SESSION_REVOCATION_BACKEND", "WEATHER_PREFETCH_LOCK_PATH"):
+        monkeypatch.setenv(name, "")
+        monkeypatch.delenv(name)
+
+def load_conf(monkeypatch, **env):
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return runpy.run_path(CONF_PATH)
+
+def test_defaults(monkeypatch):
+    """Test that the defaults serve threaded workers without preloading."""
+    for name in ("GUNICORN_WORKERS", "GUNICORN_THREADS", "GUNICORN_PRELOAD"):
+        monkeypatch.delenv(name, raising=False)
+    conf = load_conf(monkeypatch)
+    assert conf["bind"] == "0.0.0.0:5001"
+    assert conf["worker_class"] == "gthread"
+    assert conf["workers"] >= 3 and conf["threads"] == 4
+    assert conf["preload_app"] is False
+
+def test_env_overrides(monkeypatch):
+    """Test that workers, threads, keep-alive, timeouts and preloading come from the environment."""
+    conf = load_conf(monkeypatch, GUNICORN_WORKERS="6", GUNICORN_THREADS="8", GUNICORN_KEEPALIVE="10",
+                     GUNICORN_TIMEOUT="60", GUNICORN_GRACEFUL_TIMEOUT="20", GUNICORN_PRELOAD="true")
+    assert (conf["workers"], conf["threads"], conf["keepalive"]) == (6, 8, 10)
+    assert (conf["timeout"], conf["graceful_timeout"]) == (60, 20)
+    assert conf["preload_app"] is True
+
+def test_multiple_workers_share_backends(monkeypatch):
+    """Test that several workers default to the shared sqlite cache and rate limiter."""
+    load_conf(monkeypatch, GUNICORN_WORKERS="4")
+    assert os.environ["WEATHER_CACHE_BACKEND"] == os.environ["RATE_LIMIT_BACKEND"] == "sqlite"
+    assert os.environ["SESSION_REVOCATION_BACKEND"] == "sqlite"
+    assert os.environ["WEATHER_PREFETCH_LOCK_PATH"] == "./db/prefetch.lock"
+
+def test_multiple_workers_refuse_memory_rate_limiter(monkeypatch):
+    """Test that a per-process rate limiter is refused when it would multiply the upstream quota."""
+    with pytest.raises(ValueError, match="RATE_LIMIT_BACKEND=memory"):
+        load_conf(monkeypatch, GUNICORN_WORKERS="4", RATE_LIMIT_BACKEND="memory")
+    conf = load_conf(monkeypatch, GUNICORN_WORKERS="1", RATE_LIMIT_BACKEND="memory")
+    assert conf["workers"] == 1
+
+def test_multiple_workers_refuse_memory_revocations(monkeypatch):
+    """Test that per-process token revocations are refused when other workers would miss a logout."""
+    with pytest.raises(ValueError, match="SESSION_REVOCATION_BACKEND=memory"):
+        load_conf(monkeypatch, GUNICORN_WORKERS="4", SESSION_REVOCATION_BACKEND="memory")
+
+def test_preload_defers_prefetch_to_workers(monkeypatch, mocker):
+    """Test that a preloaded master does not start the prefetch scheduler and post_fork does."""
+    conf = load_conf(monkeypatch, GUNICORN_PRELOAD="true")
+    assert os.environ["WEATHER_PREFETCH_DEFERRED"] == "true"
+
+    config = type("PrefetchConfig", (TestConfig,), {"WEATHER_PREFETCH_ENABLED": True,
+                                                    "WEATHER_PREFETCH_DEFERRED": True})
+    app = create_app(config)
+    scheduler = app.extensions["prefetch_scheduler"]
+    assert scheduler._thread is None
+    start = mocker.patch.object(scheduler, "start")
+    inherited_session = app.extensions["weather_client"].session
+    monkeypatch.setitem(sys.modules, "wsgi", types.SimpleNamespace(app=app))
+
+    conf["post_fork"](None, None)
+    start.assert_called_once_with()
+    assert app.extensions["weather_client"].session is not inherited_session
@@ -0,0 +1,81 @@
+import pytest
+
+from weather_app.db import db
+from weather_app.models.favorite_locations_model import FavoriteLocations
+from weather_app.models.geocode_cache_model import GeocodeCache
+from weather_app.models.location_model import Location
+from weather_app.models.user_model import User
+
+
+@pytest.fixture
+def two_users(session):
+    User.create_user(username="user1", password="password")
+    User.create_user(username="user2", password="password")
+
+##########################################################
+# Location Catalog
+##########################################################
+
+def test_get_or_create_dedupes_spellings(session):
+    """Test that spellings which normalize the same share one catalog entry."""
+    boston = Location.get_or_create("Boston")
+    assert Location.get_or_create("  boston ").id == boston.id
+    assert boston.display_name == "Boston"
+    assert session.query(Location).count() == 1
+
+def test_get_or_create_copies_cached_coordinates(session):
+    """Test that a new catalog entry picks up coordinates already in the geocode cache."""
+    GeocodeCache.store("boston", 42.36, -71.06, "nominatim")
+    boston = Location.get_or_create("Boston")
+    assert (boston.latitude, boston.longitude, boston.provider) == (42.36, -71.06, "nominatim")
+
+def test_geocode_updates_catalog_coordinates(session):
+    """Test that geocoding a location already in the catalog fills in its coordinates."""
+    boston = Location.get_or_create("Boston")
+    session.commit()
+    assert boston.latitude is None
+
+    GeocodeCache.store("boston", 42.36, -71.06, "nominatim")
+    session.refresh(boston)
+    assert (boston.latitude, boston.longitude, boston.provider) == (42.36, -71.06, "nominatim")
+    assert boston.geocoded_at is not None
+
+def test_get_or_create_empty_name(session):
+    """Test that empty location names are rejected."""
+    with pytest.raises(ValueError, match="Location name cannot be empty."):
+        Location.get_or_create("   ")
+
+def test_add_favorite_links_catalog_location(two_users):
+    """Test that favorites of different users share the catalog location."""
+    FavoriteLocations.add_favorite(user_id=1, location_name="Boston")
+    FavoriteLocations.add_favorite(user_id=2, location_name="boston")
+
+    location_ids = {favorite.location_id for favorite in FavoriteLocations.query.all()}
+    assert len(location_ids) == 1 and None not in location_ids
+
+##########################################################
+# Backfill
+##########################################################
+
+def test_backfill_location_ids(two_users):
+    """Test that rows from before the catalog existed are linked to it."""
+    db.session.add_all([
+        FavoriteLocations(user_id=1, location_name="Boston, MA"),
+        FavoriteLocations(user_id=2, location_name="boston,  ma"),
+    ])
+    db.session.commit()
+
+    assert FavoriteLocations.backfill_location_ids() == 2
+    assert FavoriteLocations.backfill_location_ids() == 0
+    assert Location.query.count() == 1
+    assert FavoriteLocations.get_location_popularity()[0]["users"] == 2
+
+def test_fill_coordinates_from_geocode_cache(session):
+    """Test that catalog entries without coordinates are filled from the geocode cache."""
+    Location.get_or_create("Boston")
+    # Geocoded before the catalog tracked geocodes, so the entry has no coordinates
+    session.add(GeocodeCache(normalized_name="boston", latitude=42.36, longitude=-71.06, provider="nominatim"))
+    session.commit()
+
+    assert Location.fill_coordinates_from_geocode_cache() == 1
+    assert Location.query.one().latitude == 42.36
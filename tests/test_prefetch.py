@@ -0,0 +1,92 @@
+import pytest
+
+from weather_app.models.favorite_locations_model import FavoriteLocations
+from weather_app.models.user_model import User
+from weather_app.utils.prefetch import PrefetchScheduler
+from weather_app.utils.rate_limiter import RateLimitExceeded
+
+
+@pytest.fixture
+def favorites(session):
+    """Creates three users whose favorites make Boston the most popular location."""
+    for index in range(3):
+        User.create_user(username=f"user{index}", password="password")
+    FavoriteLocations.add_favorite(user_id=1, location_name="Denver")
+    FavoriteLocations.add_favorite(user_id=1, location_name="Boston")
+    FavoriteLocations.add_favorite(user_id=2, location_name="boston")
+    FavoriteLocations.add_favorite(user_id=3, location_name="Boston")
+
+def test_get_location_popularity(favorites):
+    """Test that spellings of one location are counted together and ranked first."""
+    popularity = FavoriteLocations.get_location_popularity()
+    assert [entry["users"] for entry in popularity] == [3, 1]
+    assert popularity[0]["location_name"].lower() == "boston"
+
+def test_run_once_refreshes_most_popular_first(app, favorites, mocker):
+    """Test that a pass refreshes locations in popularity order."""
+    weather_client = mocker.Mock()
+    weather_client.prefetch_onecall.return_value = True
+
+    stats = PrefetchScheduler(app, weather_client, lead_seconds=30).run_once()
+
+    assert stats == {"checked": 2, "refreshed": 2, "errors": 0, "deferred": 0}
+    assert weather_client.prefetch_onecall.call_args_list[0].args[0].lower() == "boston"
+    assert weather_client.prefetch_onecall.call_args_list[0].args[1] == 30
+
+def refresh_with_attempts(attempts):
+    """Returns a prefetch_onecall stand-in that makes the given number of upstream attempts."""
+    def prefetch_onecall(location_name, lead_seconds, on_attempt):
+        for _ in range(attempts):
+            on_attempt()
+        return True
+    return prefetch_onecall
+
+def test_run_once_respects_budget(app, favorites, mocker):
+    """Test that the per-minute budget defers the least popular locations."""
+    weather_client = mocker.Mock()
+    weather_client.prefetch_onecall.side_effect = refresh_with_attempts(1)
+
+    scheduler = PrefetchScheduler(app, weather_client, budget_per_minute=1)
+    assert scheduler.run_once() == {"checked": 1, "refreshed": 1, "errors": 0, "deferred": 1}
+    assert scheduler.run_once()["deferred"] == 2
+
+def test_run_once_charges_every_retry(app, favorites, mocker):
+    """Test that a refresh that retried is charged for each upstream attempt."""
+    weather_client = mocker.Mock()
+    weather_client.prefetch_onecall.side_effect = refresh_with_attempts(3)
+
+    scheduler = PrefetchScheduler(app, weather_client, budget_per_minute=3)
+    assert scheduler.run_once() == {"checked": 1, "refreshed": 1, "errors": 0, "deferred": 1}
+    assert scheduler._budget_left() == 0
+
+def test_run_once_skips_fresh_entries(app, favorites, mocker):
+    """Test that fresh cache entries do not spend the budget."""
+    weather_client = mocker.Mock()
+    weather_client.prefetch_onecall.return_value = False
+
+    scheduler = PrefetchScheduler(app, weather_client, budget_per_minute=1)
+    assert scheduler.run_once() == {"checked": 2, "refreshed": 0, "errors": 0, "deferred": 0}
+
+def test_run_once_defers_when_quota_exhausted(app, favorites, mocker):
+    """Test that running out of upstream quota defers the remaining locations instead of failing them."""
+    weather_client = mocker.Mock()
+    weather_client.prefetch_onecall.side_effect = RateLimitExceeded("Rate limit for 'owm' exceeded")
+
+    stats = PrefetchScheduler(app, weather_client).run_once()
+
+    assert stats == {"checked": 0, "refreshed": 0, "errors": 0, "deferred": 2}
+
+def test_lock_elects_one_scheduler(app, tmp_path, mocker):
+    """Test that schedulers sharing a lock file run passes one at a time, and a survivor takes over."""
+    lock_path = str(tmp_path / "prefetch.lock")
+    first = PrefetchScheduler(app, mocker.Mock(), lock_path=lock_path)
+    second = PrefetchScheduler(app, mocker.Mock(), lock_path=lock_path)
+
+    assert first.is_leader()
+    assert not second.is_leader()
+    assert first.is_leader(), "The leader keeps the lock"
+
+    first._release_lock()
+    assert second.is_leader()
+    second._release_lock()
+    assert PrefetchScheduler(app, mocker.Mock(), lock_path=None).is_leader()
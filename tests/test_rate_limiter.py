@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from weather_app.utils.rate_limiter import (
+    MemoryBucketBackend,
+    RateLimiter,
+    RateLimitExceeded,
+    SQLiteBucketBackend,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBucketBackend()
+    return SQLiteBucketBackend(str(tmp_path / "rate_limits.db"))
+
+def test_burst_then_throttle(backend):
+    """Test that a full bucket serves its burst immediately and then refills at its rate."""
+    limiter = RateLimiter({"owm": (20, 2)}, backend=backend)
+
+    assert limiter.acquire("owm") == 0
+    assert limiter.acquire("owm") == 0
+    waited = limiter.acquire("owm")
+
+    assert 0.02 <= waited < 0.5
+    stats = limiter.stats()["owm"]
+    assert stats["acquired"] == 3 and stats["throttled"] == 1 and stats["rejected"] == 0
+
+def test_deadline_rejects_without_waiting(backend):
+    """Test that a caller whose deadline is shorter than the refill time is rejected at once."""
+    limiter = RateLimiter({"nominatim": (1, 1)}, backend=backend)
+    limiter.acquire("nominatim")
+
+    started = time.monotonic()
+    with pytest.raises(RateLimitExceeded, match="Rate limit for 'nominatim' exceeded"):
+        limiter.acquire("nominatim", timeout=0.1)
+    assert time.monotonic() - started < 0.1
+    assert limiter.stats()["nominatim"]["rejected"] == 1
+
+def test_buckets_are_independent():
+    """Test that spending one upstream's quota does not throttle the other."""
+    limiter = RateLimiter({"owm": (1, 1), "nominatim": (1, 1)})
+    limiter.acquire("owm")
+    assert limiter.acquire("nominatim", timeout=0) == 0
+
+def test_unknown_bucket():
+    """Test that an unknown bucket is a ValueError."""
+    with pytest.raises(ValueError, match="Unknown rate limit bucket 'other'"):
+        RateLimiter({"owm": (1, 1)}).acquire("other")
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    """Test that two limiters on the same file draw from one bucket, as separate processes would."""
+    path = str(tmp_path / "rate_limits.db")
+    first = RateLimiter({"owm": (0.1, 1)}, backend=SQLiteBucketBackend(path))
+    second = RateLimiter({"owm": (0.1, 1)}, backend=SQLiteBucketBackend(path))
+
+    first.acquire("owm")
+    with pytest.raises(RateLimitExceeded):
+        second.acquire("owm", timeout=0)
+
+def test_acquire_async_waits_on_the_event_loop():
+    """Test that async callers queue for tokens without blocking each other."""
+    limiter = RateLimiter({"owm": (50, 1)})
+
+    async def acquire_three():
+        return await asyncio.gather(*(limiter.acquire_async("owm") for _ in range(3)))
+
+    waits = asyncio.run(acquire_three())
+    assert waits[0] == 0 and max(waits) > 0
+    assert limiter.stats()["owm"]["acquired"] == 3
+
+def test_acquire_async_reserves_sqlite_tokens_off_the_event_loop(tmp_path, mocker):
+    """Test that the sqlite backend, which can wait on another process's lock, is called on a worker thread."""
+    limiter = RateLimiter({"owm": (50, 2)}, backend=SQLiteBucketBackend(str(tmp_path / "rate_limits.db")))
+    threads = []
+    reserve = limiter.backend.reserve
+    mocker.patch.object(limiter.backend, "reserve",
+                        side_effect=lambda *args: threads.append(threading.get_ident()) or reserve(*args))
+
+    assert asyncio.run(limiter.acquire_async("owm")) == 0
+    assert threads and threading.get_ident() not in threads
+
+def test_reset_refills_buckets():
+    """Test that reset refills every bucket and zeroes the counters."""
+    limiter = RateLimiter({"owm": (0.1, 1)})
+    limiter.acquire("owm")
+    limiter.reset()
+    assert limiter.acquire("owm", timeout=0) == 0
+    assert limiter.stats()["owm"]["acquired"] == 1
@@ -0,0 +1,91 @@
+import pytest
+
+from weather_app.models.user_model import User
+from weather_app.utils.session_tokens import (
+    InvalidTokenError,
+    SQLiteRevocationBackend,
+    TokenRevocationList,
+    issue_token,
+    verify_token,
+)
+
+SECRET = "test-secret-key"
+
+
+def test_issue_and_verify():
+    """Test that a token carries the user ID and its expiry."""
+    token, expires_at = issue_token(7, SECRET, ttl=60, now=1000)
+    claims = verify_token(token, SECRET, now=1030)
+    assert claims["sub"] == 7 and claims["exp"] == expires_at == 1060
+    assert issue_token(7, SECRET)[0] != issue_token(7, SECRET)[0], "Every token has its own ID"
+
+def test_expired_token():
+    """Test that a token is rejected from its expiry on."""
+    token, _ = issue_token(7, SECRET, ttl=60, now=1000)
+    with pytest.raises(InvalidTokenError, match="expired"):
+        verify_token(token, SECRET, now=1060)
+
+@pytest.mark.parametrize("tamper", [
+    lambda token: token.replace(".", ".x", 1),
+    lambda token: "eyJzdWIiOjF9." + token.split(".")[1],
+    lambda token: token.split(".")[0],
+    lambda token: "",
+])
+def test_tampered_token(tamper):
+    """Test that altered, truncated or empty tokens are rejected."""
+    token, _ = issue_token(7, SECRET)
+    with pytest.raises(InvalidTokenError, match="Invalid session token"):
+        verify_token(tamper(token), SECRET)
+
+def test_wrong_secret():
+    """Test that a token signed with another key is rejected."""
+    token, _ = issue_token(7, SECRET)
+    with pytest.raises(InvalidTokenError):
+        verify_token(token, "other-secret")
+
+def test_revocation_list_drops_expired_entries(mocker):
+    """Test that revoked tokens are forgotten once they expire."""
+    revoked = TokenRevocationList()
+    mocker.patch("weather_app.utils.session_tokens.time.time", return_value=1000)
+    revoked.revoke("a", 1010)
+    revoked.revoke("b", 2000)
+    assert revoked.is_revoked("a") and len(revoked) == 2
+
+    mocker.patch("weather_app.utils.session_tokens.time.time", return_value=1500)
+    revoked.revoke("c", 2500)
+    assert not revoked.is_revoked("a")
+    assert revoked.is_revoked("b") and revoked.is_revoked("c")
+
+def test_sqlite_revocations_are_shared(tmp_path, mocker):
+    """Test that a token revoked through one list is revoked for another list on the same file."""
+    path = str(tmp_path / "revoked_tokens.db")
+    worker_a = TokenRevocationList(SQLiteRevocationBackend(path))
+    worker_b = TokenRevocationList(SQLiteRevocationBackend(path))
+    mocker.patch("weather_app.utils.session_tokens.time.time", return_value=1000)
+    worker_a.revoke("a", 1010)
+    assert worker_b.is_revoked("a") and len(worker_b) == 1
+    assert not worker_b.is_revoked("b")
+
+    mocker.patch("weather_app.utils.session_tokens.time.time", return_value=1500)
+    worker_b.revoke("b", 2000)
+    assert not worker_a.is_revoked("a") and worker_a.is_revoked("b")
+    assert len(worker_a) == 1
+
+def test_login_issues_token_and_logout_revokes_it(client):
+    """Test the token lifecycle through the login and logout routes."""
+    User.create_user("testuser", "password123")
+    response = client.post("/api/login", json={"username": "testuser", "password": "password123"})
+    body = response.get_json()
+    assert verify_token(body["token"], SECRET)["sub"] == body["user_id"]
+
+    headers = {"Authorization": f"Bearer {body['token']}"}
+    assert client.post("/api/logout", headers=headers).status_code == 200
+    response = client.post("/api/logout", headers=headers)
+    assert response.status_code == 401
+    assert response.get_json() == {"error": "Session token revoked"}
+
+def test_protected_route_requires_token(client):
+    """Test that a protected route rejects missing and invalid tokens."""
+    assert client.post("/api/logout").status_code == 401
+    assert client.post("/api/logout", headers={"Authorization": "Bearer nope"}).status_code == 401
+    assert client.post("/api/logout", headers={"Authorization": "Basic abc"}).status_code == 401
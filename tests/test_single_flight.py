@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from weather_app.utils.single_flight import SingleFlight
+
+
+def _run_concurrently(flight, func, callers=5):
+    """Starts several callers for the same key and returns their results."""
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(_capture(flight, func))) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+def _capture(flight, func):
+    try:
+        return flight.do("boston", func)
+    except Exception as e:
+        return e
+
+def test_concurrent_callers_share_one_call():
+    """Test that callers arriving during an in-flight call share its result."""
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(timeout=2)
+        return {"temp": 72}
+
+    threads, results = _run_concurrently(flight, fetch)
+    while flight.stats()["shared"] < 4:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1, "The upstream function should run once."
+    assert results == [{"temp": 72}] * 5
+    assert flight.stats() == {"executed": 1, "shared": 4}
+
+def test_concurrent_callers_share_errors():
+    """Test that every waiting caller receives the leader's exception."""
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(timeout=2)
+        raise ValueError("upstream failed")
+
+    threads, results = _run_concurrently(flight, fetch, callers=3)
+    while flight.stats()["shared"] < 2:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 3
+    assert all(isinstance(result, ValueError) for result in results)
+
+def test_sequential_calls_are_not_coalesced():
+    """Test that a finished call does not serve later callers."""
+    flight = SingleFlight()
+    assert flight.do("boston", lambda: 1) == 1
+    assert flight.do("boston", lambda: 2) == 2
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        flight.do("boston", fail)
+    assert flight.do("boston", lambda: 3) == 3
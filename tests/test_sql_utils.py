@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import create_engine
+
+from weather_app.db import db
+from weather_app.utils import sql_utils
+from weather_app.utils.sql_utils import (
+    check_database_connection,
+    check_database_health,
+    check_table_exists,
+    clear_health_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_health_cache():
+    clear_health_cache()
+    yield
+    clear_health_cache()
+
+def test_healthy(app):
+    """Test that an existing schema passes the connection and table checks."""
+    check_database_connection()
+    check_table_exists("users")
+    check_database_health(["users", "favorite_locations", "locations"])
+
+def test_tables_listed_through_inspector(app, mocker):
+    """Test that tables are listed with SQLAlchemy's dialect-neutral inspector."""
+    spy = mocker.spy(sql_utils, "inspect")
+    check_database_health(["users"])
+    spy.assert_called_once()
+
+def test_missing_tables(app):
+    """Test that every missing table is reported."""
+    with pytest.raises(Exception, match="no such table: nope, songs"):
+        check_database_health(["users", "songs", "nope"])
+
+def test_connection_error(tmp_path):
+    """Test that an unreachable database is reported as a connection error."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'weather_app.db'}")
+    with pytest.raises(Exception, match="Database connection error"):
+        check_database_connection(engine)
+    engine.dispose()
+
+def test_result_is_cached(app, mocker):
+    """Test that one query answers repeated checks within the TTL."""
+    spy = mocker.spy(sql_utils, "_run_health_check")
+    for _ in range(3):
+        check_database_health(["users", "favorite_locations"], ttl=60)
+    assert spy.call_count == 1
+
+    db.drop_all()
+    check_database_health(["favorite_locations", "users"], ttl=60)  # Still the cached result
+    with pytest.raises(Exception, match="no such table: favorite_locations, users"):
+        check_database_health(["users", "favorite_locations"], ttl=0)
+
+def test_db_check_route(client, mocker):
+    """Test that /api/db-check runs a single health query."""
+    spy = mocker.spy(sql_utils, "_run_health_check")
+    response = client.get("/api/db-check")
+    assert response.status_code == 200
+    assert response.get_json() == {"database_status": "healthy"}
+    assert spy.call_count == 1
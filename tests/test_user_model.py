@@ -1,8 +1,25 @@
+from contextlib import contextmanager
+
 import pytest
+from sqlalchemy import event
 
+from weather_app.db import db
 from weather_app.models.user_model import User
 
 
+@contextmanager
+def count_statements():
+    """Count the SQL statements sent to the database inside the block."""
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
 @pytest.fixture
 def sample_user():
     return {
@@ -65,6 +82,55 @@ def test_update_password_user_not_found(session):
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
         User.update_password("nonexistentuser", "newpassword")
 
+def test_change_password(session, sample_user):
+    """Test that a password change verifies the old password and updates the row it loaded."""
+    User.create_user(**sample_user)
+    session.expunge_all()
+    with count_statements() as statements:
+        assert User.change_password(sample_user["username"], sample_user["password"], "newpassword456") is True
+    assert [statement.split()[0] for statement in statements] == ["SELECT", "UPDATE"]
+    assert User.authenticate(sample_user["username"], "newpassword456") is not None
+
+def test_change_password_refused(session, sample_user):
+    """Test that a wrong old password or unknown user leaves the password unchanged."""
+    User.create_user(**sample_user)
+    assert User.change_password(sample_user["username"], "wrongpassword", "newpassword456") is False
+    assert User.change_password("nonexistentuser", "password", "newpassword456") is False
+    assert User.check_password(sample_user["username"], sample_user["password"]) is True
+
+##########################################################
+# Authentication
+##########################################################
+
+def test_authenticate(session, sample_user):
+    """Test that authentication returns the user's ID from a single query."""
+    User.create_user(**sample_user)
+    session.expunge_all()
+    with count_statements() as statements:
+        user_id = User.authenticate(sample_user["username"], sample_user["password"])
+    assert len(statements) == 1
+    assert user_id == User.get_id_by_username(sample_user["username"])
+
+def test_authenticate_failure(session, sample_user):
+    """Test that a wrong password or unknown user authenticates as None."""
+    User.create_user(**sample_user)
+    assert User.authenticate(sample_user["username"], "wrongpassword") is None
+    assert User.authenticate("nonexistentuser", "password") is None
+
+def test_login_and_update_password_routes(client, sample_user):
+    """Test the login and update-password routes."""
+    User.create_user(**sample_user)
+    response = client.post("/api/login", json=sample_user)
+    assert response.status_code == 200 and response.get_json()["user_id"] == 1
+    assert client.post("/api/login", json={**sample_user, "password": "wrong"}).status_code == 401
+    assert client.post("/api/login", json={"username": "nobody", "password": "x"}).status_code == 401
+
+    payload = {"username": sample_user["username"], "old_password": "wrong", "new_password": "newpassword456"}
+    assert client.put("/api/update-password", json=payload).status_code == 401
+    payload["old_password"] = sample_user["password"]
+    assert client.put("/api/update-password", json=payload).status_code == 200
+    assert client.post("/api/login", json={**sample_user, "password": "newpassword456"}).status_code == 200
+
 ##########################################################
 # Get User
 ##########################################################
@@ -0,0 +1,158 @@
+import pickle
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from tests.test_weather_client import ONECALL_DOCUMENT
+from weather_app.utils.weather_results import DaySummary, parse_onecall
+
+from weather_app.utils.weather_cache import (
+    CacheEntry,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    WeatherCache,
+    make_cache_key,
+    quantize_coordinates,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCacheBackend(maxsize=16)
+    return SQLiteCacheBackend(str(tmp_path / "weather_cache.db"))
+
+##########################################################
+# Cache Keys
+##########################################################
+
+def test_make_cache_key_rounds_coordinates():
+    """Test that nearby coordinates and reordered params share a key."""
+    key_a = make_cache_key("daily", 42.36012, -71.05891, {"units": "imperial", "exclude": "hourly"})
+    key_b = make_cache_key("daily", 42.36444, -71.05555, {"exclude": "hourly", "units": "imperial"})
+    assert key_a == key_b == "daily:42.36,-71.06:exclude=hourly&units=imperial"
+
+def test_make_cache_key_snaps_to_grid():
+    """Test that a coarser grid puts locations a few km apart in one cell."""
+    key_a = make_cache_key("onecall", 42.3736, -71.1097, {}, grid=0.05)
+    key_b = make_cache_key("onecall", 42.3318, -71.1212, {}, grid=0.05)
+    assert key_a == key_b == "onecall:42.35,-71.10:"
+    assert make_cache_key("onecall", 42.3736, -71.1097, {}, grid=0.25) == "onecall:42.25,-71.00:"
+
+def test_quantize_coordinates():
+    """Test that coordinates snap to the nearest cell center without float noise."""
+    assert quantize_coordinates(42.3736, -71.1097, grid=0.05) == (42.35, -71.1)
+    assert quantize_coordinates(-33.8688, 151.2093, grid=0.1) == (-33.9, 151.2)
+
+def test_sharing_stats_count_distinct_locations():
+    """Test that repeated requests from one location are not counted as sharing."""
+    cache = WeatherCache(MemoryCacheBackend(), grid=0.05)
+    cache.key_for("onecall", 42.3736, -71.1097, {})
+    cache.key_for("onecall", 42.3736, -71.1097, {})
+    cache.key_for("onecall", 40.7128, -74.0060, {})
+    assert cache.sharing_stats()["sharing_ratio"] == 1.0
+
+    cache.key_for("onecall", 42.3318, -71.1212, {})
+    assert cache.sharing_stats() == {
+        "grid_degrees": 0.05, "cells": 2, "locations": 3, "shared_cells": 1, "sharing_ratio": 1.5}
+
+def test_sharing_stats_ignore_endpoint_and_params():
+    """Test that other endpoints and dates in the same grid cell do not count as new cells."""
+    cache = WeatherCache(MemoryCacheBackend(), grid=0.05)
+    cache.key_for("onecall", 42.3736, -71.1097, {})
+    for day in ("2024-03-01", "2024-03-02", "2024-03-03"):
+        cache.key_for("day_summary", 42.3736, -71.1097, {"date": day})
+    assert cache.sharing_stats()["cells"] == 1
+    assert cache.sharing_stats()["locations"] == 1
+
+def test_make_cache_key_ignores_api_key():
+    """Test that the API key never ends up in a cache key."""
+    assert "appid" not in make_cache_key("daily", 1.0, 2.0, {"appid": "secret", "units": "imperial"})
+
+##########################################################
+# Backends
+##########################################################
+
+def test_backend_round_trip(backend):
+    """Test storing, reading and deleting an entry."""
+    backend.set("key", CacheEntry({"temp": 72}, 100.0))
+    assert backend.get("key") == CacheEntry({"temp": 72}, 100.0)
+    backend.delete("key")
+    assert backend.get("key") is None
+
+def test_backend_round_trip_of_results(backend):
+    """Test that the parsed weather results the clients cache come back intact."""
+    snapshot = parse_onecall(ONECALL_DOCUMENT)
+    summary = DaySummary("2024-09-10", 78, 61, 0.1, 55)
+    backend.set("onecall", CacheEntry(snapshot, 100.0))
+    backend.set("day_summary", CacheEntry(summary, 100.0))
+    assert backend.get("onecall") == CacheEntry(snapshot, 100.0)
+    assert backend.get("day_summary").value == summary
+    assert backend.get("onecall").value.daily[0].alerts == snapshot.daily[0].alerts
+
+def test_sqlite_backend_stores_json(tmp_path):
+    """Test that sqlite entries are JSON, and that unreadable (e.g. pickled) rows are a miss."""
+    path = str(tmp_path / "weather_cache.db")
+    backend = SQLiteCacheBackend(path)
+    backend.set("day_summary", CacheEntry(DaySummary("2024-09-10", 78, 61, 0.1, 55), 100.0))
+    with sqlite3.connect(path) as conn:
+        value = conn.execute("SELECT value FROM weather_cache WHERE key = 'day_summary'").fetchone()[0]
+        assert value.startswith('{"__result__":"DaySummary"')
+        conn.execute("INSERT INTO weather_cache (key, value, stored_at) VALUES ('old', ?, 100.0)",
+                     (pickle.dumps({"temp": 72}),))
+    assert backend.get("old") is None
+
+def test_sqlite_backend_purges_old_entries(tmp_path):
+    """Test that writes delete entries older than max_age, so the file stays bounded."""
+    backend = SQLiteCacheBackend(str(tmp_path / "weather_cache.db"), max_age=60)
+    now = time.time()
+    backend.set("old", CacheEntry({"temp": 60}, now - 120))
+    backend.set("recent", CacheEntry({"temp": 70}, now - 30))
+    backend.set("new", CacheEntry({"temp": 72}, now))
+    assert backend.get("old") is None
+    assert backend.get("recent").value == {"temp": 70}
+    assert backend.get("new").value == {"temp": 72}
+
+##########################################################
+# TTL and Stale-While-Revalidate
+##########################################################
+
+def test_get_or_fetch_serves_fresh_entries(backend, mocker):
+    """Test that a fresh entry is served without fetching again."""
+    cache = WeatherCache(backend, ttls={"daily": 60})
+    fetch = mocker.Mock(return_value={"temp": 72})
+
+    assert cache.get_or_fetch("daily", "key", fetch) == {"temp": 72}
+    assert cache.get_or_fetch("daily", "key", fetch) == {"temp": 72}
+    fetch.assert_called_once()
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+def test_get_or_fetch_refetches_after_stale_window(backend, mocker):
+    """Test that an entry past its TTL and stale window is fetched synchronously."""
+    cache = WeatherCache(backend, ttls={"daily": 60}, stale_seconds=60)
+    backend.set("key", CacheEntry({"temp": 50}, time.time() - 500))
+    fetch = mocker.Mock(return_value={"temp": 72})
+
+    assert cache.get_or_fetch("daily", "key", fetch) == {"temp": 72}
+    fetch.assert_called_once()
+
+def test_get_or_fetch_serves_stale_while_refreshing(backend):
+    """Test that a stale entry is served while a background refresh replaces it."""
+    cache = WeatherCache(backend, ttls={"daily": 60}, stale_seconds=600)
+    backend.set("key", CacheEntry({"temp": 50}, time.time() - 120))
+    refreshed = threading.Event()
+
+    def fetch():
+        refreshed.set()
+        return {"temp": 72}
+
+    assert cache.get_or_fetch("daily", "key", fetch) == {"temp": 50}
+    assert refreshed.wait(timeout=2), "A background refresh should have started."
+    for _ in range(100):
+        if cache.stats["refreshes"]:
+            break
+        time.sleep(0.01)
+    assert backend.get("key").value == {"temp": 72}
+    assert cache.stats["stale_hits"] == 1
@@ -0,0 +1,284 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+import pytest
+import requests
+
+from weather_app.models.geocode_cache_model import GeocodeCache
+from weather_app.utils import weather_client
+from weather_app.utils.circuit_breaker import BREAKER_FAILURE_THRESHOLD, circuit_stats, get_circuit_breaker
+from weather_app.utils.weather_cache import MemoryCacheBackend, WeatherCache
+from weather_app.utils.weather_client import WeatherClient, get_lat_long, normalize_location_name
+from weather_app.utils.weather_results import CurrentConditions, OneCallSnapshot
+
+
+BOSTON = (42.3601, -71.0589)
+
+@pytest.fixture(autouse=True)
+def clear_geocode_lru():
+    weather_client.geocode_lru.clear()
+    yield
+    weather_client.geocode_lru.clear()
+
+@pytest.fixture
+def mock_geocoder(mocker):
+    """Fixture to patch the Nominatim geocoder."""
+    location = mocker.Mock(latitude=BOSTON[0], longitude=BOSTON[1])
+    return mocker.patch.object(weather_client.geolocator, "geocode", return_value=location)
+
+##########################################################
+# Geocode Cache
+##########################################################
+
+def test_normalize_location_name():
+    """Test that location names are lowercased and whitespace is collapsed."""
+    assert normalize_location_name("  Boston,   MA ") == "boston, ma"
+
+def test_get_lat_long_geocodes_once(session, mock_geocoder):
+    """Test that repeated lookups are served from the LRU."""
+    assert get_lat_long("Boston") == BOSTON
+    assert get_lat_long("  boston ") == BOSTON
+    mock_geocoder.assert_called_once_with("Boston")
+
+def test_get_lat_long_persists_to_table(session, mock_geocoder):
+    """Test that a geocode survives an LRU flush through the geocode_cache table."""
+    get_lat_long("Boston")
+    weather_client.geocode_lru.clear()
+
+    assert get_lat_long("Boston") == BOSTON
+    mock_geocoder.assert_called_once()
+    entry = session.query(GeocodeCache).filter_by(normalized_name="boston").first()
+    assert entry is not None, "Geocode should be stored in the database."
+    assert entry.provider == "nominatim"
+
+def test_get_lat_long_unknown_location(session, mocker):
+    """Test that unknown locations are not cached."""
+    mocker.patch.object(weather_client.geolocator, "geocode", return_value=None)
+    assert get_lat_long("Nowhere") is None
+    assert "nowhere" not in weather_client.geocode_lru
+
+def test_resolve_coordinates_unknown_location(session, mocker):
+    """Test that WeatherClient raises a ValueError for unknown locations."""
+    mocker.patch.object(weather_client.geolocator, "geocode", return_value=None)
+    with pytest.raises(ValueError, match="Location 'Nowhere' not found"):
+        WeatherClient().get_weather("Nowhere")
+
+##########################################################
+# Response Cache
+##########################################################
+
+ONECALL_DOCUMENT = {
+    "timezone_offset": -18000,
+    "current": {"dt": 1733936400, "temp": 70, "feels_like": 69, "humidity": 42, "weather": [{"description": "clear sky"}]},
+    "hourly": [{"dt": 1733936400, "temp": 71, "feels_like": 70, "humidity": 45, "weather": [{"description": "few clouds"}]}],
+    "daily": [{"dt": 1733936400, "summary": "Clear all day", "temp": {"max": 80, "min": 60}, "humidity": 40,
+               "weather": [{"description": "clear sky"}]}],
+    "alerts": [{"description": "Wind advisory"}],
+}
+
+@pytest.fixture
+def mock_onecall(mocker):
+    """Fixture to patch the OneCall HTTP request."""
+    response = mocker.Mock()
+    response.json.return_value = ONECALL_DOCUMENT
+    return mocker.patch("requests.Session.get", return_value=response)
+
+@pytest.fixture
+def cached_client():
+    return WeatherClient(cache=WeatherCache(MemoryCacheBackend()))
+
+def test_get_daily_forecast_uses_response_cache(session, mock_geocoder, mock_onecall, cached_client):
+    """Test that a second forecast for the same location is served from the cache."""
+    first = cached_client.get_daily_forecast("Boston")
+    second = cached_client.get_daily_forecast("Boston")
+
+    assert first == second
+    assert first.high == 80 and first.alerts == ("Wind advisory",)
+    mock_onecall.assert_called_once()
+    assert mock_onecall.call_args.kwargs["params"]["exclude"] == "minutely"
+
+##########################################################
+# Shared OneCall Document
+##########################################################
+
+def test_views_share_one_onecall_fetch(session, mock_geocoder, mock_onecall, cached_client):
+    """Test that overview, daily, hourly and alerts are derived from one upstream call."""
+    overview = cached_client.get_weather("Boston")
+    daily = cached_client.get_daily_forecast("Boston")
+    hourly = cached_client.get_hourly_forecast("Boston")
+    alerts = cached_client.get_alerts("Boston")
+
+    mock_onecall.assert_called_once()
+    assert overview == CurrentConditions("2024-12-11", 70, 69, 42, "clear sky", "Clear all day")
+    assert daily.low == 60
+    assert hourly.temperature == 71 and hourly.time == "2024-12-11T12:00"
+    assert alerts == ["Wind advisory"]
+
+def test_get_dashboard(session, mock_geocoder, mock_onecall, cached_client):
+    """Test that the dashboard returns every view from a single fetch."""
+    dashboard = cached_client.get_dashboard("Boston")
+    assert set(dashboard) == {"overview", "daily", "hourly", "alerts"}
+    mock_onecall.assert_called_once()
+
+def test_get_daily_forecast_without_alerts(session, mock_geocoder, mock_onecall, cached_client):
+    """Test that a document without alerts does not raise."""
+    mock_onecall.return_value.json.return_value = {k: v for k, v in ONECALL_DOCUMENT.items() if k != "alerts"}
+    assert cached_client.get_daily_forecast("Boston").alerts == ()
+    assert cached_client.get_alerts("Boston") == []
+
+def test_response_cache_stores_parsed_results(session, mock_geocoder, mock_onecall, cached_client):
+    """Test that the cache holds the parsed snapshot rather than the JSON document."""
+    cached_client.get_weather("Boston")
+    (entry,) = cached_client.cache.backend._lru._data.values()
+    assert isinstance(entry.value, OneCallSnapshot)
+
+def test_get_weather_for_favorite_route_formats(client, mocker):
+    """Test that the route returns structured JSON unless text is requested."""
+    conditions = CurrentConditions("2024-12-11", 70, 69, 42, "clear sky", "Clear all day")
+    mocker.patch.object(WeatherClient, "get_weather", return_value=conditions)
+
+    response = client.get("/api/get-weather-for-favorite?location_name=Boston")
+    assert response.get_json()["weather"] == conditions.to_dict()
+
+    response = client.get("/api/get-weather-for-favorite?location_name=Boston&format=text")
+    assert response.get_json()["weather"] == "Location: Boston \n Date: 2024-12-11 \n Overview: Clear all day"
+
+##########################################################
+# Connection Pooling
+##########################################################
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"date": "2024-12-11", "weather_overview": "Sunny"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def keep_alive_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_connection_stats_report_reuse(keep_alive_server):
+    """Test that sequential requests reuse one kept-alive connection."""
+    client = WeatherClient(cache=WeatherCache(MemoryCacheBackend()), pool_size=2)
+    for _ in range(3):
+        client.session.get(keep_alive_server, timeout=client.timeout).raise_for_status()
+
+    assert client.connection_stats() == {"requests": 3, "connections_opened": 1, "connections_reused": 2}
+    client.close()
+
+def test_from_config_applies_timeouts():
+    """Test that pool size and timeouts are read from the app config."""
+    client = WeatherClient.from_config({"WEATHER_POOL_SIZE": 4, "WEATHER_CONNECT_TIMEOUT": 1.5, "WEATHER_READ_TIMEOUT": 7})
+    assert client.timeout == (1.5, 7)
+    assert client.session.get_adapter("https://api.openweathermap.org")._pool_maxsize == 4
+
+def test_weather_stats_route(client):
+    """Test that the app exposes the shared client's statistics."""
+    response = client.get("/api/weather-stats")
+    assert response.status_code == 200
+    assert set(response.get_json()) == {"connections", "cache", "sharing", "coalescing", "rate_limits", "circuits"}
+
+def test_warm_geocode_cache_loads_table_in_bulk(session, mock_geocoder):
+    """Test that cached geocodes are loaded into the LRU without geocoding."""
+    session.add(GeocodeCache(normalized_name="chicago", latitude=41.88, longitude=-87.63, provider="nominatim"))
+    session.commit()
+
+    weather_client.warm_geocode_cache(["Chicago", "Atlantis"])
+    assert weather_client.geocode_lru.get("chicago") == (41.88, -87.63)
+    assert "atlantis" not in weather_client.geocode_lru
+    mock_geocoder.assert_not_called()
+
+def test_prefetch_onecall_refreshes_only_near_expiry(session, mock_geocoder, mock_onecall, cached_client):
+    """Test that prefetching skips fresh snapshots and refreshes ones about to expire."""
+    assert cached_client.prefetch_onecall("Boston", lead_seconds=60) is True
+    assert cached_client.prefetch_onecall("Boston", lead_seconds=60) is False
+    assert cached_client.prefetch_onecall("Boston", lead_seconds=3600) is True
+    assert mock_onecall.call_count == 2
+
+##########################################################
+# Circuit Breaker and Retries
+##########################################################
+
+def http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(f"{status_code} Server Error", response=response)
+
+@pytest.fixture
+def no_backoff(mocker):
+    return mocker.patch("weather_app.utils.circuit_breaker.time.sleep")
+
+def test_transient_errors_are_retried(session, mock_geocoder, mock_onecall, cached_client, no_backoff):
+    """Test that a 503 is retried and the request still succeeds."""
+    mock_onecall.return_value.raise_for_status.side_effect = [http_error(503), None]
+    assert cached_client.get_weather("Boston").temperature == 70
+    assert mock_onecall.call_count == 2
+
+def test_prefetch_reports_every_attempt(session, mock_geocoder, mock_onecall, cached_client, no_backoff, mocker):
+    """Test that a prefetch reports each upstream attempt, retries included."""
+    mock_onecall.return_value.raise_for_status.side_effect = [http_error(503), None]
+    on_attempt = mocker.Mock()
+    assert cached_client.prefetch_onecall("Boston", lead_seconds=60, on_attempt=on_attempt) is True
+    assert on_attempt.call_count == 2
+
+def test_client_errors_are_not_retried(session, mock_geocoder, mock_onecall, cached_client, no_backoff):
+    """Test that a 401 fails at once without counting against the circuit."""
+    mock_onecall.return_value.raise_for_status.side_effect = http_error(401)
+    with pytest.raises(ValueError, match="401"):
+        cached_client.get_weather("Boston")
+    assert mock_onecall.call_count == 1
+    assert circuit_stats()["onecall"]["failures"] == 0
+
+def test_open_circuit_fails_fast(session, mock_geocoder, mock_onecall, cached_client, no_backoff):
+    """Test that once the circuit opens, callers fail without waiting on the upstream."""
+    mock_onecall.side_effect = requests.exceptions.ConnectionError("connection refused")
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(ValueError):
+            cached_client.get_weather("Boston")
+    calls = mock_onecall.call_count
+
+    with pytest.raises(ValueError, match="Weather API 'onecall' is unavailable"):
+        cached_client.get_weather("Boston")
+    assert mock_onecall.call_count == calls
+
+def test_open_circuit_serves_expired_cache(session, mock_geocoder, mock_onecall, no_backoff):
+    """Test that an expired snapshot is served while the circuit is open."""
+    client = WeatherClient(cache=WeatherCache(MemoryCacheBackend(), ttls={"onecall": 0}, stale_seconds=0))
+    expected = client.get_weather("Boston")
+
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        get_circuit_breaker("onecall").record_failure()
+    mock_onecall.side_effect = requests.exceptions.ConnectionError("connection refused")
+
+    assert client.get_weather("Boston") == expected
+
+##########################################################
+# Grid Sharing
+##########################################################
+
+def test_nearby_locations_share_one_fetch(mock_onecall):
+    """Test that two locations in one grid cell share a fetch made at the cell's center."""
+    client = WeatherClient(cache=WeatherCache(MemoryCacheBackend(), grid=0.05))
+
+    cambridge = client.get_weather_at(42.3736, -71.1097)
+    brookline = client.get_weather_at(42.3318, -71.1212)
+
+    assert cambridge == brookline
+    mock_onecall.assert_called_once()
+    params = mock_onecall.call_args.kwargs["params"]
+    assert (params["lat"], params["lon"]) == (42.35, -71.1)
+    assert client.cache.sharing_stats() == {
+        "grid_degrees": 0.05, "cells": 1, "locations": 2, "shared_cells": 1, "sharing_ratio": 2.0}
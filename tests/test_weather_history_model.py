@@ -0,0 +1,189 @@
+from datetime import date, timedelta
+import json
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from weather_app.db import db
+from weather_app.models.favorite_locations_model import FavoriteLocations
+from weather_app.models.location_model import Location
+from weather_app.models.weather_history_model import WeatherHistory, parse_date
+from weather_app.utils.weather_client import WeatherClient
+from weather_app.utils.weather_results import DaySummary
+
+
+def summary_for(day):
+    return DaySummary(day.isoformat(), 80, 60, 0.1, 40)
+
+@pytest.fixture
+def boston(session):
+    location = Location.get_or_create("Boston")
+    session.commit()
+    return location
+
+def test_parse_date_accepts_unpadded_dates():
+    """Test that dates are parsed with or without zero padding."""
+    assert parse_date("2024-9-10") == parse_date("2024-09-10") == date(2024, 9, 10)
+    with pytest.raises(ValueError, match="Invalid date 'yesterday'"):
+        parse_date("yesterday")
+
+def test_recent_dates_are_not_stored(boston):
+    """Test that only settled dates are stored permanently."""
+    today = date.today()
+    assert WeatherHistory.store(boston.id, today, summary_for(today)) is False
+    assert WeatherHistory.lookup(boston.id, today) is None
+
+def test_store_and_lookup(boston):
+    """Test that a stored summary is returned, and storing it twice keeps one row."""
+    day = date(2024, 3, 5)
+    assert WeatherHistory.store(boston.id, day, summary_for(day)) is True
+    assert WeatherHistory.store(boston.id, day, summary_for(day)) is True
+    assert WeatherHistory.lookup(boston.id, day) == summary_for(day)
+    assert WeatherHistory.query.count() == 1
+
+def test_lookup_range(boston):
+    """Test that a range query returns the stored dates in order and leaves out the others."""
+    for day in (date(2024, 3, 31), date(2024, 3, 1), date(2024, 4, 1), date(2024, 2, 29)):
+        WeatherHistory.store(boston.id, day, summary_for(day))
+
+    march = WeatherHistory.lookup_range(boston.id, date(2024, 3, 1), date(2024, 3, 31))
+    assert list(march) == [date(2024, 3, 1), date(2024, 3, 31)]
+    assert march[date(2024, 3, 1)] == summary_for(date(2024, 3, 1))
+
+def test_get_dated_forecast_fetches_past_dates_once(session, mocker):
+    """Test that a settled date costs one weather API call, then comes from the history."""
+    weather_client = mocker.Mock()
+    weather_client.get_date_forecast.return_value = summary_for(date(2024, 3, 5))
+
+    first = FavoriteLocations.get_dated_forecast("Boston", "2024-3-5", weather_client)
+    second = FavoriteLocations.get_dated_forecast("boston", "2024-03-05", weather_client)
+
+    assert first == second == summary_for(date(2024, 3, 5))
+    weather_client.get_date_forecast.assert_called_once_with("Boston", "2024-03-05")
+
+def test_get_dated_forecast_recent_dates_skip_history(session, mocker):
+    """Test that dates that may still change are always fetched."""
+    day = date.today() - timedelta(days=1)
+    weather_client = mocker.Mock()
+    weather_client.get_date_forecast.return_value = summary_for(day)
+
+    FavoriteLocations.get_dated_forecast("Boston", day.isoformat(), weather_client)
+    FavoriteLocations.get_dated_forecast("Boston", day.isoformat(), weather_client)
+
+    assert weather_client.get_date_forecast.call_count == 2
+    assert WeatherHistory.query.count() == 0
+
+def test_get_dated_forecast_unknown_location_is_not_cataloged(session, mocker):
+    """Test that a name that cannot be geocoded leaves no catalog entry behind."""
+    weather_client = mocker.Mock()
+    weather_client.get_date_forecast.side_effect = ValueError("Location 'Atlantis' not found")
+
+    with pytest.raises(ValueError):
+        FavoriteLocations.get_dated_forecast("Atlantis", "2024-03-05", weather_client)
+    assert Location.query.count() == 0
+
+##########################################################
+# Date Ranges
+##########################################################
+
+def test_get_history_backfills_only_missing_days(boston, mocker):
+    """Test that stored days are not fetched again and every day comes back in date order."""
+    WeatherHistory.store(boston.id, date(2024, 3, 2), summary_for(date(2024, 3, 2)))
+    weather_client = mocker.Mock()
+    weather_client.get_date_forecast.side_effect = lambda name, day: summary_for(parse_date(day))
+
+    results = list(FavoriteLocations.get_history("Boston", "2024-03-01", "2024-03-04", weather_client))
+
+    assert [result['date'] for result in results] == ["2024-03-01", "2024-03-02", "2024-03-03", "2024-03-04"]
+    assert all(result['status'] == 'success' for result in results)
+    assert sorted(call.args[1] for call in weather_client.get_date_forecast.call_args_list) == [
+        "2024-03-01", "2024-03-03", "2024-03-04"]
+    assert len(WeatherHistory.lookup_range(boston.id, date(2024, 3, 1), date(2024, 3, 4))) == 4
+
+def test_get_history_defers_days_beyond_the_budget(boston, mocker):
+    """Test that at most max_fetches days are fetched per call."""
+    weather_client = mocker.Mock()
+    weather_client.get_date_forecast.side_effect = lambda name, day: summary_for(parse_date(day))
+
+    results = list(FavoriteLocations.get_history("Boston", "2024-03-01", "2024-03-03", weather_client, max_fetches=2))
+
+    assert [result['status'] for result in results] == ['success', 'success', 'deferred']
+
+def test_get_history_honors_zero_max_fetches(boston, mocker):
+    """Test that an explicit budget of zero fetches nothing."""
+    weather_client = mocker.Mock()
+
+    results = list(FavoriteLocations.get_history("Boston", "2024-03-01", "2024-03-02", weather_client, max_fetches=0))
+
+    assert [result['status'] for result in results] == ['deferred', 'deferred']
+    weather_client.get_date_forecast.assert_not_called()
+
+def test_get_history_catalogs_location_after_first_fetch(session, mocker):
+    """Test that the location joins the catalog only once a day is fetched for it."""
+    weather_client = mocker.Mock()
+    weather_client.get_date_forecast.side_effect = ValueError("Location 'Atlantis' not found")
+    results = list(FavoriteLocations.get_history("Atlantis", "2024-03-01", "2024-03-02", weather_client))
+    assert [result['status'] for result in results] == ['error', 'error']
+    assert Location.query.count() == 0
+
+    weather_client.get_date_forecast.side_effect = lambda name, day: summary_for(parse_date(day))
+    results = list(FavoriteLocations.get_history("Boston", "2024-03-01", "2024-03-02", weather_client))
+    assert [result['status'] for result in results] == ['success', 'success']
+    boston = Location.query.one()
+    assert len(WeatherHistory.lookup_range(boston.id, date(2024, 3, 1), date(2024, 3, 2))) == 2
+
+def test_get_history_reports_failed_days(boston, mocker):
+    """Test that one failed day does not stop the rest of the range."""
+    def fetch(name, day):
+        if day == "2024-03-02":
+            raise ValueError("Weather API 'day_summary' is unavailable")
+        return summary_for(parse_date(day))
+    weather_client = mocker.Mock()
+    weather_client.get_date_forecast.side_effect = fetch
+
+    results = list(FavoriteLocations.get_history("Boston", "2024-03-01", "2024-03-03", weather_client))
+
+    assert [result['status'] for result in results] == ['success', 'error', 'success']
+    assert "unavailable" in results[1]['error']
+
+def test_get_history_yields_days_it_could_not_store(boston, mocker):
+    """Test that a database error storing a fetched day still yields that day's weather."""
+    weather_client = mocker.Mock()
+    weather_client.get_date_forecast.side_effect = lambda name, day: summary_for(parse_date(day))
+    locked = OperationalError("INSERT", {}, Exception("database is locked"))
+    mocker.patch.object(WeatherHistory, "store", side_effect=[locked, True])
+    rollback = mocker.spy(db.session, "rollback")
+
+    results = list(FavoriteLocations.get_history("Boston", "2024-03-01", "2024-03-02", weather_client))
+
+    assert [result['status'] for result in results] == ['success', 'success']
+    assert results[0]['weather'] == summary_for(date(2024, 3, 1))
+    rollback.assert_called_once()
+
+@pytest.mark.parametrize("start, end, message", [
+    ("2024-03-05", "2024-03-01", "'end' must not be before 'start'"),
+    ("2020-01-01", "2024-01-01", "At most 366 days"),
+    ("March", "2024-03-01", "Invalid date 'March'"),
+])
+def test_get_history_validates_range(session, mocker, start, end, message):
+    """Test that invalid ranges are rejected before anything is fetched."""
+    with pytest.raises(ValueError, match=message):
+        FavoriteLocations.get_history("Boston", start, end, mocker.Mock())
+
+def test_history_route_streams_ndjson(client, mocker):
+    """Test that the route streams one JSON line per day."""
+    mocker.patch.object(WeatherClient, "get_date_forecast",
+                        side_effect=lambda name, day: summary_for(parse_date(day)))
+
+    response = client.get("/api/history?location_name=Boston&start=2024-03-01&end=2024-03-02")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['date'] for line in lines] == ["2024-03-01", "2024-03-02"]
+    assert lines[0]['weather']['high'] == 80
+
+def test_history_route_rejects_bad_range(client):
+    """Test that a reversed range is a 400 rather than a broken stream."""
+    response = client.get("/api/history?location_name=Boston&start=2024-03-05&end=2024-03-01")
+    assert response.status_code == 400
@@ -0,0 +1,53 @@
+import json
+import pickle
+
+from weather_app.models.favorite_locations_model import FavoriteLocations
+from weather_app.utils.weather_results import (
+    DailyForecast,
+    DaySummary,
+    format_text,
+    parse_day_summary,
+)
+
+
+DAILY = DailyForecast("2024-12-11", 80, 60, 40, "clear sky", "Clear all day", ("Wind advisory",))
+
+def test_to_dict_and_to_json():
+    """Test the fast serialization path of a weather result."""
+    assert DAILY.to_dict()["high"] == 80
+    assert json.loads(DAILY.to_json())["alerts"] == ["Wind advisory"]
+
+def test_routes_serialize_results_with_to_dict(client, mocker):
+    """Test that route responses serialize results through to_dict rather than dataclasses.asdict."""
+    mocker.patch.object(FavoriteLocations, "get_weather_for_favorite", return_value=DAILY)
+    asdict = mocker.patch("flask.json.provider.dataclasses.asdict")
+
+    response = client.get("/api/get-weather-for-favorite?location_name=Boston")
+    assert response.status_code == 200
+    assert response.get_json()["weather"] == {**DAILY.to_dict(), "alerts": ["Wind advisory"]}
+    asdict.assert_not_called()
+
+def test_results_use_slots():
+    """Test that results do not carry a per-instance __dict__."""
+    assert not hasattr(DAILY, "__dict__")
+
+def test_results_pickle_round_trip():
+    """Test that frozen, slotted results survive pickling, as the sqlite cache backend stores them."""
+    summary = DaySummary("2024-09-10", 78, 61, 0.1, 55)
+    for result in (DAILY, summary):
+        assert pickle.loads(pickle.dumps(result)) == result
+
+def test_parse_day_summary():
+    """Test parsing a day_summary document."""
+    summary = parse_day_summary({
+        "date": "2024-09-10",
+        "temperature": {"max": 78, "min": 61},
+        "precipitation": {"total": 0.1},
+        "humidity": {"afternoon": 55},
+    })
+    assert summary == DaySummary("2024-09-10", 78, 61, 0.1, 55)
+
+def test_format_text():
+    """Test the opt-in text rendering of results and dashboards."""
+    assert format_text("Boston", DAILY) == "Location: Boston \n High: 80F \n Low: 60F \n Humidity: 40% \n Weather: clear sky \n Alerts: Wind advisory"
+    assert format_text("Boston", {"alerts": ["Wind advisory"]}) == {"alerts": ["Wind advisory"]}
@@ -1,11 +1,64 @@
+import os
+import sqlite3
+from typing import Dict, Optional
+
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
 
 db = SQLAlchemy()
 
+# Pragma profiles applied to every SQLite connection, on top of foreign_keys=ON.
+# "wal" lets readers run alongside a writer and makes writers queue instead of
+# failing with "database is locked"; "legacy" keeps SQLite's rollback journal defaults.
+SQLITE_PRAGMA_PROFILES: Dict[str, Dict[str, str]] = {
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",  # Durable across app crashes; an OS crash may lose the last commits
+        "busy_timeout": "5000",  # Milliseconds a writer waits for the lock
+        "cache_size": "-20000",  # Negative values are KiB, so about 20 MB per connection
+        "mmap_size": "134217728",  # 128 MB of the file read through memory mapping
+    },
+    "legacy": {},
+}
+
+
+def sqlite_pragmas(profile: Optional[str] = None) -> Dict[str, str]:
+    """
+    Returns the pragmas of a profile, with per-pragma overrides from the environment.
+
+    Each pragma can be overridden with SQLITE_<PRAGMA>, e.g. SQLITE_BUSY_TIMEOUT=10000.
+
+    Args:
+        profile (Optional[str]): The profile name. Defaults to SQLITE_PRAGMA_PROFILE, then "wal".
+
+    Returns:
+        Dict[str, str]: The pragma values keyed by pragma name.
+
+    Raises:
+        ValueError: If the profile is unknown.
+    """
+    profile = (profile or os.getenv("SQLITE_PRAGMA_PROFILE", "wal")).lower()
+    if profile not in SQLITE_PRAGMA_PROFILES:
+        raise ValueError(f"Unknown SQLite pragma profile '{profile}'; expected one of: "
+                         f"{', '.join(SQLITE_PRAGMA_PROFILES)}")
+    pragmas = dict(SQLITE_PRAGMA_PROFILES[profile])
+    for name in SQLITE_PRAGMA_PROFILES["wal"]:
+        value = os.getenv(f"SQLITE_{name.upper()}")
+        if value:
+            pragmas[name] = value
+    return pragmas
+
+
+SQLITE_PRAGMAS = sqlite_pragmas()
+
+
 @event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA foreign_keys=ON;")
-    cursor.close()
\ No newline at end of file
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value};")
+    cursor.close()
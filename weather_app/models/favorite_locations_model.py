@@ -1,10 +1,19 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date, timedelta
 import logging
-from typing import List, Any
+import os
+from typing import Awaitable, Callable, Iterator, List, Any, Optional
 from dataclasses import asdict, dataclass
 
-from sqlalchemy.exc import IntegrityError
+from flask import current_app, has_app_context
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from weather_app.models.location_model import Location
+from weather_app.models.weather_history_model import WeatherHistory, parse_date
 from weather_app.utils.logger import configure_logger
-from weather_app.utils.weather_client import WeatherClient
+from weather_app.utils.weather_client import WeatherClient, normalize_location_name, warm_geocode_cache
 from weather_app.db import db
 
 
@@ -12,6 +21,123 @@ from weather_app.db import db
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
+# Per-request limits for fetching weather for many favorites at once
+WEATHER_MAX_WORKERS = int(os.getenv("WEATHER_MAX_WORKERS", "8"))
+WEATHER_DEADLINE_SECONDS = float(os.getenv("WEATHER_DEADLINE_SECONDS", "10"))
+WEATHER_BATCH_MAX_LOCATIONS = int(os.getenv("WEATHER_BATCH_MAX_LOCATIONS", "250"))
+WEATHER_ASYNC_MAX_CONCURRENCY = int(os.getenv("WEATHER_ASYNC_MAX_CONCURRENCY", "100"))
+# Page sizes of keyset-paginated favorite listings
+FAVORITES_PAGE_SIZE = int(os.getenv("FAVORITES_PAGE_SIZE", "100"))
+FAVORITES_MAX_PAGE_SIZE = int(os.getenv("FAVORITES_MAX_PAGE_SIZE", "1000"))
+# Most favorites added or deleted by one bulk call
+FAVORITES_BULK_MAX_ITEMS = int(os.getenv("FAVORITES_BULK_MAX_ITEMS", "500"))
+# Limits for streaming a date range of weather history
+WEATHER_HISTORY_MAX_DAYS = int(os.getenv("WEATHER_HISTORY_MAX_DAYS", "366"))
+WEATHER_HISTORY_MAX_WORKERS = int(os.getenv("WEATHER_HISTORY_MAX_WORKERS", "4"))
+WEATHER_HISTORY_MAX_FETCHES = int(os.getenv("WEATHER_HISTORY_MAX_FETCHES", "60"))
+
+
+def _fan_out(func: Callable[[Any], Any], items: List[Any], max_workers: int, deadline: float) -> List[dict[str, Any]]:
+    """
+    Calls func for every item on a bounded thread pool.
+
+    Each worker runs inside the caller's app context (when there is one) so that
+    database-backed caches keep working off the request thread.
+
+    Args:
+        func (Callable[[Any], Any]): The function to call for each item.
+        items (List[Any]): The items to process.
+        max_workers (int): The maximum number of concurrent calls.
+        deadline (float): The total number of seconds to wait for all calls.
+
+    Returns:
+        List[dict[str, Any]]: One outcome per item, in input order. Each outcome holds
+            either a 'result' or an 'error' key.
+    """
+    if not items:
+        return []
+
+    app = current_app._get_current_object() if has_app_context() else None
+
+    def run(item):
+        if app is None:
+            return func(item)
+        with app.app_context():
+            return func(item)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items))))
+    try:
+        futures = [executor.submit(run, item) for item in items]
+        wait(futures, timeout=deadline)
+        outcomes = []
+        for item, future in zip(items, futures):
+            if not future.done():
+                future.cancel()
+                logger.error("Timed out after %.1fs waiting on '%s'", deadline, item)
+                outcomes.append({'error': f"Timed out after {deadline:g} seconds"})
+            elif future.exception() is not None:
+                outcomes.append({'error': str(future.exception())})
+            else:
+                outcomes.append({'result': future.result()})
+        return outcomes
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _fan_out_async(func: Callable[[Any], Awaitable[Any]], items: List[Any], max_concurrency: int,
+                         deadline: float) -> List[dict[str, Any]]:
+    """
+    Awaits func for every item on the running event loop, with bounded concurrency.
+
+    Args:
+        func (Callable[[Any], Awaitable[Any]]): The coroutine function to call for each item.
+        items (List[Any]): The items to process.
+        max_concurrency (int): The maximum number of calls in flight at once.
+        deadline (float): The total number of seconds to wait for all calls.
+
+    Returns:
+        List[dict[str, Any]]: One outcome per item, in input order. Each outcome holds
+            either a 'result' or an 'error' key.
+    """
+    if not items:
+        return []
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(item):
+        async with semaphore:
+            return await func(item)
+
+    tasks = [asyncio.ensure_future(run(item)) for item in items]
+    await asyncio.wait(tasks, timeout=deadline)
+    outcomes = []
+    for item, task in zip(items, tasks):
+        if not task.done():
+            task.cancel()
+            logger.error("Timed out after %.1fs waiting on '%s'", deadline, item)
+            outcomes.append({'error': f"Timed out after {deadline:g} seconds"})
+        elif task.exception() is not None:
+            outcomes.append({'error': str(task.exception())})
+        else:
+            outcomes.append({'result': task.result()})
+    return outcomes
+
+
+def _batch_key(location: Any) -> Optional[tuple]:
+    """
+    Returns the key that identifies duplicate batch locations, or None if the location is invalid.
+    """
+    if isinstance(location, str) and location.strip():
+        return ('name', normalize_location_name(location))
+    if isinstance(location, dict):
+        try:
+            latitude, longitude = float(location['lat']), float(location['lon'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+            return ('coordinates', latitude, longitude)
+    return None
+
 
 @dataclass
 class FavoriteLocations(db.Model):
@@ -23,8 +149,13 @@ class FavoriteLocations(db.Model):
     id: int = db.Column(db.Integer, primary_key=True)
     user_id: int = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     location_name: str = db.Column(db.String(100), nullable=False)
+    location_id: int = db.Column(db.Integer, db.ForeignKey('locations.id'), nullable=True, index=True)
 
-    __table_args__ = (db.UniqueConstraint('user_id', 'location_name', name='user_location_uc'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'location_name', name='user_location_uc'),
+        # Serves keyset pages of one user's favorites in ID order without a sort
+        db.Index('ix_favorite_locations_user_id_id', 'user_id', 'id'),
+    )
     """
     A class to manage a list of favorite locations.
 
@@ -56,8 +187,9 @@ class FavoriteLocations(db.Model):
             IntegrityError: If the user_id does not exist in the users table.
         """
         logger.info("Adding favorite location '%s' for user_id %d", location_name, user_id)
-        favorite = cls(user_id=user_id, location_name=location_name)
         try:
+            favorite = cls(user_id=user_id, location_name=location_name,
+                           location_id=Location.get_or_create(location_name).id)
             db.session.add(favorite)
             db.session.commit()
             logger.info("Successfully added favorite location '%s' for user_id %d", location_name, user_id)
@@ -85,12 +217,103 @@ class FavoriteLocations(db.Model):
             List[dict[str, Any]]: List of favorite locations as dictionaries.
         """
         logger.info("Fetching favorite locations for user_id %d", user_id)
-        favorites = cls.query.filter_by(user_id=user_id).all()
+        favorites = cls._favorites_after(user_id, 0).all()
         if not favorites:
             logger.info("No favorite locations found for user_id %d", user_id)
             return []
         return [{'id': fav.id, 'location_name': fav.location_name} for fav in favorites]
+
+    @classmethod
+    def _favorites_after(cls, user_id: int, after_id: int):
+        """
+        Returns the query of a user's favorites with IDs above after_id, in ID order.
+
+        Only the two columns are selected, so rows come back as plain tuples without
+        building ORM objects or adding them to the session's identity map.
+        """
+        return (db.session.query(cls.id, cls.location_name)
+                .filter(cls.user_id == user_id, cls.id > after_id)
+                .order_by(cls.id))
+
+    @classmethod
+    def get_favorites_page(cls, user_id: int, after_id: int = 0, limit: Optional[int] = None) -> dict[str, Any]:
+        """
+        Retrieves one page of a user's favorite locations, in ID order.
+
+        Pages are addressed by the last ID of the previous page rather than an offset,
+        so each page is an index range scan however deep into the list it is.
+
+        Args:
+            user_id (int): The user's ID.
+            after_id (int): Return favorites with IDs above this one; 0 for the first page.
+            limit (Optional[int]): The page size, at most FAVORITES_MAX_PAGE_SIZE. Defaults to FAVORITES_PAGE_SIZE.
+
+        Returns:
+            dict[str, Any]: The page's 'locations' and the 'next_cursor' to pass as after_id for the
+                next page, or None if this is the last page.
+
+        Raises:
+            ValueError: If after_id is negative or limit is out of range.
+        """
+        limit = FAVORITES_PAGE_SIZE if limit is None else limit
+        if not 1 <= limit <= FAVORITES_MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {FAVORITES_MAX_PAGE_SIZE}")
+        if after_id < 0:
+            raise ValueError("after_id cannot be negative")
+
+        logger.info("Fetching up to %d favorite locations after ID %d for user_id %d", limit, after_id, user_id)
+        # One extra row tells whether another page follows
+        rows = cls._favorites_after(user_id, after_id).limit(limit + 1).all()
+        page = rows[:limit]
+        return {
+            'locations': [{'id': row.id, 'location_name': row.location_name} for row in page],
+            'next_cursor': page[-1].id if len(rows) > limit else None,
+        }
     
+    @classmethod
+    def get_location_popularity(cls) -> List[dict[str, Any]]:
+        """
+        Ranks the catalog locations by how many users saved them.
+
+        Spellings that normalize to the same location share one catalog entry, so
+        they are counted together.
+
+        Returns:
+            List[dict[str, Any]]: The locations, most popular first, each with its 'location_id',
+                'location_name' and the number of 'users' who saved it.
+        """
+        users = db.func.count(db.distinct(cls.user_id))
+        rows = (db.session.query(Location.id, Location.display_name, users)
+                .join(cls, cls.location_id == Location.id)
+                .group_by(Location.id)
+                .order_by(users.desc(), Location.id)
+                .all())
+        return [{'location_id': location_id, 'location_name': location_name, 'users': count}
+                for location_id, location_name, count in rows]
+
+    @classmethod
+    def backfill_location_ids(cls) -> int:
+        """
+        Links every favorite location without a location_id to its catalog entry.
+
+        Returns:
+            int: The number of favorite locations that were linked.
+
+        Raises:
+            Exception: If the backfill fails; nothing is committed in that case.
+        """
+        favorites = cls.query.filter(cls.location_id.is_(None)).all()
+        try:
+            for favorite in favorites:
+                favorite.location_id = Location.get_or_create(favorite.location_name).id
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Error backfilling location ids: %s", str(e))
+            raise
+        logger.info("Linked %d favorite locations to the location catalog", len(favorites))
+        return len(favorites)
+
     @classmethod
     def delete_favorite(cls, user_id: int, location_name: str) -> None:
         """
@@ -104,14 +327,149 @@ class FavoriteLocations(db.Model):
             ValueError: If the location is not found.
         """
         logger.info("Deleting favorite location '%s' for user_id %d", location_name, user_id)
-        favorite = cls.query.filter_by(user_id=user_id, location_name=location_name).first()
-        if not favorite:
+        if not cls._delete_where(cls.user_id == user_id, cls.location_name == location_name):
             logger.error("Location '%s' not found for user_id %d", location_name, user_id)
             raise ValueError(f"Location '{location_name}' not found.")
-        db.session.delete(favorite)
-        db.session.commit()
         logger.info("Successfully deleted favorite location '%s' for user_id %d", location_name, user_id)
 
+    @classmethod
+    def delete_favorite_by_id(cls, user_id: int, favorite_id: int) -> None:
+        """
+        Deletes a favorite location of a user by its ID.
+
+        Args:
+            user_id (int): The user's ID.
+            favorite_id (int): The ID of the favorite location.
+
+        Raises:
+            ValueError: If the user has no favorite with this ID.
+        """
+        logger.info("Deleting favorite location with ID %d for user_id %d", favorite_id, user_id)
+        if not cls._delete_where(cls.id == favorite_id, cls.user_id == user_id):
+            logger.error("Favorite location with ID %d not found for user_id %d", favorite_id, user_id)
+            raise ValueError(f"Favorite location with ID {favorite_id} not found.")
+        logger.info("Successfully deleted favorite location with ID %d for user_id %d", favorite_id, user_id)
+
+    @classmethod
+    def _delete_where(cls, *criteria: Any) -> bool:
+        """
+        Deletes the favorites matching the criteria with one DELETE statement and commits.
+
+        The affected row count tells whether anything matched, so no row is loaded first.
+
+        Returns:
+            bool: True if a favorite was deleted.
+        """
+        result = db.session.execute(delete(cls).where(*criteria).execution_options(synchronize_session=False))
+        if result.rowcount == 0:
+            db.session.rollback()
+            return False
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def _validate_bulk(location_names: Any) -> None:
+        if not isinstance(location_names, list):
+            raise ValueError("location_names must be a list")
+        if len(location_names) > FAVORITES_BULK_MAX_ITEMS:
+            raise ValueError(f"Too many locations; at most {FAVORITES_BULK_MAX_ITEMS} are allowed per request")
+
+    @classmethod
+    def add_favorites_bulk(cls, user_id: int, location_names: List[Any]) -> List[dict[str, Any]]:
+        """
+        Adds many favorite locations for a user in one transaction.
+
+        The favorites are written with a single multi-row INSERT ... ON CONFLICT DO NOTHING,
+        so existing favorites are skipped instead of failing the batch, and the batch
+        costs one commit.
+
+        Args:
+            user_id (int): The user's ID.
+            location_names (List[Any]): The locations to add.
+
+        Returns:
+            List[dict[str, Any]]: The outcome of each item, in input order: 'added', 'duplicate'
+                (already a favorite, or repeated in the request) or 'invalid' (not a non-empty string).
+
+        Raises:
+            ValueError: If the input is not a list, has too many items, or the user does not exist.
+        """
+        cls._validate_bulk(location_names)
+        valid = [name for name in location_names if isinstance(name, str) and normalize_location_name(name)]
+        unique_names = list(dict.fromkeys(valid))
+        logger.info("Adding %d favorite locations for user_id %d", len(unique_names), user_id)
+
+        added = set()
+        if unique_names:
+            try:
+                location_ids = Location.ids_for_names(unique_names)
+                rows = [{'user_id': user_id, 'location_name': name,
+                         'location_id': location_ids[normalize_location_name(name)]} for name in unique_names]
+                statement = (insert(cls).values(rows)
+                             .on_conflict_do_nothing(index_elements=['user_id', 'location_name'])
+                             .returning(cls.location_name))
+                added = set(db.session.execute(statement).scalars())
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()  # ON CONFLICT covers duplicates, so this is the user foreign key
+                logger.error("Foreign key constraint failed for user_id %d", user_id)
+                raise ValueError(f"User {user_id} does not exist.")
+        logger.info("Added %d of %d favorite locations for user_id %d", len(added), len(location_names), user_id)
+
+        results = []
+        for name in location_names:
+            if not isinstance(name, str) or not normalize_location_name(name):
+                status = 'invalid'
+            elif name in added:
+                status = 'added'
+                added.discard(name)  # Later repeats of the name are duplicates
+            else:
+                status = 'duplicate'
+            results.append({'location_name': name, 'status': status})
+        return results
+
+    @classmethod
+    def delete_favorites_bulk(cls, user_id: int, location_names: List[Any]) -> List[dict[str, Any]]:
+        """
+        Deletes many favorite locations for a user with a single DELETE ... WHERE location_name IN (...).
+
+        Args:
+            user_id (int): The user's ID.
+            location_names (List[Any]): The locations to delete.
+
+        Returns:
+            List[dict[str, Any]]: The outcome of each item, in input order: 'deleted', 'not_found'
+                (not a favorite, or repeated in the request) or 'invalid' (not a non-empty string).
+
+        Raises:
+            ValueError: If the input is not a list or has too many items.
+        """
+        cls._validate_bulk(location_names)
+        unique_names = list(dict.fromkeys(name for name in location_names if isinstance(name, str) and name))
+        logger.info("Deleting %d favorite locations for user_id %d", len(unique_names), user_id)
+
+        deleted = set()
+        if unique_names:
+            statement = (delete(cls)
+                         .where(cls.user_id == user_id, cls.location_name.in_(unique_names))
+                         .returning(cls.location_name)
+                         .execution_options(synchronize_session=False))
+            deleted = set(db.session.execute(statement).scalars())
+            db.session.commit()
+        logger.info("Deleted %d of %d favorite locations for user_id %d", len(deleted), len(location_names), user_id)
+
+        results = []
+        for name in location_names:
+            if not isinstance(name, str) or not name:
+                status = 'invalid'
+            elif name in deleted:
+                status = 'deleted'
+                deleted.discard(name)
+            else:
+                status = 'not_found'
+            results.append({'location_name': name, 'status': status})
+        return results
+
     @classmethod
     def get_favorite_by_id(cls, favorite_id: int) -> dict[str, Any]:
         """
@@ -161,85 +519,335 @@ class FavoriteLocations(db.Model):
             raise ValueError(f"Error fetching weather for location '{location_name}': {str(e)}")
         
     @classmethod
-    def get_all_favorites_with_weather(cls, user_id: int, weather_client: Any):
+    def get_all_favorites_with_weather(cls, user_id: int, weather_client: Any, max_workers: Optional[int] = None,
+                                       deadline: Optional[float] = None):
         """
         Retrieves all favorite locations for a user along with their weather data.
 
+        Weather is fetched concurrently. A location whose fetch fails or misses the
+        deadline gets an 'error' key instead of a 'weather' key; the other locations
+        are still returned.
+
         Args:
             user_id (int): The user's ID.
             weather_client (WeatherClient): The weather client to use.
+            max_workers (Optional[int]): The maximum number of concurrent fetches.
+            deadline (Optional[float]): The total number of seconds to wait for all fetches.
 
         Returns:
-            List[dict[str, Any]]: List of favorite locations with weather data.
+            List[dict[str, Any]]: List of favorite locations with weather data, in the same order as get_favorites.
         """
         favorites = cls.get_favorites(user_id)
-        for fav in favorites:
-            fav['weather'] = cls.get_weather_for_favorite(fav['location_name'], weather_client)
+        outcomes = _fan_out(
+            lambda fav: cls.get_weather_for_favorite(fav['location_name'], weather_client),
+            favorites,
+            max_workers=WEATHER_MAX_WORKERS if max_workers is None else max_workers,
+            deadline=WEATHER_DEADLINE_SECONDS if deadline is None else deadline,
+        )
+        for fav, outcome in zip(favorites, outcomes):
+            if 'error' in outcome:
+                fav['error'] = outcome['error']
+            else:
+                fav['weather'] = outcome['result']
         return favorites
     
     @classmethod
+    async def get_weather_for_favorite_async(cls, location_name: str, weather_client: Any):
+        """
+        Retrieves the weather data for a favorite location with an AsyncWeatherClient.
 
-    def get_hourly_forecast(cls, location_name):
-          """
-        Retrieves hourly forecast for a specified location.
+        Args:
+            location_name (str): The name of the location.
+            weather_client (AsyncWeatherClient): The async weather client to use.
+
+        Returns:
+            CurrentConditions: The weather data for the location.
+
+        Raises:
+            ValueError: If fetching weather data fails.
+        """
+        logger.info("Fetching weather for location '%s'", location_name)
+        try:
+            weather_data = await weather_client.get_weather(location_name)
+            logger.info("Weather data for '%s': %s", location_name, weather_data)
+            return weather_data
+        except Exception as e:
+            logger.error("Error fetching weather for location '%s': %s", location_name, str(e))
+            raise ValueError(f"Error fetching weather for location '{location_name}': {str(e)}")
+
+    @classmethod
+    async def get_all_favorites_with_weather_async(cls, user_id: int, weather_client: Any,
+                                                   max_concurrency: Optional[int] = None,
+                                                   deadline: Optional[float] = None):
+        """
+        Retrieves all favorite locations for a user along with their weather data, on the event loop.
+
+        Behaves like get_all_favorites_with_weather, but the fetches are coroutines
+        sharing one event loop instead of threads.
 
         Args:
-            location_name (str): The name of the location
+            user_id (int): The user's ID.
+            weather_client (AsyncWeatherClient): The async weather client to use.
+            max_concurrency (Optional[int]): The maximum number of fetches in flight at once.
+            deadline (Optional[float]): The total number of seconds to wait for all fetches.
+
+        Returns:
+            List[dict[str, Any]]: List of favorite locations with weather data, in the same order as get_favorites.
+        """
+        favorites = cls.get_favorites(user_id)
+        outcomes = await _fan_out_async(
+            lambda fav: cls.get_weather_for_favorite_async(fav['location_name'], weather_client),
+            favorites,
+            max_concurrency=WEATHER_ASYNC_MAX_CONCURRENCY if max_concurrency is None else max_concurrency,
+            deadline=WEATHER_DEADLINE_SECONDS if deadline is None else deadline,
+        )
+        for fav, outcome in zip(favorites, outcomes):
+            if 'error' in outcome:
+                fav['error'] = outcome['error']
+            else:
+                fav['weather'] = outcome['result']
+        return favorites
+
+    @classmethod
+    def get_weather_for_locations(cls, locations: List[Any], weather_client: Any, max_workers: Optional[int] = None,
+                                  deadline: Optional[float] = None) -> List[dict[str, Any]]:
+        """
+        Retrieves the weather for many locations at once.
 
+        Each location is either a name or a {"lat": ..., "lon": ...} mapping. Duplicate
+        locations are fetched once, cached geocodes are loaded with a single query, and
+        the remaining fetches run concurrently.
+
+        Args:
+            locations (List[Any]): The location names or coordinates.
+            weather_client (WeatherClient): The weather client to use.
+            max_workers (Optional[int]): The maximum number of concurrent fetches.
+            deadline (Optional[float]): The total number of seconds to wait for all fetches.
 
         Returns:
-            Weather data
+            List[dict[str, Any]]: One result per input location, in input order, with a 'status'
+                of 'success' (and 'weather') or 'error' (and 'error').
+
+        Raises:
+            ValueError: If more than WEATHER_BATCH_MAX_LOCATIONS locations are requested.
         """
-          logger.info("Fetching weather for location '%s'", location_name)
-          try:
-            weather_data = WeatherClient.get_hourly_forecast(location_name)
+        if len(locations) > WEATHER_BATCH_MAX_LOCATIONS:
+            raise ValueError(f"At most {WEATHER_BATCH_MAX_LOCATIONS} locations can be requested at once.")
+
+        keys = [_batch_key(location) for location in locations]
+        unique = {}
+        for key, location in zip(keys, locations):
+            if key is not None:
+                unique.setdefault(key, location)
+        warm_geocode_cache([key[1] for key in unique if key[0] == 'name'])
+
+        def fetch(item):
+            key, location = item
+            if key[0] == 'name':
+                return cls.get_weather_for_favorite(location, weather_client)
+            return weather_client.get_weather_at(key[1], key[2])
+
+        outcomes = dict(zip(unique, _fan_out(
+            fetch,
+            list(unique.items()),
+            max_workers=WEATHER_MAX_WORKERS if max_workers is None else max_workers,
+            deadline=WEATHER_DEADLINE_SECONDS if deadline is None else deadline,
+        )))
+
+        results = []
+        for key, location in zip(keys, locations):
+            outcome = outcomes.get(key, {'error': "Invalid location: expected a name or an object with 'lat' and 'lon'"})
+            if 'error' in outcome:
+                results.append({'location': location, 'status': 'error', 'error': outcome['error']})
+            else:
+                results.append({'location': location, 'status': 'success', 'weather': outcome['result']})
+        return results
+
+    @classmethod
+    def _get_weather_view(cls, location_name: str, fetch: Any):
+        logger.info("Fetching weather for location '%s'", location_name)
+        try:
+            weather_data = fetch()
             logger.info("Weather data for '%s': %s", location_name, weather_data)
             return weather_data
-          except Exception as e:
+        except Exception as e:
             logger.error("Error fetching weather for location '%s': %s", location_name, str(e))
             raise ValueError(f"Error fetching weather for location '{location_name}': {str(e)}")
-    
+
     @classmethod
+    def get_hourly_forecast(cls, location_name: str, weather_client: Any):
+        """
+        Retrieves hourly forecast for a specified location.
+
+        Args:
+            location_name (str): The name of the location
+            weather_client (WeatherClient): The weather client to use.
+
+        Returns:
+            Weather data
+
+        Raises:
+            ValueError: If fetching weather data fails.
+        """
+        return cls._get_weather_view(location_name, lambda: weather_client.get_hourly_forecast(location_name))
 
-    def get_daily_forecast(cls, location_name):
-          """
+    @classmethod
+    def get_daily_forecast(cls, location_name: str, weather_client: Any):
+        """
         Retrieves daily forecast for a specified location.
 
         Args:
             location_name (str): The name of the location
+            weather_client (WeatherClient): The weather client to use.
 
         Returns:
            Weather data
+
+        Raises:
+            ValueError: If fetching weather data fails.
         """
-          logger.info("Fetching weather for location '%s'", location_name)
-          try:
-            weather_data = WeatherClient.get_hourly_forecast(location_name)
-            logger.info("Weather data for '%s': %s", location_name, weather_data)
-            return weather_data
-          except Exception as e:
-            logger.error("Error fetching weather for location '%s': %s", location_name, str(e))
-            raise ValueError(f"Error fetching weather for location '{location_name}': {str(e)}")
-    
+        return cls._get_weather_view(location_name, lambda: weather_client.get_daily_forecast(location_name))
+
     @classmethod
+    def get_weather_dashboard(cls, location_name: str, weather_client: Any):
+        """
+        Retrieves the overview, daily, hourly and alerts views for a location with one upstream call.
 
-    def get_dated_forecast(cls, location_name, date_tm):
-          """
+        Args:
+            location_name (str): The name of the location
+            weather_client (WeatherClient): The weather client to use.
+
+        Returns:
+           dict[str, Any]: The weather views keyed by name.
+
+        Raises:
+            ValueError: If fetching weather data fails.
+        """
+        return cls._get_weather_view(location_name, lambda: weather_client.get_dashboard(location_name))
+
+    @classmethod
+    def get_dated_forecast(cls, location_name: str, date_tm: str, weather_client: Any):
+        """
         Retrieves daily forecast for a specified location and date up to 45 years in the past and 1.5 years in the future.
 
+        Summaries of settled past dates are served from, and saved to, the permanent
+        weather history, so each one costs at most one weather API call. The location
+        joins the catalog only once a summary for it is fetched, so names that cannot
+        be geocoded leave no catalog entry behind.
+
         Args:
             location_name (str): The name of the location
             date_tm (str): The date in YYYY-MM-DD format
+            weather_client (WeatherClient): The weather client to use.
 
         Returns:
-           Weather data
+           DaySummary: The weather summary for the date.
+
+        Raises:
+            ValueError: If the date is invalid or fetching weather data fails.
         """
-          logger.info("Fetching weather for location '%s'", location_name)
-          try:
-            weather_data = WeatherClient.get_date_forecast(location_name, date_tm)
-            logger.info("Weather data for '%s': %s", location_name, weather_data)
-            return weather_data
-          except Exception as e:
-            logger.error("Error fetching weather for location '%s': %s", location_name, str(e))
-            raise ValueError(f"Error fetching weather for location '{location_name}': {str(e)}")
+        day = parse_date(date_tm)
+        fetch = lambda: weather_client.get_date_forecast(location_name, day.isoformat())
+        if not WeatherHistory.is_settled(day):
+            return cls._get_weather_view(location_name, fetch)
+
+        location = Location.find(location_name)
+        summary = WeatherHistory.lookup(location.id, day) if location else None
+        if summary:
+            logger.info("Weather history hit for '%s' on %s", location_name, day)
+            return summary
+        summary = cls._get_weather_view(location_name, fetch)
+        WeatherHistory.store((location or Location.get_or_create(location_name)).id, day, summary)
+        return summary
+
+    @classmethod
+    def get_history(cls, location_name: str, start: str, end: str, weather_client: Any,
+                    max_workers: Optional[int] = None, max_fetches: Optional[int] = None) -> Iterator[dict[str, Any]]:
+        """
+        Retrieves the weather summary of every date in a range, backfilling the missing dates concurrently.
+
+        Dates already in the weather history are read with one query. The missing
+        dates are fetched on a bounded thread pool, at most max_fetches of them per
+        call; the rest are reported as deferred, so a caller can pull a long range
+        over several calls without exceeding the weather API quota. Fetched summaries
+        of settled dates are stored as they arrive; the location joins the catalog with
+        the first of them, so names that cannot be geocoded leave no catalog entry behind.
 
+        The input is validated before this method returns; the dates are then produced
+        lazily, so a caller can stream each one while later dates are still being fetched.
 
+        Args:
+            location_name (str): The name of the location.
+            start (str): The first date in YYYY-MM-DD format, inclusive.
+            end (str): The last date in YYYY-MM-DD format, inclusive.
+            weather_client (WeatherClient): The weather client to use.
+            max_workers (Optional[int]): The maximum number of concurrent fetches.
+            max_fetches (Optional[int]): The maximum number of dates fetched from the weather API.
+
+        Returns:
+            Iterator[dict[str, Any]]: One result per date, in date order, with a 'status' of
+                'success' (and 'weather'), 'error' (and 'error') or 'deferred'.
+
+        Raises:
+            ValueError: If a date is invalid, the range is reversed, or it spans more than
+                WEATHER_HISTORY_MAX_DAYS days.
+        """
+        start_day, end_day = parse_date(start), parse_date(end)
+        if end_day < start_day:
+            raise ValueError("'end' must not be before 'start'.")
+        days = [start_day + timedelta(days=offset) for offset in range((end_day - start_day).days + 1)]
+        if len(days) > WEATHER_HISTORY_MAX_DAYS:
+            raise ValueError(f"At most {WEATHER_HISTORY_MAX_DAYS} days can be requested at once.")
+
+        if max_fetches is None:
+            max_fetches = WEATHER_HISTORY_MAX_FETCHES
+        if max_workers is None:
+            max_workers = WEATHER_HISTORY_MAX_WORKERS
+
+        location = Location.find(location_name)
+        stored = WeatherHistory.lookup_range(location.id, start_day, end_day) if location else {}
+        missing = [day for day in days if day not in stored][:max_fetches]
+        logger.info("History for '%s' from %s to %s: %d stored, fetching %d", location_name, start_day, end_day,
+                    len(stored), len(missing))
+        return cls._stream_history(location_name, location.id if location else None, days, stored, missing,
+                                   weather_client, max_workers)
+
+    @classmethod
+    def _stream_history(cls, location_name: str, location_id: Optional[int], days: List[date], stored: dict,
+                        missing: List[date], weather_client: Any, max_workers: int) -> Iterator[dict[str, Any]]:
+        app = current_app._get_current_object() if has_app_context() else None
+
+        def fetch(day):
+            if app is None:
+                return weather_client.get_date_forecast(location_name, day.isoformat())
+            with app.app_context():
+                return weather_client.get_date_forecast(location_name, day.isoformat())
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing) or 1)))
+        try:
+            futures = {day: executor.submit(fetch, day) for day in missing}
+            for day in days:
+                if day in stored:
+                    yield {'date': day.isoformat(), 'status': 'success', 'weather': stored[day]}
+                elif day not in futures:
+                    yield {'date': day.isoformat(), 'status': 'deferred'}
+                else:
+                    try:
+                        summary = futures[day].result()
+                    except Exception as e:
+                        logger.error("Error fetching history for '%s' on %s: %s", location_name, day, str(e))
+                        yield {'date': day.isoformat(), 'status': 'error', 'error': str(e)}
+                        continue
+                    if WeatherHistory.is_settled(day):
+                        try:
+                            if location_id is None:
+                                location_id = Location.get_or_create(location_name).id
+                            WeatherHistory.store(location_id, day, summary)
+                        except SQLAlchemyError as e:
+                            # The summary was fetched all the same; it is only refetched on a later request
+                            db.session.rollback()
+                            logger.error("Error storing history for '%s' on %s: %s", location_name, day, str(e))
+                    yield {'date': day.isoformat(), 'status': 'success', 'weather': summary}
+        finally:
+            # Runs when the stream ends or the client disconnects; queued fetches are dropped
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from weather_app.utils.logger import configure_logger
+from weather_app.db import db
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class GeocodeCache(db.Model):
+    """
+    This class represents a geocoded location, keyed by its normalized name.
+    """
+    __tablename__ = 'geocode_cache'
+
+    id = db.Column(db.Integer, primary_key=True)
+    normalized_name = db.Column(db.String(255), unique=True, nullable=False)
+    latitude = db.Column(db.Float, nullable=False)
+    longitude = db.Column(db.Float, nullable=False)
+    provider = db.Column(db.String(50), nullable=False)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=_utcnow)
+
+    @classmethod
+    def lookup(cls, normalized_name: str) -> Optional[Tuple[float, float]]:
+        """
+        Retrieves the cached coordinates for a normalized location string.
+
+        Args:
+            normalized_name (str): The normalized location string.
+
+        Returns:
+            Optional[Tuple[float, float]]: The (latitude, longitude) pair, or None if not cached.
+        """
+        entry = cls.query.filter_by(normalized_name=normalized_name).first()
+        if not entry:
+            logger.debug("Geocode cache miss for '%s'", normalized_name)
+            return None
+        logger.debug("Geocode cache hit for '%s'", normalized_name)
+        return entry.latitude, entry.longitude
+
+    @classmethod
+    def lookup_many(cls, normalized_names: List[str]) -> Dict[str, Tuple[float, float]]:
+        """
+        Retrieves the cached coordinates for many normalized location strings with one query.
+
+        Args:
+            normalized_names (List[str]): The normalized location strings.
+
+        Returns:
+            Dict[str, Tuple[float, float]]: The (latitude, longitude) pair of every cached location.
+        """
+        rows = db.session.query(cls.normalized_name, cls.latitude, cls.longitude).filter(
+            cls.normalized_name.in_(normalized_names)).all()
+        return {name: (latitude, longitude) for name, latitude, longitude in rows}
+
+    @classmethod
+    def store(cls, normalized_name: str, latitude: float, longitude: float, provider: str) -> None:
+        """
+        Stores the coordinates for a normalized location string.
+
+        A concurrent writer storing the same location first is not an error; coordinates
+        for a location do not change, so the existing row is kept. The location's catalog
+        entry, if it has no coordinates yet, receives them in the same transaction.
+
+        Args:
+            normalized_name (str): The normalized location string.
+            latitude (float): The latitude of the location.
+            longitude (float): The longitude of the location.
+            provider (str): The name of the geocoding provider that resolved the location.
+        """
+        # Imported here: the location catalog depends on this model
+        from weather_app.models.location_model import Location
+
+        entry = cls(normalized_name=normalized_name, latitude=latitude, longitude=longitude, provider=provider)
+        try:
+            db.session.add(entry)
+            db.session.flush()
+            Location.record_geocode(normalized_name, latitude, longitude, provider)
+            db.session.commit()
+            logger.info("Cached coordinates for '%s' from %s", normalized_name, provider)
+        except IntegrityError:
+            db.session.rollback()
+            logger.info("Coordinates for '%s' were already cached", normalized_name)
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Error caching coordinates for '%s': %s", normalized_name, str(e))
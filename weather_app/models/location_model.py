@@ -0,0 +1,185 @@
+from datetime import datetime, timezone
+import logging
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import IntegrityError
+from weather_app.models.geocode_cache_model import GeocodeCache
+from weather_app.utils.logger import configure_logger
+from weather_app.utils.weather_client import normalize_location_name
+from weather_app.db import db
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class Location(db.Model):
+    """
+    This class represents a canonical location shared by every user who saved it.
+    """
+    __tablename__ = 'locations'
+
+    id = db.Column(db.Integer, primary_key=True)
+    normalized_name = db.Column(db.String(255), unique=True, nullable=False)
+    display_name = db.Column(db.String(100), nullable=False)  # spelling of the first user who saved it
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+    provider = db.Column(db.String(50), nullable=True)
+    geocoded_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    @classmethod
+    def get_or_create(cls, location_name: str) -> 'Location':
+        """
+        Retrieves the catalog entry for a location, creating it if needed.
+
+        The entry is flushed but not committed, so it joins the caller's transaction.
+        Coordinates are copied from the geocode cache when it already knows the location.
+
+        Args:
+            location_name (str): The location name as entered by the user.
+
+        Returns:
+            Location: The catalog entry.
+
+        Raises:
+            ValueError: If the location name is empty.
+        """
+        normalized_name = normalize_location_name(location_name)
+        if not normalized_name:
+            raise ValueError("Location name cannot be empty.")
+
+        location = cls.query.filter_by(normalized_name=normalized_name).first()
+        if location:
+            return location
+
+        location = cls(normalized_name=normalized_name, display_name=location_name.strip())
+        cached = GeocodeCache.query.filter_by(normalized_name=normalized_name).first()
+        if cached:
+            location.set_coordinates(cached.latitude, cached.longitude, cached.provider)
+        try:
+            with db.session.begin_nested():
+                db.session.add(location)
+            logger.info("Added location '%s' to the catalog", normalized_name)
+            return location
+        except IntegrityError:
+            # Another writer created the same location first
+            return cls.query.filter_by(normalized_name=normalized_name).one()
+
+    @classmethod
+    def find(cls, location_name: str) -> Optional['Location']:
+        """
+        Retrieves the catalog entry for a location without creating it.
+
+        Args:
+            location_name (str): The location name as entered by the user.
+
+        Returns:
+            Optional[Location]: The catalog entry, or None if the location is not in the catalog.
+        """
+        normalized_name = normalize_location_name(location_name)
+        if not normalized_name:
+            return None
+        return cls.query.filter_by(normalized_name=normalized_name).first()
+
+    @classmethod
+    def ids_for_names(cls, location_names: Iterable[str]) -> Dict[str, int]:
+        """
+        Retrieves the catalog IDs of many locations, creating the missing entries.
+
+        This takes three statements however many names there are: one geocode cache
+        lookup, one multi-row INSERT ... ON CONFLICT DO NOTHING and one SELECT. Like
+        get_or_create, nothing is committed, so the entries join the caller's transaction.
+
+        Args:
+            location_names (Iterable[str]): The location names as entered by users. Empty names are skipped.
+
+        Returns:
+            Dict[str, int]: The catalog ID of each location, keyed by normalized name.
+        """
+        display_names: Dict[str, str] = {}
+        for location_name in location_names:
+            normalized_name = normalize_location_name(location_name)
+            if normalized_name:
+                display_names.setdefault(normalized_name, location_name.strip())
+        if not display_names:
+            return {}
+
+        cached = {entry.normalized_name: entry for entry in
+                  GeocodeCache.query.filter(GeocodeCache.normalized_name.in_(display_names))}
+        now = datetime.now(timezone.utc)
+        rows = []
+        for normalized_name, display_name in display_names.items():
+            entry = cached.get(normalized_name)
+            rows.append({
+                'normalized_name': normalized_name,
+                'display_name': display_name,
+                'latitude': entry.latitude if entry else None,
+                'longitude': entry.longitude if entry else None,
+                'provider': entry.provider if entry else None,
+                'geocoded_at': now if entry else None,
+            })
+        # Entries saved earlier, or by a concurrent writer, keep their first spelling
+        db.session.execute(insert(cls).values(rows).on_conflict_do_nothing(index_elements=['normalized_name']))
+        return dict(db.session.query(cls.normalized_name, cls.id)
+                    .filter(cls.normalized_name.in_(display_names))
+                    .all())
+
+    def set_coordinates(self, latitude: float, longitude: float, provider: str) -> None:
+        """
+        Records the geocoded coordinates of the location.
+
+        Args:
+            latitude (float): The latitude of the location.
+            longitude (float): The longitude of the location.
+            provider (str): The name of the geocoding provider that resolved the location.
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+        self.provider = provider
+        self.geocoded_at = datetime.now(timezone.utc)
+
+    @classmethod
+    def record_geocode(cls, normalized_name: str, latitude: float, longitude: float, provider: str) -> int:
+        """
+        Records freshly geocoded coordinates on the catalog entry of a location that has none.
+
+        Locations are usually added to the catalog before anyone geocodes them, so this keeps
+        their coordinates in step with the geocode cache. Nothing is committed, so the update
+        joins the caller's transaction.
+
+        Args:
+            normalized_name (str): The normalized location string.
+            latitude (float): The latitude of the location.
+            longitude (float): The longitude of the location.
+            provider (str): The name of the geocoding provider that resolved the location.
+
+        Returns:
+            int: The number of catalog entries that received coordinates (0 or 1).
+        """
+        result = db.session.execute(
+            update(cls)
+            .where(cls.normalized_name == normalized_name, cls.latitude.is_(None))
+            .values(latitude=latitude, longitude=longitude, provider=provider,
+                    geocoded_at=datetime.now(timezone.utc))
+        )
+        return result.rowcount
+
+    @classmethod
+    def fill_coordinates_from_geocode_cache(cls) -> int:
+        """
+        Copies coordinates from the geocode cache into catalog entries that have none.
+
+        Returns:
+            int: The number of catalog entries that received coordinates.
+        """
+        locations = (cls.query.join(GeocodeCache, GeocodeCache.normalized_name == cls.normalized_name)
+                     .filter(cls.latitude.is_(None))
+                     .add_entity(GeocodeCache)
+                     .all())
+        for location, cached in locations:
+            location.set_coordinates(cached.latitude, cached.longitude, cached.provider)
+        db.session.commit()
+        logger.info("Copied coordinates into %d catalog locations", len(locations))
+        return len(locations)
@@ -1,8 +1,10 @@
 import hashlib
+import hmac
 from flask_sqlalchemy import SQLAlchemy
 from flask import Flask
 import logging
 import os
+from typing import Optional
 
 from sqlalchemy.exc import IntegrityError
 from weather_app.utils.logger import configure_logger
@@ -81,8 +83,55 @@ class User(db.Model):
         if not user:
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
-        hashed_password = hashlib.sha256((password + user.salt).encode()).hexdigest()
-        return hashed_password == user.password
+        return user._verify(password)
+
+    def _verify(self, password: str) -> bool:
+        hashed_password = hashlib.sha256((password + self.salt).encode()).hexdigest()
+        return hmac.compare_digest(hashed_password, self.password)
+
+    @classmethod
+    def authenticate(cls, username: str, password: str) -> Optional[int]:
+        """
+        Verify a user's password and return their ID, with a single query.
+
+        Args:
+            username (str): The username of the user.
+            password (str): The password to check.
+
+        Returns:
+            Optional[int]: The ID of the user, or None if the user does not exist or the password is wrong.
+        """
+        user = cls.query.filter_by(username=username).first()
+        if not user or not user._verify(password):
+            logger.info("Authentication failed for user %s", username)
+            return None
+        return user.id
+
+    @classmethod
+    def change_password(cls, username: str, old_password: str, new_password: str) -> bool:
+        """
+        Verify a user's current password and replace it, reusing the row loaded for the check.
+
+        Args:
+            username (str): The username of the user.
+            old_password (str): The current password.
+            new_password (str): The new password to set.
+
+        Returns:
+            bool: True if the password was changed, False if the user does not exist or the current
+                password is wrong.
+        """
+        user = cls.query.filter_by(username=username).first()
+        if not user or not user._verify(old_password):
+            logger.info("Password change refused for user %s", username)
+            return False
+        user._set_password(new_password)
+        logger.info("Password updated successfully for user: %s", username)
+        return True
+
+    def _set_password(self, new_password: str) -> None:
+        self.salt, self.password = self._generate_hashed_password(new_password)
+        db.session.commit()
 
     @classmethod
     def get_id_by_username(cls, username: str) -> int:
@@ -121,8 +170,5 @@ class User(db.Model):
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
 
-        salt, hashed_password = cls._generate_hashed_password(new_password)
-        user.salt = salt
-        user.password = hashed_password
-        db.session.commit()
+        user._set_password(new_password)
         logger.info("Password updated successfully for user: %s", username)
\ No newline at end of file
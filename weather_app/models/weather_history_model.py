@@ -0,0 +1,144 @@
+from datetime import date, datetime, timedelta, timezone
+import logging
+import os
+from typing import Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+from weather_app.utils.logger import configure_logger
+from weather_app.utils.weather_results import DaySummary
+from weather_app.db import db
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+# Days after which a date's weather is final; summaries of older dates are kept forever
+HISTORY_SETTLED_DAYS = int(os.getenv("WEATHER_HISTORY_SETTLED_DAYS", "2"))
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def parse_date(date_str: str) -> date:
+    """
+    Parses a YYYY-MM-DD date, accepting unpadded months and days (e.g., 2024-9-10).
+
+    Args:
+        date_str (str): The date string.
+
+    Returns:
+        date: The parsed date.
+
+    Raises:
+        ValueError: If the string is not a valid date.
+    """
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid date '{date_str}'; expected YYYY-MM-DD")
+
+
+class WeatherHistory(db.Model):
+    """
+    This class represents the weather summary of a catalog location on a past date.
+
+    Weather for a date is final once the date is HISTORY_SETTLED_DAYS old, so these
+    rows never expire; more recent dates go through the regular response cache.
+    """
+    __tablename__ = 'weather_history'
+
+    id = db.Column(db.Integer, primary_key=True)
+    location_id = db.Column(db.Integer, db.ForeignKey('locations.id'), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    high = db.Column(db.Float, nullable=False)
+    low = db.Column(db.Float, nullable=False)
+    precipitation = db.Column(db.Float, nullable=False)
+    humidity = db.Column(db.Float, nullable=False)
+    fetched_at = db.Column(db.DateTime(timezone=True), nullable=False, default=_utcnow)
+
+    # The unique index also serves range scans of one location's dates
+    __table_args__ = (db.UniqueConstraint('location_id', 'date', name='weather_history_location_date_uc'),)
+
+    @staticmethod
+    def is_settled(day: date) -> bool:
+        """
+        Returns whether the weather of a date is final and can be stored permanently.
+
+        Args:
+            day (date): The date.
+
+        Returns:
+            bool: True if the date is at least HISTORY_SETTLED_DAYS days old.
+        """
+        return day <= _utcnow().date() - timedelta(days=HISTORY_SETTLED_DAYS)
+
+    def to_summary(self) -> DaySummary:
+        return DaySummary(date=self.date.isoformat(), high=self.high, low=self.low,
+                          precipitation=self.precipitation, humidity=self.humidity)
+
+    @classmethod
+    def lookup(cls, location_id: int, day: date) -> Optional[DaySummary]:
+        """
+        Retrieves the stored summary of a location on a date.
+
+        Args:
+            location_id (int): The catalog location ID.
+            day (date): The date.
+
+        Returns:
+            Optional[DaySummary]: The stored summary, or None if it is not stored.
+        """
+        entry = cls.query.filter_by(location_id=location_id, date=day).first()
+        if not entry:
+            logger.debug("Weather history miss for location %d on %s", location_id, day)
+            return None
+        return entry.to_summary()
+
+    @classmethod
+    def lookup_range(cls, location_id: int, start: date, end: date) -> Dict[date, DaySummary]:
+        """
+        Retrieves every stored summary of a location between two dates with one query.
+
+        Args:
+            location_id (int): The catalog location ID.
+            start (date): The first date, inclusive.
+            end (date): The last date, inclusive.
+
+        Returns:
+            Dict[date, DaySummary]: The stored summaries keyed by date, in date order. Dates that
+                are not stored are absent.
+        """
+        entries = (cls.query.filter(cls.location_id == location_id, cls.date.between(start, end))
+                   .order_by(cls.date)
+                   .all())
+        return {entry.date: entry.to_summary() for entry in entries}
+
+    @classmethod
+    def store(cls, location_id: int, day: date, summary: DaySummary) -> bool:
+        """
+        Stores the summary of a location on a date, if the date is settled.
+
+        A concurrent writer storing the same date first is not an error; past weather
+        does not change, so the existing row is kept.
+
+        Args:
+            location_id (int): The catalog location ID.
+            day (date): The date the summary was requested for.
+            summary (DaySummary): The summary from the weather API.
+
+        Returns:
+            bool: True if the summary is now stored, False if the date is too recent to store.
+        """
+        if not cls.is_settled(day):
+            return False
+        entry = cls(location_id=location_id, date=day, high=summary.high, low=summary.low,
+                    precipitation=summary.precipitation, humidity=summary.humidity)
+        try:
+            db.session.add(entry)
+            db.session.commit()
+            logger.info("Stored weather history for location %d on %s", location_id, day)
+        except IntegrityError:
+            db.session.rollback()
+            logger.info("Weather history for location %d on %s was already stored", location_id, day)
+        return True
@@ -0,0 +1,327 @@
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import current_app, has_app_context
+import httpx
+
+from weather_app.utils.circuit_breaker import (
+    CircuitOpenError,
+    backoff_delays,
+    get_circuit_breaker,
+)
+from weather_app.utils.logger import configure_logger
+from weather_app.utils.rate_limiter import RateLimiter, get_default_rate_limiter
+from weather_app.utils.weather_cache import MemoryCacheBackend, WeatherCache, get_default_cache
+from weather_app.utils.weather_client import (
+    DAY_SUMMARY_URL,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_READ_TIMEOUT,
+    ONECALL_PARAMS,
+    ONECALL_URL,
+    RETRYABLE_STATUS_CODES,
+    WeatherClient,
+    geocode_lru,
+    get_lat_long,
+    normalize_location_name,
+)
+from weather_app.utils.weather_results import (
+    CurrentConditions,
+    DailyForecast,
+    DaySummary,
+    HourlyForecast,
+    OneCallSnapshot,
+    parse_day_summary,
+    parse_onecall,
+)
+
+
+def _is_upstream_failure(error: Exception) -> bool:
+    """
+    Returns whether an httpx error means the weather API is unhealthy, which counts against its circuit.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Returns whether an httpx error is worth retrying; read timeouts already waited the full read timeout once.
+    """
+    return _is_upstream_failure(error) and not isinstance(error, httpx.ReadTimeout)
+
+
+class AsyncWeatherClient:
+    """
+    An asyncio client for fetching weather data, with the same surface as WeatherClient.
+
+    The client shares the response cache, geocode cache and result types of
+    WeatherClient. It owns a pooled httpx.AsyncClient, which is bound to the event
+    loop it is used on: use it as an async context manager, for example once per
+    request under Flask's async views or once at startup under an ASGI server.
+    Stale entries are refreshed in the background by a synchronous WeatherClient
+    that outlives the request, normally the app's shared one, so no refresh uses a
+    connection pool that closes when the request ends.
+    """
+
+    def __init__(self, cache: Optional[WeatherCache] = None, pool_size: int = DEFAULT_POOL_SIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT, read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 transport: Optional[httpx.AsyncBaseTransport] = None, rate_limiter: Optional[RateLimiter] = None,
+                 refresh_client: Optional[WeatherClient] = None):
+        """
+        Initializes the AsyncWeatherClient.
+
+        Args:
+            cache (Optional[WeatherCache]): The response cache. Defaults to the process-wide cache.
+            pool_size (int): The maximum number of concurrent and kept-alive connections.
+            connect_timeout (float): Seconds to wait for a connection to the weather API.
+            read_timeout (float): Seconds to wait for the weather API to respond.
+            transport (Optional[httpx.AsyncBaseTransport]): A custom transport, e.g. httpx.MockTransport.
+            rate_limiter (Optional[RateLimiter]): Throttles calls to the weather API through its "owm"
+                bucket. Defaults to the process-wide rate limiter.
+            refresh_client (Optional[WeatherClient]): Refreshes stale entries in the background; it must
+                share this client's cache. Defaults to a WeatherClient on the same cache and rate limiter.
+        """
+        self.api_key = os.getenv("API_KEY")
+        self.cache = cache if cache is not None else get_default_cache()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_default_rate_limiter()
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self.transport = transport
+        self.client: Optional[httpx.AsyncClient] = None
+        self.refresh_client = refresh_client if refresh_client is not None else WeatherClient(
+            cache=self.cache, pool_size=pool_size, connect_timeout=connect_timeout, read_timeout=read_timeout,
+            rate_limiter=self.rate_limiter)
+        self.logger = logging.getLogger(__name__)
+        configure_logger(self.logger)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], cache: Optional[WeatherCache] = None,
+                    refresh_client: Optional[WeatherClient] = None) -> "AsyncWeatherClient":
+        """
+        Builds an AsyncWeatherClient from a Flask config mapping.
+
+        Args:
+            config (Dict[str, Any]): The app config. WEATHER_POOL_SIZE, WEATHER_CONNECT_TIMEOUT
+                and WEATHER_READ_TIMEOUT are read when present.
+            cache (Optional[WeatherCache]): The response cache to share.
+            refresh_client (Optional[WeatherClient]): The long-lived client that refreshes stale entries.
+
+        Returns:
+            AsyncWeatherClient: The configured client.
+        """
+        return cls(
+            cache=cache,
+            refresh_client=refresh_client,
+            pool_size=config.get("WEATHER_POOL_SIZE", DEFAULT_POOL_SIZE),
+            connect_timeout=config.get("WEATHER_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+            read_timeout=config.get("WEATHER_READ_TIMEOUT", DEFAULT_READ_TIMEOUT),
+        )
+
+    async def __aenter__(self) -> "AsyncWeatherClient":
+        self.client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, transport=self.transport)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Closes the pooled connections.
+        """
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def _cache_call(self, func: Callable[..., Any], *args: Any) -> Any:
+        # The in-memory backend answers without blocking; others (e.g. a shared sqlite file) may wait on disk or locks
+        if isinstance(self.cache.backend, MemoryCacheBackend):
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    async def _resolve_coordinates(self, location_name: str) -> Tuple[float, float]:
+        """
+        Resolves a location name to coordinates through the geocode cache.
+
+        LRU hits are answered on the event loop; anything else runs get_lat_long on a
+        worker thread, inside a fresh app context so the thread gets its own database
+        session rather than sharing the caller's.
+
+        Raises:
+            ValueError: If the location cannot be geocoded.
+        """
+        latlong = geocode_lru.get(normalize_location_name(location_name))
+        if not latlong:
+            app = current_app._get_current_object() if has_app_context() else None
+
+            def geocode():
+                if app is None:
+                    return get_lat_long(location_name)
+                with app.app_context():
+                    return get_lat_long(location_name)
+
+            latlong = await asyncio.to_thread(geocode)
+        if not latlong:
+            self.logger.error("Location '%s' could not be geocoded", location_name)
+            raise ValueError(f"Location '{location_name}' not found")
+        return latlong
+
+    async def _fetch(self, endpoint: str, url: str, latitude: float, longitude: float, params: Dict[str, Any],
+                     parse: Callable[[Dict[str, Any]], Any]) -> Any:
+        """
+        Fetches a weather API document for a coordinate through the response cache.
+
+        Stale entries are served immediately and refreshed on the cache's background
+        thread by the refresh client. Upstream calls go through the endpoint's
+        circuit breaker, shared with WeatherClient; while it is open, any cached value
+        is served however old it is.
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open and nothing is cached.
+            KeyError: If the document is missing a required field.
+            RateLimitExceeded: If the weather API quota leaves no request slot in time.
+            httpx.HTTPError: If the API request fails.
+        """
+        key, (cell_latitude, cell_longitude) = self.cache.key_for(endpoint, latitude, longitude, params)
+        request_params = {"lat": cell_latitude, "lon": cell_longitude, **params, "appid": self.api_key}
+
+        state, value = await self._cache_call(self.cache.lookup, endpoint, key)
+        if state == "stale":
+            self.refresh_client.refresh_in_background(endpoint, url, latitude, longitude, params, parse)
+        if state is not None:
+            return value
+
+        if self.client is None:
+            raise RuntimeError("AsyncWeatherClient must be used as an async context manager")
+        breaker = get_circuit_breaker(endpoint)
+        try:
+            breaker.before_call()
+        except CircuitOpenError:
+            value = await self._cache_call(self.cache.last_known, key)
+            if value is None:
+                raise
+            self.logger.warning("Serving expired cache entry '%s' while '%s' is unavailable", key, endpoint)
+            return value
+
+        try:
+            document = await self._get_with_retries(url, request_params)
+        except BaseException as e:
+            # Cancellation (a fan-out deadline or a client disconnect) must still free a half-open probe slot
+            if isinstance(e, Exception) and _is_upstream_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.release()
+            raise
+        breaker.record_success()
+        value = parse(document)
+        await self._cache_call(self.cache.store, key, value)
+        return value
+
+    async def _get_with_retries(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        delays = backoff_delays()
+        while True:
+            try:
+                await self.rate_limiter.acquire_async("owm")
+                response = await self.client.get(url, params=params)
+                response.raise_for_status()  # Raise an HTTPStatusError for bad responses
+                return response.json()
+            except Exception as e:
+                delay = next(delays, None)
+                if delay is None or not _is_retryable(e):
+                    raise
+                self.logger.info("Retrying in %.2fs after transient error: %s", delay, str(e))
+                await asyncio.sleep(delay)
+
+    async def get_onecall(self, location_name: str) -> OneCallSnapshot:
+        """
+        Fetches the OneCall snapshot for a location.
+
+        Args:
+            location_name (str): The name of the location (e.g., city name).
+
+        Returns:
+            OneCallSnapshot: The parsed OneCall document.
+
+        Raises:
+            ValueError: If the location is not found.
+            httpx.HTTPError: If the API request fails.
+        """
+        latitude, longitude = await self._resolve_coordinates(location_name)
+        return await self._fetch("onecall", ONECALL_URL, latitude, longitude, ONECALL_PARAMS, parse_onecall)
+
+    async def _get_view(self, location_name: str, render: Callable[[OneCallSnapshot], Any]) -> Any:
+        self.logger.info("Fetching weather data for location: %s", location_name)
+
+        try:
+            snapshot = await self.get_onecall(location_name)
+            self.logger.info("Weather data for %s fetched", location_name)
+            return render(snapshot)
+
+        except httpx.HTTPError as e:
+            self.logger.error("Failed to fetch weather data for %s: %s", location_name, str(e))
+            raise ValueError(f"Error fetching weather data for location '{location_name}': {str(e)}")
+
+        except (KeyError, IndexError) as e:
+            self.logger.error("Unexpected response structure: %s", str(e))
+            raise ValueError("Unexpected response structure from weather API")
+
+    async def get_weather(self, location_name: str) -> CurrentConditions:
+        """
+        Fetches the weather overview for a given location.
+
+        Raises:
+            ValueError: If the API request fails or the location is not found.
+        """
+        return await self._get_view(location_name, lambda snapshot: snapshot.current)
+
+    async def get_daily_forecast(self, location_name: str) -> DailyForecast:
+        """
+        Fetches today's forecast for a given location.
+
+        Raises:
+            ValueError: If the API request fails or the location is not found.
+        """
+        return await self._get_view(location_name, lambda snapshot: snapshot.daily[0])
+
+    async def get_hourly_forecast(self, location_name: str) -> HourlyForecast:
+        """
+        Fetches the forecast for the current hour at a given location.
+
+        Raises:
+            ValueError: If the API request fails or the location is not found.
+        """
+        return await self._get_view(location_name, lambda snapshot: snapshot.hourly[0])
+
+    async def get_date_forecast(self, location_name: str, date: str) -> DaySummary:
+        """
+        Fetches the weather summary for a given location and date.
+
+        Args:
+            location_name (str): The name of the location (e.g., city name).
+            date (str): The date in YYYY-MM-DD format.
+
+        Raises:
+            ValueError: If the API request fails or the location is not found.
+        """
+        self.logger.info("Fetching weather data for location: %s", location_name)
+
+        try:
+            latitude, longitude = await self._resolve_coordinates(location_name)
+            params = {
+                "date": date,
+                "units": "imperial",  # Use "imperial" for Fahrenheit
+            }
+            summary = await self._fetch("day_summary", DAY_SUMMARY_URL, latitude, longitude, params, parse_day_summary)
+            self.logger.info("Weather data for %s fetched", location_name)
+            return summary
+
+        except httpx.HTTPError as e:
+            self.logger.error("Failed to fetch weather data for %s: %s", location_name, str(e))
+            raise ValueError(f"Error fetching weather data for location '{location_name}': {str(e)}")
+
+        except KeyError as e:
+            self.logger.error("Unexpected response structure: %s", str(e))
+            raise ValueError("Unexpected response structure from weather API")
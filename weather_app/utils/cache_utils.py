@@ -0,0 +1,102 @@
+from collections import OrderedDict
+import logging
+import threading
+from typing import Any, Hashable, Optional
+
+from weather_app.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class LRUCache:
+    """
+    A small thread-safe, in-process least-recently-used cache.
+
+    Attributes:
+        maxsize (int): The maximum number of entries kept before the oldest is evicted.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initializes the LRUCache.
+
+        Args:
+            maxsize (int): The maximum number of entries to keep.
+
+        Raises:
+            ValueError: If maxsize is not a positive integer.
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer.")
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Retrieves a value and marks it as most recently used.
+
+        Args:
+            key (Hashable): The cache key.
+            default (Any): The value returned when the key is not cached.
+
+        Returns:
+            Any: The cached value, or default if the key is missing.
+        """
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Stores a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The value to store.
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted, _ = self._data.popitem(last=False)
+                logger.debug("Evicted '%s' from LRU cache", evicted)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Removes a key from the cache.
+
+        Args:
+            key (Hashable): The cache key.
+            default (Any): The value returned when the key is not cached.
+
+        Returns:
+            Any: The removed value, or default if the key is missing.
+        """
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        """
+        Removes every entry and resets the hit/miss counters.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,240 @@
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator
+
+from weather_app.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Consecutive upstream failures that open a circuit
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("WEATHER_BREAKER_FAILURE_THRESHOLD", "5"))
+# Seconds an open circuit fails fast before letting a probe request through
+BREAKER_RESET_SECONDS = float(os.getenv("WEATHER_BREAKER_RESET_SECONDS", "30"))
+# Attempts per upstream GET, including the first one
+RETRY_ATTEMPTS = int(os.getenv("WEATHER_RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("WEATHER_RETRY_BASE_DELAY", "0.2"))
+RETRY_MAX_DELAY = float(os.getenv("WEATHER_RETRY_MAX_DELAY", "2"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ValueError):
+    """
+    Raised instead of calling an upstream endpoint whose circuit is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Fails fast on an upstream endpoint after repeated failures.
+
+    After failure_threshold consecutive failures the circuit opens and every call
+    is rejected for reset_seconds. Then the circuit is half open: one probe call is
+    let through, and its outcome closes the circuit or opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_seconds: float = BREAKER_RESET_SECONDS):
+        """
+        Initializes the CircuitBreaker.
+
+        Args:
+            name (str): The name of the upstream endpoint, used in errors and logs.
+            failure_threshold (int): Consecutive failures that open the circuit.
+            reset_seconds (float): Seconds the circuit stays open before a probe is allowed.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.stats = {"opened": 0, "rejected": 0, "probes": 0}
+
+    def before_call(self) -> None:
+        """
+        Checks that a call may go upstream, turning an expired open circuit half open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half open with a probe already in flight.
+        """
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                logger.info("Circuit for '%s' is half open; probing", self.name)
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                self.stats["probes"] += 1
+                return
+            self.stats["rejected"] += 1
+            retry_in = max(self.reset_seconds - (time.monotonic() - self._opened_at), 0)
+        raise CircuitOpenError(f"Weather API '{self.name}' is unavailable; retry in {retry_in:.0f} seconds")
+
+    def record_success(self) -> None:
+        """
+        Records a successful upstream call, closing the circuit.
+        """
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("Circuit for '%s' closed", self.name)
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """
+        Records a failed upstream call, opening the circuit at the threshold or after a failed probe.
+        """
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self.stats["opened"] += 1
+                logger.warning("Circuit for '%s' opened after %d failures", self.name, self.failures)
+            self._probing = False
+
+    def release(self) -> None:
+        """
+        Ends a call that said nothing about upstream health (e.g. a 404), freeing the probe slot.
+        """
+        with self._lock:
+            self._probing = False
+
+    def call(self, func: Callable[[], Any], is_failure: Callable[[Exception], bool]) -> Any:
+        """
+        Calls func through the circuit.
+
+        Args:
+            func (Callable[[], Any]): The upstream call.
+            is_failure (Callable[[Exception], bool]): Whether an exception means the upstream is
+                unhealthy. Other exceptions (e.g. a 404) are re-raised without changing the circuit.
+
+        Returns:
+            Any: The result of func.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        self.before_call()
+        try:
+            result = func()
+        except BaseException as e:
+            # Anything that is not an upstream failure, interrupts included, must free the probe slot
+            if isinstance(e, Exception) and is_failure(e):
+                self.record_failure()
+            else:
+                self.release()
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the circuit's state and counters.
+
+        Returns:
+            Dict[str, Any]: The state, the consecutive failure count, and how often the circuit
+                opened, rejected calls and let a probe through.
+        """
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, **self.stats}
+
+
+def backoff_delays(attempts: int = RETRY_ATTEMPTS, base_delay: float = RETRY_BASE_DELAY,
+                   max_delay: float = RETRY_MAX_DELAY) -> Iterator[float]:
+    """
+    Yields the sleep before each retry, using exponential backoff with full jitter.
+
+    Jitter spreads the retries of many callers that failed together, so they do not
+    hit a recovering upstream in lockstep.
+
+    Args:
+        attempts (int): Total attempts, including the first one; attempts - 1 delays are yielded.
+        base_delay (float): The backoff ceiling of the first retry, in seconds.
+        max_delay (float): The largest backoff ceiling, in seconds.
+
+    Yields:
+        float: Seconds to sleep before the next attempt.
+    """
+    for retry in range(attempts - 1):
+        yield random.uniform(0, min(max_delay, base_delay * 2 ** retry))
+
+
+def call_with_retries(func: Callable[[], Any], should_retry: Callable[[Exception], bool],
+                      attempts: int = RETRY_ATTEMPTS) -> Any:
+    """
+    Calls an idempotent function, retrying transient failures with jittered backoff.
+
+    Args:
+        func (Callable[[], Any]): The idempotent call, e.g. an upstream GET.
+        should_retry (Callable[[Exception], bool]): Whether an exception is transient.
+        attempts (int): Total attempts, including the first one.
+
+    Returns:
+        Any: The result of the first successful attempt.
+    """
+    delays = backoff_delays(attempts)
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            delay = next(delays, None)
+            if delay is None or not should_retry(e):
+                raise
+            logger.info("Retrying in %.2fs after transient error: %s", delay, str(e))
+            time.sleep(delay)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    Returns the process-wide circuit breaker of an upstream endpoint, creating it on first use.
+
+    The sync and async weather clients share these, so both see the same upstream health.
+
+    Args:
+        name (str): The name of the upstream endpoint (e.g., "onecall").
+
+    Returns:
+        CircuitBreaker: The endpoint's circuit breaker.
+    """
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def circuit_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Returns the state and counters of every circuit breaker.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: The snapshot of each circuit, keyed by endpoint name.
+    """
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+def reset_circuit_breakers() -> None:
+    """
+    Forgets every circuit breaker, closing all circuits.
+    """
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,175 @@
+from collections import deque
+import fcntl
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from weather_app.models.favorite_locations_model import FavoriteLocations
+from weather_app.utils.logger import configure_logger
+from weather_app.utils.rate_limiter import RateLimitExceeded
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+PREFETCH_BUDGET_PER_MINUTE = int(os.getenv("WEATHER_PREFETCH_BUDGET_PER_MINUTE", "30"))
+PREFETCH_INTERVAL_SECONDS = float(os.getenv("WEATHER_PREFETCH_INTERVAL_SECONDS", "60"))
+PREFETCH_LEAD_SECONDS = float(os.getenv("WEATHER_PREFETCH_LEAD_SECONDS", "120"))
+# Lock file that elects one scheduler among the processes sharing it (gunicorn.conf.py sets it for several workers)
+PREFETCH_LOCK_PATH = os.getenv("WEATHER_PREFETCH_LOCK_PATH")
+
+
+class PrefetchScheduler:
+    """
+    Keeps the weather for favorite locations warm in the response cache.
+
+    Every pass ranks the distinct favorite locations by the number of users who
+    saved them and refreshes those whose cached weather expires soon, most popular
+    first. Every upstream request, retries included, is charged to a budget of
+    budget_per_minute calls in any sliding minute, and no refresh starts once it
+    is spent.
+
+    The scheduler refreshes the cache of the weather client it is given. When it
+    runs as a separate worker (flask prefetch-weather), use the shared sqlite
+    cache backend so the web workers see the refreshed entries.
+
+    When several processes run a scheduler (e.g. every gunicorn worker), give them
+    the same lock_path: only the one holding the lock runs passes, so prefetch
+    traffic stays within one budget however many workers there are. The others
+    try to take over every interval, so a recycled leader is replaced.
+    """
+
+    def __init__(self, app: Any, weather_client: Any, budget_per_minute: int = PREFETCH_BUDGET_PER_MINUTE,
+                 interval: float = PREFETCH_INTERVAL_SECONDS, lead_seconds: float = PREFETCH_LEAD_SECONDS,
+                 lock_path: Optional[str] = PREFETCH_LOCK_PATH):
+        """
+        Initializes the PrefetchScheduler.
+
+        Args:
+            app (Flask): The app whose database holds the favorite locations.
+            weather_client (WeatherClient): The weather client whose cache is kept warm.
+            budget_per_minute (int): The most weather API calls made in any sliding minute.
+            interval (float): Seconds between passes.
+            lead_seconds (float): How long before expiry a cached entry is refreshed.
+            lock_path (Optional[str]): A lock file shared with the other schedulers, of which only the
+                holder runs passes. None runs passes unconditionally.
+        """
+        self.app = app
+        self.weather_client = weather_client
+        self.budget_per_minute = budget_per_minute
+        self.interval = interval
+        self.lead_seconds = lead_seconds
+        self._calls = deque()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.lock_path = lock_path
+        self._lock_file = None
+
+    def _budget_left(self) -> int:
+        cutoff = time.monotonic() - 60
+        while self._calls and self._calls[0] < cutoff:
+            self._calls.popleft()
+        return self.budget_per_minute - len(self._calls)
+
+    def _record_call(self) -> None:
+        # Charged per upstream request, so a refresh that retried costs every attempt it made
+        self._calls.append(time.monotonic())
+
+    def run_once(self) -> Dict[str, int]:
+        """
+        Runs one prefetch pass.
+
+        Returns:
+            Dict[str, int]: How many locations were checked, refreshed, failed, or left for a
+                later pass because the budget ran out.
+        """
+        stats = {'checked': 0, 'refreshed': 0, 'errors': 0, 'deferred': 0}
+        with self.app.app_context():
+            locations = FavoriteLocations.get_location_popularity()
+            for index, location in enumerate(locations):
+                if self._budget_left() <= 0:
+                    stats['deferred'] = len(locations) - index
+                    logger.info("Prefetch budget exhausted; deferring %d locations", stats['deferred'])
+                    break
+                stats['checked'] += 1
+                try:
+                    if self.weather_client.prefetch_onecall(location['location_name'], self.lead_seconds,
+                                                            on_attempt=self._record_call):
+                        stats['refreshed'] += 1
+                except RateLimitExceeded:
+                    # The shared upstream quota is spent; leave the rest for a later pass
+                    stats['checked'] -= 1
+                    stats['deferred'] = len(locations) - index
+                    logger.info("Weather API quota exhausted; deferring %d locations", stats['deferred'])
+                    break
+                except Exception as e:
+                    # Any upstream attempts it made were already charged to the budget
+                    stats['errors'] += 1
+                    logger.error("Error prefetching weather for '%s': %s", location['location_name'], str(e))
+        logger.info("Prefetch pass finished: %s", stats)
+        return stats
+
+    def is_leader(self) -> bool:
+        """
+        Returns whether this scheduler may run passes, taking the shared lock if it is free.
+
+        Returns:
+            bool: True if there is no lock_path or this scheduler holds the lock.
+        """
+        if self.lock_path is None or self._lock_file is not None:
+            return True
+        directory = os.path.dirname(self.lock_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        logger.info("Process %d now runs the weather prefetch", os.getpid())
+        return True
+
+    def _release_lock(self) -> None:
+        if self._lock_file is not None:
+            self._lock_file.close()  # Closing the file releases the lock
+            self._lock_file = None
+
+    def run_forever(self) -> None:
+        """
+        Runs prefetch passes every interval seconds until stop is called.
+        """
+        logger.info("Starting weather prefetch every %.0fs with a budget of %d calls per minute",
+                    self.interval, self.budget_per_minute)
+        try:
+            while not self._stop.is_set():
+                try:
+                    if self.is_leader():
+                        self.run_once()
+                except Exception as e:
+                    logger.error("Prefetch pass failed: %s", str(e))
+                self._stop.wait(self.interval)
+        finally:
+            self._release_lock()
+
+    def start(self) -> None:
+        """
+        Runs the scheduler on a background daemon thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="weather-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the scheduler after its current pass.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
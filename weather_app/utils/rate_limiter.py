@@ -0,0 +1,308 @@
+import asyncio
+from contextlib import contextmanager
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from weather_app.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# OpenWeatherMap's free tier allows 60 calls per minute
+OWM_RATE_PER_MINUTE = float(os.getenv("OWM_RATE_PER_MINUTE", "60"))
+OWM_BURST = int(os.getenv("OWM_BURST", "20"))
+# Nominatim's usage policy allows at most one request per second
+NOMINATIM_RATE_PER_SECOND = float(os.getenv("NOMINATIM_RATE_PER_SECOND", "1"))
+# Seconds a caller queues for a token before giving up
+RATE_LIMIT_DEADLINE_SECONDS = float(os.getenv("RATE_LIMIT_DEADLINE_SECONDS", "5"))
+
+
+class RateLimitExceeded(ValueError):
+    """
+    Raised when no token became available before the caller's deadline.
+    """
+
+
+class MemoryBucketBackend:
+    """
+    Token buckets held in this process.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, name: str, rate: float, capacity: int) -> float:
+        """
+        Takes a token from a bucket if one is available.
+
+        Args:
+            name (str): The bucket name.
+            rate (float): Tokens added per second.
+            capacity (int): The most tokens the bucket holds.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds until the next token is available.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(name, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            if tokens >= 1:
+                self._buckets[name] = (tokens - 1, now)
+                return 0.0
+            self._buckets[name] = (tokens, now)
+            return (1 - tokens) / rate
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBucketBackend:
+    """
+    Token buckets stored in a SQLite file, shared by every process that points at the same file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes the SQLiteBucketBackend and creates its table if needed.
+
+        Args:
+            path (str): The path of the SQLite file holding the buckets.
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+                "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def reserve(self, name: str, rate: float, capacity: int) -> float:
+        with self._connect() as conn:
+            # BEGIN IMMEDIATE takes the write lock up front, so the read-modify-write below is atomic across processes
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = conn.execute("SELECT tokens, updated_at FROM rate_limit_buckets WHERE name = ?",
+                                   (name,)).fetchone()
+                tokens, updated_at = row if row else (capacity, now)
+                tokens = min(capacity, tokens + max(now - updated_at, 0) * rate)
+                wait = 0.0
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    wait = (1 - tokens) / rate
+                conn.execute("INSERT OR REPLACE INTO rate_limit_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                             (name, tokens, now))
+                conn.execute("COMMIT")
+                return wait
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM rate_limit_buckets")
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiting for the upstream APIs, one bucket per upstream.
+
+    Callers queue for a token until their deadline and then get a RateLimitExceeded,
+    so the app throttles itself instead of absorbing 429 responses from the provider.
+    """
+
+    def __init__(self, buckets: Dict[str, Tuple[float, int]], backend: Optional[object] = None,
+                 deadline: float = RATE_LIMIT_DEADLINE_SECONDS):
+        """
+        Initializes the RateLimiter.
+
+        Args:
+            buckets (Dict[str, Tuple[float, int]]): The (tokens per second, capacity) of each bucket.
+            backend (Optional[object]): The bucket storage (MemoryBucketBackend or SQLiteBucketBackend).
+                Defaults to an in-process backend.
+            deadline (float): The default seconds a caller queues for a token.
+        """
+        self.buckets = buckets
+        self.backend = backend if backend is not None else MemoryBucketBackend()
+        self.deadline = deadline
+        self._lock = threading.Lock()
+        self._stats = {name: self._empty_stats() for name in buckets}
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, float]:
+        return {"acquired": 0, "throttled": 0, "rejected": 0, "wait_seconds": 0.0}
+
+    def _reserve(self, name: str) -> float:
+        if name not in self.buckets:
+            raise ValueError(f"Unknown rate limit bucket '{name}'")
+        rate, capacity = self.buckets[name]
+        return self.backend.reserve(name, rate, capacity)
+
+    def _record(self, name: str, waited: float, acquired: bool) -> None:
+        with self._lock:
+            stats = self._stats[name]
+            stats["wait_seconds"] += waited
+            if waited > 0:
+                stats["throttled"] += 1
+            stats["acquired" if acquired else "rejected"] += 1
+
+    def _rejected(self, name: str, waited: float, timeout: float) -> RateLimitExceeded:
+        self._record(name, waited, acquired=False)
+        logger.warning("Rate limit for '%s' exceeded; gave up after %.1fs", name, timeout)
+        return RateLimitExceeded(f"Rate limit for '{name}' exceeded; no request slot within {timeout:g} seconds")
+
+    def acquire(self, name: str, timeout: Optional[float] = None) -> float:
+        """
+        Takes a token from a bucket, waiting for one until the deadline.
+
+        Args:
+            name (str): The bucket name (e.g., "owm").
+            timeout (Optional[float]): Seconds to wait for a token. Defaults to the limiter's deadline.
+
+        Returns:
+            float: The seconds spent waiting.
+
+        Raises:
+            RateLimitExceeded: If no token becomes available in time.
+            ValueError: If the bucket is unknown.
+        """
+        timeout = self.deadline if timeout is None else timeout
+        started = time.monotonic()
+        slept = False
+        while True:
+            wait = self._reserve(name)
+            waited = time.monotonic() - started if slept else 0.0
+            if wait == 0:
+                self._record(name, waited, acquired=True)
+                return waited
+            if waited + wait > timeout:
+                raise self._rejected(name, waited, timeout)
+            time.sleep(wait)
+            slept = True
+
+    async def acquire_async(self, name: str, timeout: Optional[float] = None) -> float:
+        """
+        Takes a token from a bucket without blocking the event loop.
+
+        Args:
+            name (str): The bucket name (e.g., "owm").
+            timeout (Optional[float]): Seconds to wait for a token. Defaults to the limiter's deadline.
+
+        Returns:
+            float: The seconds spent waiting.
+
+        Raises:
+            RateLimitExceeded: If no token becomes available in time.
+            ValueError: If the bucket is unknown.
+        """
+        timeout = self.deadline if timeout is None else timeout
+        started = time.monotonic()
+        slept = False
+        while True:
+            if isinstance(self.backend, MemoryBucketBackend):
+                wait = self._reserve(name)
+            else:
+                # A shared backend (e.g. sqlite's BEGIN IMMEDIATE) may wait on another process's lock
+                wait = await asyncio.to_thread(self._reserve, name)
+            waited = time.monotonic() - started if slept else 0.0
+            if wait == 0:
+                self._record(name, waited, acquired=True)
+                return waited
+            if waited + wait > timeout:
+                raise self._rejected(name, waited, timeout)
+            await asyncio.sleep(wait)
+            slept = True
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the quota usage of every bucket.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Per bucket, the tokens acquired, callers that had to wait,
+                callers rejected at their deadline, total seconds spent waiting, and the configured
+                rate per minute and burst capacity.
+        """
+        with self._lock:
+            return {
+                name: {
+                    **stats,
+                    "rate_per_minute": self.buckets[name][0] * 60,
+                    "capacity": self.buckets[name][1],
+                }
+                for name, stats in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        """
+        Refills every bucket and zeroes the counters.
+        """
+        self.backend.clear()
+        with self._lock:
+            self._stats = {name: self._empty_stats() for name in self.buckets}
+
+
+def build_rate_limiter() -> RateLimiter:
+    """
+    Builds the upstream RateLimiter from the environment.
+
+    The "owm" bucket allows OWM_RATE_PER_MINUTE calls per minute with bursts of OWM_BURST;
+    the "nominatim" bucket allows NOMINATIM_RATE_PER_SECOND calls per second with no burst.
+    RATE_LIMIT_BACKEND selects "memory" (default, per process) or "sqlite" (shared by every
+    process using the file at RATE_LIMIT_PATH).
+
+    Returns:
+        RateLimiter: The configured rate limiter.
+
+    Raises:
+        ValueError: If RATE_LIMIT_BACKEND names an unknown backend.
+    """
+    backend_name = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    if backend_name == "memory":
+        backend = MemoryBucketBackend()
+    elif backend_name == "sqlite":
+        backend = SQLiteBucketBackend(os.getenv("RATE_LIMIT_PATH", "./db/rate_limits.db"))
+    else:
+        raise ValueError(f"Unknown rate limit backend '{backend_name}'")
+
+    return RateLimiter({
+        "owm": (OWM_RATE_PER_MINUTE / 60, OWM_BURST),
+        "nominatim": (NOMINATIM_RATE_PER_SECOND, 1),
+    }, backend=backend)
+
+
+_default_rate_limiter = None
+_default_rate_limiter_lock = threading.Lock()
+
+
+def get_default_rate_limiter() -> RateLimiter:
+    """
+    Returns the process-wide RateLimiter, building it on first use.
+
+    Returns:
+        RateLimiter: The shared rate limiter.
+    """
+    global _default_rate_limiter
+    with _default_rate_limiter_lock:
+        if _default_rate_limiter is None:
+            _default_rate_limiter = build_rate_limiter()
+        return _default_rate_limiter
@@ -0,0 +1,283 @@
+import base64
+from contextlib import contextmanager
+from functools import wraps
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import current_app, g, jsonify, make_response, request
+
+from weather_app.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Seconds a session token issued at login stays valid
+SESSION_TOKEN_TTL_SECONDS = int(os.getenv("SESSION_TOKEN_TTL_SECONDS", "3600"))
+
+
+class InvalidTokenError(ValueError):
+    """
+    Raised when a session token is malformed, tampered with, expired or revoked.
+    """
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str, secret: str) -> str:
+    return _b64encode(hmac.new(secret.encode(), payload.encode(), hashlib.sha256).digest())
+
+
+def issue_token(user_id: int, secret: str, ttl: int = SESSION_TOKEN_TTL_SECONDS,
+                now: Optional[float] = None) -> Tuple[str, int]:
+    """
+    Issues a signed session token for a user.
+
+    The token carries the user ID, its expiry and a unique ID, signed with HMAC-SHA256,
+    so it can be verified without a database lookup.
+
+    Args:
+        user_id (int): The user's ID.
+        secret (str): The signing key.
+        ttl (int): Seconds until the token expires.
+        now (Optional[float]): The current Unix time. Defaults to the clock.
+
+    Returns:
+        Tuple[str, int]: The token and its expiry as Unix time.
+    """
+    expires_at = int((time.time() if now is None else now) + ttl)
+    claims = {"sub": user_id, "exp": expires_at, "jti": secrets.token_hex(8)}
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    return f"{payload}.{_sign(payload, secret)}", expires_at
+
+
+def verify_token(token: str, secret: str, now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Verifies a session token's signature and expiry.
+
+    Args:
+        token (str): The session token.
+        secret (str): The signing key.
+        now (Optional[float]): The current Unix time. Defaults to the clock.
+
+    Returns:
+        Dict[str, Any]: The token's claims: the user ID ('sub'), the expiry ('exp') and the token ID ('jti').
+
+    Raises:
+        InvalidTokenError: If the token is malformed, its signature does not match, or it expired.
+    """
+    payload, _, signature = token.partition(".")
+    if not payload or not signature or not hmac.compare_digest(signature, _sign(payload, secret)):
+        raise InvalidTokenError("Invalid session token")
+    try:
+        claims = json.loads(_b64decode(payload))
+        expires_at, user_id = claims["exp"], claims["sub"]
+    except (ValueError, KeyError, TypeError):
+        raise InvalidTokenError("Invalid session token")
+    if expires_at <= (time.time() if now is None else now):
+        raise InvalidTokenError("Session token expired")
+    logger.debug("Verified session token for user_id %d", user_id)
+    return claims
+
+
+class MemoryRevocationBackend:
+    """
+    Revoked token IDs held in this process.
+    """
+
+    def __init__(self):
+        self._revoked: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def revoke(self, token_id: str, expires_at: int, now: float) -> None:
+        with self._lock:
+            self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+            self._revoked[token_id] = expires_at
+
+    def is_revoked(self, token_id: str, now: float) -> bool:
+        with self._lock:
+            return self._revoked.get(token_id, 0) > now
+
+    def count(self, now: float) -> int:
+        with self._lock:
+            return sum(1 for exp in self._revoked.values() if exp > now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._revoked.clear()
+
+
+class SQLiteRevocationBackend:
+    """
+    Revoked token IDs stored in a SQLite file, shared by every process that points at the same file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes the SQLiteRevocationBackend and creates its table if needed.
+
+        Args:
+            path (str): The path of the SQLite file holding the revoked token IDs.
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS revoked_tokens ("
+                "jti TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def revoke(self, token_id: str, expires_at: int, now: float) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM revoked_tokens WHERE expires_at <= ?", (now,))
+            conn.execute("INSERT OR REPLACE INTO revoked_tokens (jti, expires_at) VALUES (?, ?)",
+                         (token_id, expires_at))
+
+    def is_revoked(self, token_id: str, now: float) -> bool:
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM revoked_tokens WHERE jti = ? AND expires_at > ?",
+                                (token_id, now)).fetchone() is not None
+
+    def count(self, now: float) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM revoked_tokens WHERE expires_at > ?", (now,)).fetchone()[0]
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM revoked_tokens")
+
+
+class TokenRevocationList:
+    """
+    The IDs of revoked session tokens that have not expired yet.
+
+    Entries are dropped once their token expires, since expiry rejects the token anyway,
+    so the list only ever holds tokens revoked within the last SESSION_TOKEN_TTL_SECONDS.
+    With the sqlite backend, every worker sharing the file sees every revocation.
+    """
+
+    def __init__(self, backend: Optional[object] = None):
+        """
+        Initializes the TokenRevocationList.
+
+        Args:
+            backend (Optional[object]): Where revocations are stored. Defaults to a MemoryRevocationBackend.
+        """
+        self.backend = backend if backend is not None else MemoryRevocationBackend()
+
+    def revoke(self, token_id: str, expires_at: int) -> None:
+        """
+        Revokes a token until it expires.
+
+        Args:
+            token_id (str): The token's 'jti' claim.
+            expires_at (int): The token's 'exp' claim.
+        """
+        self.backend.revoke(token_id, expires_at, time.time())
+
+    def is_revoked(self, token_id: str) -> bool:
+        return self.backend.is_revoked(token_id, time.time())
+
+    def __len__(self) -> int:
+        return self.backend.count(time.time())
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+def build_revocation_list() -> TokenRevocationList:
+    """
+    Builds the TokenRevocationList from the environment.
+
+    SESSION_REVOCATION_BACKEND selects "memory" (default, per process) or "sqlite" (shared by
+    every process using the file at SESSION_REVOCATION_PATH).
+
+    Returns:
+        TokenRevocationList: The configured revocation list.
+
+    Raises:
+        ValueError: If SESSION_REVOCATION_BACKEND names an unknown backend.
+    """
+    backend_name = os.getenv("SESSION_REVOCATION_BACKEND", "memory")
+    if backend_name == "memory":
+        backend = MemoryRevocationBackend()
+    elif backend_name == "sqlite":
+        backend = SQLiteRevocationBackend(os.getenv("SESSION_REVOCATION_PATH", "./db/revoked_tokens.db"))
+    else:
+        raise ValueError(f"Unknown session revocation backend '{backend_name}'")
+    return TokenRevocationList(backend=backend)
+
+
+_revocation_list = None
+_revocation_list_lock = threading.Lock()
+
+
+def get_revocation_list() -> TokenRevocationList:
+    """
+    Returns the process-wide revocation list, building it on first use.
+
+    Returns:
+        TokenRevocationList: The shared revocation list.
+    """
+    global _revocation_list
+    with _revocation_list_lock:
+        if _revocation_list is None:
+            _revocation_list = build_revocation_list()
+        return _revocation_list
+
+
+def require_session_token(view: Callable) -> Callable:
+    """
+    Decorates a route so it requires an "Authorization: Bearer <token>" header.
+
+    The token is checked against its signature, its expiry and the revocation list,
+    without a database query. The route sees the user's ID as g.user_id and the
+    token's claims as g.session_claims; invalid requests get a 401 response.
+
+    Args:
+        view (Callable): The route function.
+
+    Returns:
+        Callable: The decorated route function.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return make_response(jsonify({'error': 'A session token is required'}), 401)
+        try:
+            claims = verify_token(token.strip(), current_app.config['SECRET_KEY'])
+            if get_revocation_list().is_revoked(claims["jti"]):
+                raise InvalidTokenError("Session token revoked")
+        except InvalidTokenError as e:
+            logger.info("Rejected session token: %s", str(e))
+            return make_response(jsonify({'error': str(e)}), 401)
+        g.user_id = claims["sub"]
+        g.session_claims = claims
+        return view(*args, **kwargs)
+    return wrapper
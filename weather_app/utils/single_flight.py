@@ -0,0 +1,87 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+from weather_app.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class _Call:
+    """
+    An in-flight call whose result or error is shared by every caller of the same key.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one execution.
+
+    The first caller for a key runs the function; callers that arrive while it is
+    running wait for it and receive the same result, or the same exception.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Runs func once for all concurrent callers of key.
+
+        Args:
+            key (Hashable): Identifies calls that may share a result.
+            func (Callable[[], Any]): The function to run.
+
+        Returns:
+            Any: The result of func.
+
+        Raises:
+            Exception: Whatever func raised, re-raised in every waiting caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            logger.debug("Joining in-flight call for '%s'", key)
+            call.done.wait()
+        else:
+            try:
+                call.result = func()
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns how many calls were executed and how many callers shared an in-flight call.
+
+        Returns:
+            Dict[str, int]: The executed and shared counts.
+        """
+        with self._lock:
+            return {"executed": self.executed, "shared": self.shared}
@@ -2,7 +2,15 @@ from contextlib import contextmanager
 import logging
 import os
 import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
 
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from weather_app.db import db
 from weather_app.utils.logger import configure_logger
 
 
@@ -10,45 +18,89 @@ logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
-# load the db path from the environment with a default value
+# load the db path from the environment with a default value; only get_db_connection uses it,
+# the health checks go through the app's engine
 DB_PATH = os.getenv("DB_PATH", "./db/weather_app.db")
 
 
-def check_database_connection():
+# Seconds a health check result is reused; orchestrators poll /api/db-check often
+HEALTH_CHECK_TTL_SECONDS = float(os.getenv("DB_HEALTH_CHECK_TTL_SECONDS", "5"))
+
+_health_cache: Dict[Tuple[Engine, Tuple[str, ...]], Tuple[float, Optional[str]]] = {}
+_health_cache_lock = threading.Lock()
+
+
+def _run_health_check(engine: Engine, tables: Tuple[str, ...]) -> Optional[str]:
+    """
+    Lists the tables through SQLAlchemy's inspector on one pooled connection, which works on any database.
+
+    Returns:
+        Optional[str]: The error message, or None if the database is healthy.
+    """
+    try:
+        with engine.connect() as conn:
+            found = set(inspect(conn).get_table_names())
+    except SQLAlchemyError as e:
+        return f"Database connection error: {e}"
+    missing = [table for table in tables if table not in found]
+    if missing:
+        return f"Table check error: no such table: {', '.join(missing)}"
+    return None
+
+def check_database_health(tables: Iterable[str] = (), engine: Optional[Engine] = None,
+                          ttl: float = HEALTH_CHECK_TTL_SECONDS) -> None:
+    """Check the database connection and that tables exist, reusing a recent result
+
+    Args:
+        tables (Iterable[str]): The names of the tables that must exist
+        engine (Optional[Engine]): The engine to check. Defaults to the app's engine
+        ttl (float): Seconds a previous result for the same engine and tables is reused
+
+    Raises:
+        Exception: If the database connection is not OK or a table does not exist
+    """
+    engine = engine if engine is not None else db.engine
+    key = (engine, tuple(sorted(set(tables))))
+    now = time.monotonic()
+    with _health_cache_lock:
+        cached = _health_cache.get(key)
+    if cached and now - cached[0] < ttl:
+        error_message = cached[1]
+    else:
+        error_message = _run_health_check(engine, key[1])
+        with _health_cache_lock:
+            _health_cache[key] = (now, error_message)
+    if error_message:
+        logger.error(error_message)
+        raise Exception(error_message)
+
+def clear_health_cache() -> None:
+    """Forget every cached health check result"""
+    with _health_cache_lock:
+        _health_cache.clear()
+
+def check_database_connection(engine: Optional[Engine] = None):
     """Check the database connection
 
+    Args:
+        engine (Optional[Engine]): The engine to check. Defaults to the app's engine
+
     Raises:
         Exception: If the database connection is not OK
     """
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        # This ensures the connection is actually active
-        cursor.execute("SELECT 1;")
-        conn.close()
-    except sqlite3.Error as e:
-        error_message = f"Database connection error: {e}"
-        logger.error(error_message)
-        raise Exception(error_message) from e
+    check_database_health((), engine)
 
-def check_table_exists(tablename: str):
-    """Check if the table exists by querying it
+def check_table_exists(tablename: str, engine: Optional[Engine] = None):
+    """Check if the table exists
 
     Args:
         tablename (str): The name of the table to check
+        engine (Optional[Engine]): The engine to check. Defaults to the app's engine
 
     Raises:
         Exception: If the table does not exist
     """
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT 1 FROM {tablename} LIMIT 1;")
-        conn.close()
-    except sqlite3.Error as e:
-        error_message = f"Table check error: {e}"
-        logger.error(error_message)
-        raise Exception(error_message) from e
+    check_database_health((tablename,), engine)
 
 @contextmanager
 def get_db_connection():
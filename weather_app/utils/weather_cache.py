@@ -0,0 +1,451 @@
+from contextlib import contextmanager
+from decimal import Decimal
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from weather_app.utils.cache_utils import LRUCache
+from weather_app.utils.logger import configure_logger
+from weather_app.utils.single_flight import SingleFlight
+from weather_app.utils.weather_results import from_cache_json, to_cache_json
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Seconds a response is fresh, per weather endpoint
+DEFAULT_TTLS = {
+    "onecall": 10 * 60,
+    "day_summary": 60 * 60,
+}
+# Seconds past expiry during which a stale response is still served while it is refreshed
+DEFAULT_STALE_SECONDS = int(os.getenv("WEATHER_CACHE_STALE_SECONDS", "600"))
+# Size in degrees of the grid cells that coordinates snap to in cache keys (0.01 is roughly 1 km, 0.05 roughly 5 km);
+# every location in a cell shares one cached response
+GRID_DEGREES = float(os.getenv("WEATHER_CACHE_GRID_DEGREES", "0.01"))
+# Grid cells whose distinct requesting locations are tracked for the sharing metrics
+SHARING_MAX_CELLS = 10000
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    stored_at: float
+
+
+def _grid_decimals(grid: float) -> int:
+    return max(0, -Decimal(str(grid)).normalize().as_tuple().exponent)
+
+
+def quantize_coordinates(latitude: float, longitude: float, grid: float = GRID_DEGREES) -> Tuple[float, float]:
+    """
+    Snaps coordinates to the center of their grid cell.
+
+    Args:
+        latitude (float): The latitude of the location.
+        longitude (float): The longitude of the location.
+        grid (float): The size of a grid cell in degrees.
+
+    Returns:
+        Tuple[float, float]: The snapped (latitude, longitude) pair.
+    """
+    decimals = _grid_decimals(grid)
+    return round(round(latitude / grid) * grid, decimals), round(round(longitude / grid) * grid, decimals)
+
+
+def make_cache_key(endpoint: str, latitude: float, longitude: float, params: Dict[str, Any],
+                   grid: float = GRID_DEGREES) -> str:
+    """
+    Builds a cache key from an endpoint, grid-snapped coordinates and the request params.
+
+    The API key is never part of the cache key.
+
+    Args:
+        endpoint (str): The name of the weather endpoint (e.g., "daily").
+        latitude (float): The latitude of the location.
+        longitude (float): The longitude of the location.
+        params (Dict[str, Any]): The remaining request params.
+        grid (float): The size of a grid cell in degrees.
+
+    Returns:
+        str: The cache key.
+    """
+    latitude, longitude = quantize_coordinates(latitude, longitude, grid)
+    decimals = _grid_decimals(grid)
+    query = "&".join(f"{name}={params[name]}" for name in sorted(params)
+                     if name not in ("lat", "lon", "appid"))
+    return f"{endpoint}:{latitude:.{decimals}f},{longitude:.{decimals}f}:{query}"
+
+
+class MemoryCacheBackend:
+    """
+    An in-process LRU cache backend.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._lru = LRUCache(maxsize=maxsize)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        return self._lru.get(key)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._lru.set(key, entry)
+
+    def delete(self, key: str) -> None:
+        self._lru.pop(key)
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+
+class SQLiteCacheBackend:
+    """
+    An on-disk cache backend, shared by every process that points at the same file.
+
+    Values are stored as JSON rather than pickles, so a process that can write the
+    shared file cannot make the others run code when they read it. Every write also
+    deletes the entries older than max_age, so the file stays bounded by the number
+    of grid cells requested within that window.
+    """
+
+    def __init__(self, path: str, max_age: float = max(DEFAULT_TTLS.values()) + DEFAULT_STALE_SECONDS):
+        """
+        Initializes the SQLiteCacheBackend and creates its table if needed.
+
+        Args:
+            path (str): The path of the SQLite file holding the cache.
+            max_age (float): Seconds after which an entry is deleted; at least the longest TTL plus
+                the stale window, since older entries are never served fresh or stale.
+        """
+        self.path = path
+        self.max_age = max_age
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS weather_cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_weather_cache_stored_at ON weather_cache (stored_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, stored_at FROM weather_cache WHERE key = ?", (key,)).fetchone()
+        if not row:
+            return None
+        try:
+            return CacheEntry(from_cache_json(row[0]), row[1])
+        except (TypeError, ValueError):
+            # e.g. an entry pickled by an older version; treat it as a miss so it is refetched
+            logger.warning("Ignoring unreadable cache entry '%s'", key)
+            return None
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO weather_cache (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, to_cache_json(entry.value), entry.stored_at),
+            )
+            conn.execute("DELETE FROM weather_cache WHERE stored_at < ?", (entry.stored_at - self.max_age,))
+
+    def delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM weather_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM weather_cache")
+
+
+class WeatherCache:
+    """
+    A TTL cache for weather responses that serves stale entries while refreshing them in the background.
+    """
+
+    def __init__(self, backend: Any, ttls: Optional[Dict[str, int]] = None,
+                 stale_seconds: int = DEFAULT_STALE_SECONDS, grid: float = GRID_DEGREES):
+        """
+        Initializes the WeatherCache.
+
+        Args:
+            backend (Any): The storage backend (MemoryCacheBackend or SQLiteCacheBackend).
+            ttls (Optional[Dict[str, int]]): Seconds each endpoint's responses stay fresh.
+            stale_seconds (int): Seconds past expiry during which stale responses are still served.
+            grid (float): The size in degrees of the grid cells that share one cached response.
+        """
+        self.backend = backend
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.stale_seconds = stale_seconds
+        self.grid = grid
+        self._cell_locations: Dict[Tuple[float, float], set] = {}
+        self._refreshing = set()
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def key_for(self, endpoint: str, latitude: float, longitude: float,
+                params: Dict[str, Any]) -> Tuple[str, Tuple[float, float]]:
+        """
+        Builds the cache key of a request and records which location asked for its grid cell.
+
+        Sharing is tracked per grid cell, whatever the endpoint and params, so requests
+        for different dates or views of one place count as one cell.
+
+        Args:
+            endpoint (str): The name of the weather endpoint.
+            latitude (float): The latitude of the location.
+            longitude (float): The longitude of the location.
+            params (Dict[str, Any]): The remaining request params.
+
+        Returns:
+            Tuple[str, Tuple[float, float]]: The cache key, and the center of its grid cell, which is
+                where the upstream request is made so the response does not depend on who asked first.
+        """
+        key = make_cache_key(endpoint, latitude, longitude, params, self.grid)
+        cell = quantize_coordinates(latitude, longitude, self.grid)
+        location = (round(latitude, 4), round(longitude, 4))
+        with self._lock:
+            locations = self._cell_locations.get(cell)
+            if locations is None and len(self._cell_locations) < SHARING_MAX_CELLS:
+                locations = self._cell_locations[cell] = set()
+            if locations is not None:
+                locations.add(location)
+        return key, cell
+
+    def sharing_stats(self) -> Dict[str, Any]:
+        """
+        Reports how many distinct locations share each cached grid cell.
+
+        Returns:
+            Dict[str, Any]: The grid size, the number of grid cells requested, the distinct locations
+                that requested them, the cells shared by more than one location, and the sharing
+                ratio (locations per cell; 1.0 means no sharing).
+        """
+        with self._lock:
+            sizes = [len(locations) for locations in self._cell_locations.values()]
+        cells, locations = len(sizes), sum(sizes)
+        return {
+            "grid_degrees": self.grid,
+            "cells": cells,
+            "locations": locations,
+            "shared_cells": sum(1 for size in sizes if size > 1),
+            "sharing_ratio": round(locations / cells, 2) if cells else 0.0,
+        }
+
+    def get_or_fetch(self, endpoint: str, key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for a key, fetching it on a miss.
+
+        A fresh entry is returned as is. An expired entry that is still within the
+        stale window is returned immediately while a background thread refreshes it.
+        Concurrent misses for the same key share a single fetch.
+
+        Args:
+            endpoint (str): The name of the weather endpoint, used to pick the TTL.
+            key (str): The cache key.
+            fetch (Callable[[], Any]): Fetches the value from the upstream API.
+
+        Returns:
+            Any: The cached or freshly fetched value.
+        """
+        state, value = self.lookup(endpoint, key)
+        if state == "fresh":
+            return value
+        if state == "stale":
+            self.refresh_in_background(key, fetch)
+            return value
+        return self._fetch_and_store(key, fetch)
+
+    def lookup(self, endpoint: str, key: str) -> Tuple[Optional[str], Any]:
+        """
+        Reads a cache entry without fetching, and counts the hit or miss.
+
+        Args:
+            endpoint (str): The name of the weather endpoint, used to pick the TTL.
+            key (str): The cache key.
+
+        Returns:
+            Tuple[Optional[str], Any]: "fresh" or "stale" and the cached value, or (None, None)
+                if the key is missing or too old to serve.
+        """
+        entry = self.backend.get(key)
+        if entry is not None:
+            age = time.time() - entry.stored_at
+            ttl = self.ttls.get(endpoint, 0)
+            if age < ttl:
+                self._count("hits")
+                return "fresh", entry.value
+            if age < ttl + self.stale_seconds:
+                self._count("stale_hits")
+                return "stale", entry.value
+        self._count("misses")
+        return None, None
+
+    def store(self, key: str, value: Any) -> None:
+        """
+        Stores a freshly fetched value.
+
+        Args:
+            key (str): The cache key.
+            value (Any): The value to store.
+        """
+        self.backend.set(key, CacheEntry(value, time.time()))
+
+    def last_known(self, key: str) -> Any:
+        """
+        Returns the cached value for a key however old it is, for use when the upstream is down.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Any: The cached value, or None if the key is not cached.
+        """
+        entry = self.backend.get(key)
+        return entry.value if entry is not None else None
+
+    def time_to_expiry(self, endpoint: str, key: str) -> Optional[float]:
+        """
+        Returns how many seconds a cached entry stays fresh.
+
+        Args:
+            endpoint (str): The name of the weather endpoint, used to pick the TTL.
+            key (str): The cache key.
+
+        Returns:
+            Optional[float]: The seconds left before the entry expires (negative once expired),
+                or None if the key is not cached.
+        """
+        entry = self.backend.get(key)
+        if entry is None:
+            return None
+        return entry.stored_at + self.ttls.get(endpoint, 0) - time.time()
+
+    def refresh(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Fetches and stores a value regardless of what is cached.
+
+        Args:
+            key (str): The cache key.
+            fetch (Callable[[], Any]): Fetches the value from the upstream API.
+
+        Returns:
+            Any: The freshly fetched value.
+        """
+        self._count("refreshes")
+        return self._fetch_and_store(key, fetch)
+
+    def _fetch_and_store(self, key: str, fetch: Callable[[], Any]) -> Any:
+        def run():
+            value = fetch()
+            self.store(key, value)
+            return value
+
+        return self._flight.do(key, run)
+
+    def refresh_in_background(self, key: str, fetch: Callable[[], Any]) -> None:
+        """
+        Refreshes an entry on a background thread, unless a refresh of it is already running.
+
+        Args:
+            key (str): The cache key.
+            fetch (Callable[[], Any]): Fetches the value from the upstream API.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._fetch_and_store(key, fetch)
+                self._count("refreshes")
+                logger.info("Refreshed stale cache entry '%s'", key)
+            except Exception as e:
+                self._count("refresh_errors")
+                logger.error("Error refreshing cache entry '%s': %s", key, str(e))
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name=f"weather-cache-refresh-{key}", daemon=True).start()
+
+    def coalescing_stats(self) -> Dict[str, int]:
+        """
+        Returns how many upstream fetches ran and how many callers shared one.
+
+        Returns:
+            Dict[str, int]: The executed and shared counts.
+        """
+        return self._flight.stats()
+
+    def clear(self) -> None:
+        """
+        Removes every cached response.
+        """
+        self.backend.clear()
+        with self._lock:
+            self._cell_locations.clear()
+
+
+def build_weather_cache() -> WeatherCache:
+    """
+    Builds a WeatherCache from the environment.
+
+    WEATHER_CACHE_BACKEND selects "memory" (default) or "sqlite"; the SQLite file lives at
+    WEATHER_CACHE_PATH and drops entries past the longest TTL plus the stale window. WEATHER_CACHE_TTL_<ENDPOINT> overrides the TTL of one endpoint, and
+    WEATHER_CACHE_GRID_DEGREES sets the grid that nearby locations share.
+
+    Returns:
+        WeatherCache: The configured cache.
+
+    Raises:
+        ValueError: If WEATHER_CACHE_BACKEND names an unknown backend.
+    """
+    ttls = {endpoint: int(os.getenv(f"WEATHER_CACHE_TTL_{endpoint.upper()}", ttl))
+            for endpoint, ttl in DEFAULT_TTLS.items()}
+    backend_name = os.getenv("WEATHER_CACHE_BACKEND", "memory")
+    if backend_name == "memory":
+        backend = MemoryCacheBackend(maxsize=int(os.getenv("WEATHER_CACHE_SIZE", "1024")))
+    elif backend_name == "sqlite":
+        backend = SQLiteCacheBackend(os.getenv("WEATHER_CACHE_PATH", "./db/weather_cache.db"),
+                                     max_age=max(ttls.values()) + DEFAULT_STALE_SECONDS)
+    else:
+        raise ValueError(f"Unknown weather cache backend '{backend_name}'")
+
+    return WeatherCache(backend, ttls=ttls)
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> WeatherCache:
+    """
+    Returns the process-wide WeatherCache, building it on first use.
+
+    Returns:
+        WeatherCache: The shared cache.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = build_weather_cache()
+        return _default_cache
@@ -1,94 +1,433 @@
 import requests
+from requests.adapters import HTTPAdapter
 import logging
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 import os
+from flask import has_app_context
+from weather_app.db import db
+from weather_app.models.geocode_cache_model import GeocodeCache
+from weather_app.utils.cache_utils import LRUCache
+from weather_app.utils.circuit_breaker import CircuitOpenError, call_with_retries, get_circuit_breaker
 from weather_app.utils.logger import configure_logger
+from weather_app.utils.rate_limiter import RateLimiter, get_default_rate_limiter
+from weather_app.utils.single_flight import SingleFlight
+from weather_app.utils.weather_cache import WeatherCache, get_default_cache
+from weather_app.utils.weather_results import (
+    CurrentConditions,
+    DailyForecast,
+    DaySummary,
+    HourlyForecast,
+    OneCallSnapshot,
+    parse_day_summary,
+    parse_onecall,
+)
 from geopy.geocoders import Nominatim
 
 
 
 load_dotenv()
-def get_lat_long(location_name):
-    geolocator = Nominatim(user_agent="my_geocoder")
-    location = geolocator.geocode(location_name)
 
-    if location:
-        return location.latitude, location.longitude
-    else:
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+GEOCODE_PROVIDER = "nominatim"
+geolocator = Nominatim(user_agent="my_geocoder")
+# In-process LRU in front of the geocode_cache table
+geocode_lru = LRUCache(maxsize=int(os.getenv("GEOCODE_CACHE_SIZE", "1024")))
+# Coalesces concurrent geocodes of the same location within this process
+geocode_flight = SingleFlight()
+
+ONECALL_URL = "https://api.openweathermap.org/data/3.0/onecall"
+DAY_SUMMARY_URL = "https://api.openweathermap.org/data/3.0/onecall/day_summary"
+ONECALL_PARAMS = {
+    "exclude": "minutely",
+    "units": "imperial",  # Use "imperial" for Fahrenheit
+}
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10
+# Upstream responses that mean the provider is struggling rather than that the request is wrong
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def normalize_location_name(location_name: str) -> str:
+    """
+    Normalizes a location string so that trivially different spellings share a cache entry.
+
+    Args:
+        location_name (str): The location string as entered by the user.
+
+    Returns:
+        str: The lowercased location string with collapsed whitespace.
+    """
+    return " ".join(location_name.split()).lower()
+
+
+def get_lat_long(location_name: str) -> Optional[Tuple[float, float]]:
+    """
+    Resolves a location name to coordinates.
+
+    Lookups go through the in-process LRU, then the geocode_cache table (when an
+    app context is available), and only then to Nominatim. Successful geocodes
+    are written back to both caches. Concurrent lookups of the same location
+    share one geocode.
+
+    Args:
+        location_name (str): The name of the location (e.g., city name).
+
+    Returns:
+        Optional[Tuple[float, float]]: The (latitude, longitude) pair, or None if the location is unknown.
+    """
+    query = normalize_location_name(location_name)
+    latlong = geocode_lru.get(query)
+    if latlong:
+        return latlong
+    return geocode_flight.do(query, lambda: _geocode(location_name, query))
+
+
+def warm_geocode_cache(location_names: List[str]) -> None:
+    """
+    Loads the cached coordinates of many locations into the LRU with one query.
+
+    Locations that are not in the geocode_cache table are left for get_lat_long
+    to geocode individually.
+
+    Args:
+        location_names (List[str]): The location names to look up.
+    """
+    queries = {normalize_location_name(name) for name in location_names}
+    missing = [query for query in queries if query not in geocode_lru]
+    if not missing or not has_app_context():
+        return
+    try:
+        cached = GeocodeCache.lookup_many(missing)
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Error reading geocode cache: %s", str(e))
+        return
+    for query, latlong in cached.items():
+        geocode_lru.set(query, latlong)
+    logger.info("Loaded %d of %d uncached geocodes from the geocode cache", len(cached), len(missing))
+
+
+def _is_upstream_failure(error: Exception) -> bool:
+    """
+    Returns whether a requests error means the weather API is unhealthy, which counts against its circuit.
+    """
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Returns whether a requests error is worth retrying.
+
+    Read timeouts are not retried: the caller already waited the full read timeout once.
+    """
+    return _is_upstream_failure(error) and not isinstance(error, requests.exceptions.ReadTimeout)
+
+
+def _geocode(location_name: str, query: str) -> Optional[Tuple[float, float]]:
+    if has_app_context():
+        latlong = None
+        try:
+            latlong = GeocodeCache.lookup(query)
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Error reading geocode cache for '%s': %s", query, str(e))
+        if latlong:
+            geocode_lru.set(query, latlong)
+            return latlong
+
+    logger.info("Geocoding location '%s' with %s", location_name, GEOCODE_PROVIDER)
+    get_default_rate_limiter().acquire("nominatim")
+    location = geolocator.geocode(location_name)
+    if not location:
         return None
 
+    latlong = (location.latitude, location.longitude)
+    geocode_lru.set(query, latlong)
+    if has_app_context():
+        GeocodeCache.store(query, latlong[0], latlong[1], GEOCODE_PROVIDER)
+    return latlong
 
 
 class WeatherClient:
     """
     A client for fetching weather data from an external API.
     """
-    def __init__(self, base_url: str = "https://api.openweathermap.org/data/2.5/weather"):
+    def __init__(self, base_url: str = "https://api.openweathermap.org/data/2.5/weather",
+                 cache: Optional[WeatherCache] = None, pool_size: int = DEFAULT_POOL_SIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT, read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 rate_limiter: Optional[RateLimiter] = None):
         """
         Initializes the WeatherClient.
 
+        The client owns a pooled, keep-alive requests.Session, so it is meant to be
+        created once and shared (see create_app) rather than built per request.
+
         Args:
-            api_key (str): The API key for accessing the weather service.
             base_url (str): The base URL of the weather service API.
+            cache (Optional[WeatherCache]): The response cache. Defaults to the process-wide cache.
+            pool_size (int): The maximum number of kept-alive connections per host.
+            connect_timeout (float): Seconds to wait for a connection to the weather API.
+            read_timeout (float): Seconds to wait for the weather API to respond.
+            rate_limiter (Optional[RateLimiter]): Throttles calls to the weather API through its "owm"
+                bucket. Defaults to the process-wide rate limiter.
         """
         self.api_key = os.getenv("API_KEY")
         self.base_url = base_url
+        self.cache = cache if cache is not None else get_default_cache()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_default_rate_limiter()
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_size = pool_size
+        self.session = self._new_session()
         self.logger = logging.getLogger(__name__)
         configure_logger(self.logger)
 
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "WeatherClient":
+        """
+        Builds a WeatherClient from a Flask config mapping.
+
+        Args:
+            config (Dict[str, Any]): The app config. WEATHER_POOL_SIZE, WEATHER_CONNECT_TIMEOUT
+                and WEATHER_READ_TIMEOUT are read when present.
+
+        Returns:
+            WeatherClient: The configured client.
+        """
+        return cls(
+            pool_size=config.get("WEATHER_POOL_SIZE", DEFAULT_POOL_SIZE),
+            connect_timeout=config.get("WEATHER_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+            read_timeout=config.get("WEATHER_READ_TIMEOUT", DEFAULT_READ_TIMEOUT),
+        )
+
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Reports how well the session reuses its kept-alive connections.
+
+        Returns:
+            Dict[str, int]: The number of requests sent, connections opened, and requests
+                that reused an already open connection.
+        """
+        requests_sent = connections_opened = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                requests_sent += pool.num_requests
+                connections_opened += pool.num_connections
+        return {
+            "requests": requests_sent,
+            "connections_opened": connections_opened,
+            "connections_reused": max(requests_sent - connections_opened, 0),
+        }
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self) -> None:
+        """
+        Closes the pooled connections.
+        """
+        self.session.close()
+
+    def reset_session(self) -> None:
+        """
+        Replaces the pooled session with a fresh one, for a process forked after the client was built.
+
+        The inherited session is dropped without being closed: its sockets still belong
+        to the parent process, and closing them here would cut the parent's connections.
+        """
+        self.session = self._new_session()
 
-    def get_weather(self, location_name: str):
+    def _resolve_coordinates(self, location_name: str) -> Tuple[float, float]:
         """
-        Fetches weather data for a given location.
+        Resolves a location name to coordinates through the geocode cache.
 
         Args:
             location_name (str): The name of the location (e.g., city name).
 
         Returns:
-            Dict[str, Any]: A dictionary containing weather data for the location.
+            Tuple[float, float]: The (latitude, longitude) pair.
 
         Raises:
-            ValueError: If the API request fails or the location is not found.
+            ValueError: If the location cannot be geocoded.
         """
-        self.logger.info("Fetching weather data for location: %s", location_name)
+        latlong = get_lat_long(location_name)
+        if not latlong:
+            self.logger.error("Location '%s' could not be geocoded", location_name)
+            raise ValueError(f"Location '{location_name}' not found")
+        return latlong
+
+    def _fetch(self, endpoint: str, url: str, latitude: float, longitude: float, params: Dict[str, Any],
+               parse: Callable[[Dict[str, Any]], Any]) -> Any:
+        """
+        Fetches a weather API document for a coordinate through the response cache.
+
+        Documents are parsed before they are cached, so the cache holds compact
+        result objects rather than full JSON documents.
+
+        Args:
+            endpoint (str): The name of the weather endpoint, used for the TTL and cache key.
+            url (str): The URL of the weather endpoint.
+            latitude (float): The latitude of the location.
+            longitude (float): The longitude of the location.
+            params (Dict[str, Any]): The request params, without coordinates or the API key.
+            parse (Callable[[Dict[str, Any]], Any]): Turns the JSON document into a result object.
 
+        Returns:
+            Any: The parsed result.
+
+        Raises:
+            KeyError: If the document is missing a required field.
+            CircuitOpenError: If the endpoint's circuit is open and nothing is cached.
+            RateLimitExceeded: If the weather API quota leaves no request slot in time.
+            requests.exceptions.RequestException: If the API request fails.
+        """
+        key, fetch = self._request(endpoint, url, latitude, longitude, params, parse)
         try:
-            url  = "https://api.openweathermap.org/data/3.0/onecall/overview?"
-            # Construct the API request URL
-            latlong = get_lat_long(location_name)
-            params = {
-                "lat": latlong[0],
-                "lon": latlong[1],
-                "appid": self.api_key,
-                "units": "imperial",  # Use "imperial" for Fahrenheit
-            }
-            response = requests.get(url, params=params)
+            return self.cache.get_or_fetch(endpoint, key, fetch)
+        except CircuitOpenError:
+            # The upstream is down: any cached value, however old, beats an error
+            value = self.cache.last_known(key)
+            if value is None:
+                raise
+            self.logger.warning("Serving expired cache entry '%s' while '%s' is unavailable", key, endpoint)
+            return value
+
+    def _request(self, endpoint: str, url: str, latitude: float, longitude: float, params: Dict[str, Any],
+                 parse: Callable[[Dict[str, Any]], Any],
+                 on_attempt: Optional[Callable[[], None]] = None) -> Tuple[str, Callable[[], Any]]:
+        """
+        Builds the cache key and the upstream fetch for a weather API request.
+
+        Nearby coordinates share the cache's grid cell, and the fetch asks for the
+        weather at the cell's center. The fetch goes through the endpoint's circuit breaker, and transient failures
+        (connection errors, 429 and 5xx responses) are retried with jittered backoff.
+
+        Returns:
+            Tuple[str, Callable[[], Any]]: The cache key and a function that fetches and parses the document.
+        """
+        key, (latitude, longitude) = self.cache.key_for(endpoint, latitude, longitude, params)
+        params = {"lat": latitude, "lon": longitude, **params}
+        breaker = get_circuit_breaker(endpoint)
+
+        def attempt():
+            self.rate_limiter.acquire("owm")
+            if on_attempt is not None:
+                on_attempt()
+            response = self.session.get(url, params={**params, "appid": self.api_key}, timeout=self.timeout)
             response.raise_for_status()  # Raise an HTTPError for bad responses
+            return response.json()
 
-            # Parse and return the weather data
-            
-            weather_data = response.json()
-            self.logger.info("Weather data for %s fetched", location_name)
-            return f"Location: {location_name} \n Date: {weather_data['date']} \n Overview: {weather_data['weather_overview']}"
+        def fetch():
+            document = breaker.call(lambda: call_with_retries(attempt, _is_retryable), _is_upstream_failure)
+            return parse(document)
 
-        except requests.exceptions.RequestException as e:
-            self.logger.error("Failed to fetch weather data for %s: %s", location_name, str(e))
-            raise ValueError(f"Error fetching weather data for location '{location_name}': {str(e)}")
+        return key, fetch
 
-        except KeyError as e:
-            self.logger.error("Unexpected response structure: %s", str(e))
-            raise ValueError("Unexpected response structure from weather API")
-        
-    def get_daily_forecast(self, location_name: str):
+    def refresh_in_background(self, endpoint: str, url: str, latitude: float, longitude: float,
+                              params: Dict[str, Any], parse: Callable[[Dict[str, Any]], Any]) -> None:
+        """
+        Refreshes a cached weather API document on the cache's background thread, through this client's session.
+
+        Args:
+            endpoint (str): The name of the weather endpoint, used for the cache key.
+            url (str): The URL of the weather endpoint.
+            latitude (float): The latitude of the location.
+            longitude (float): The longitude of the location.
+            params (Dict[str, Any]): The request params, without coordinates or the API key.
+            parse (Callable[[Dict[str, Any]], Any]): Turns the JSON document into a result object.
+        """
+        key, fetch = self._request(endpoint, url, latitude, longitude, params, parse)
+        self.cache.refresh_in_background(key, fetch)
+
+    def get_onecall(self, location_name: str) -> OneCallSnapshot:
+        """
+        Fetches the OneCall snapshot for a location.
+
+        One document (current, hourly, daily and alerts) is fetched and cached per
+        coordinate; every view below is derived from it, so showing several views
+        of a location costs a single upstream call.
+
+        Args:
+            location_name (str): The name of the location (e.g., city name).
+
+        Returns:
+            OneCallSnapshot: The parsed OneCall document.
+
+        Raises:
+            ValueError: If the location is not found.
+            requests.exceptions.RequestException: If the API request fails.
         """
-        Fetches weather data for a given location.
+        return self.get_onecall_at(*self._resolve_coordinates(location_name))
+
+    def get_onecall_at(self, latitude: float, longitude: float) -> OneCallSnapshot:
+        """
+        Fetches the OneCall snapshot for a coordinate.
+
+        Args:
+            latitude (float): The latitude of the location.
+            longitude (float): The longitude of the location.
+
+        Returns:
+            OneCallSnapshot: The parsed OneCall document.
+
+        Raises:
+            requests.exceptions.RequestException: If the API request fails.
+        """
+        return self._fetch("onecall", ONECALL_URL, latitude, longitude, ONECALL_PARAMS, parse_onecall)
+
+    def prefetch_onecall(self, location_name: str, lead_seconds: float,
+                         on_attempt: Optional[Callable[[], None]] = None) -> bool:
+        """
+        Refreshes a location's cached OneCall snapshot if it expires within lead_seconds.
 
         Args:
             location_name (str): The name of the location (e.g., city name).
+            lead_seconds (float): How long before expiry an entry is refreshed.
+            on_attempt (Optional[Callable[[], None]]): Called before every upstream request,
+                retries included, e.g. to charge a budget.
 
         Returns:
-            Dict[str, Any]: A dictionary containing weather data for the location.
+            bool: True if the weather API was called, False if the cached snapshot was fresh enough.
+
+        Raises:
+            ValueError: If the location is not found.
+            requests.exceptions.RequestException: If the API request fails.
+        """
+        latitude, longitude = self._resolve_coordinates(location_name)
+        key, fetch = self._request("onecall", ONECALL_URL, latitude, longitude, ONECALL_PARAMS, parse_onecall,
+                                   on_attempt=on_attempt)
+        remaining = self.cache.time_to_expiry("onecall", key)
+        if remaining is not None and remaining > lead_seconds:
+            return False
+        self.cache.refresh(key, fetch)
+        return True
+
+    def _get_view(self, location_name: str, render: Callable[[OneCallSnapshot], Any],
+                  coordinates: Optional[Tuple[float, float]] = None) -> Any:
+        """
+        Renders one view of a location's OneCall snapshot.
+
+        Args:
+            location_name (str): The name of the location (e.g., city name).
+            render (Callable[[OneCallSnapshot], Any]): Builds the view from the OneCall snapshot.
+            coordinates (Optional[Tuple[float, float]]): Known coordinates, which skip geocoding location_name.
+
+        Returns:
+            Any: The rendered view.
 
         Raises:
             ValueError: If the API request fails or the location is not found.
@@ -96,86 +435,125 @@ class WeatherClient:
         self.logger.info("Fetching weather data for location: %s", location_name)
 
         try:
-            url  = "https://api.openweathermap.org/data/3.0/onecall?"
-            # Construct the API request URL
-            latlong = get_lat_long(location_name)
-            params = {
-                "lat": latlong[0],
-                "lon": latlong[1],
-                "appid": self.api_key,
-                "exclude": "current,minutely,hourly",
-                "units": "imperial",  # Use "imperial" for Fahrenheit
-            }
-            response = requests.get(url, params=params)
-            response.raise_for_status()  # Raise an HTTPError for bad responses
-
-            # Parse and return the weather data
-            
-            weather_data = response.json()
+            snapshot = self.get_onecall_at(*coordinates) if coordinates else self.get_onecall(location_name)
             self.logger.info("Weather data for %s fetched", location_name)
-            return f"Location: {location_name} \n High: {weather_data['daily'][0]['temp']['max']}F \n Low: {weather_data['daily'][0]['temp']['min']}F \n Humidity: {weather_data['daily'][0]['humidity']}% \n Weather: {weather_data['daily'][0]['weather'][0]['description']} \n Alerts: {weather_data['alerts'][0]['description']}"
+            return render(snapshot)
 
         except requests.exceptions.RequestException as e:
             self.logger.error("Failed to fetch weather data for %s: %s", location_name, str(e))
             raise ValueError(f"Error fetching weather data for location '{location_name}': {str(e)}")
 
-        except KeyError as e:
+        except (KeyError, IndexError) as e:
             self.logger.error("Unexpected response structure: %s", str(e))
             raise ValueError("Unexpected response structure from weather API")
-        
-    
-    def get_hourly_forecast(self, location_name: str):
+
+    def get_weather(self, location_name: str) -> CurrentConditions:
         """
-        Fetches weather data for a given location.
+        Fetches the weather overview for a given location.
 
         Args:
             location_name (str): The name of the location (e.g., city name).
 
         Returns:
-            Dict[str, Any]: A dictionary containing weather data for the location.
+            CurrentConditions: The current conditions and a summary of today's weather.
 
         Raises:
             ValueError: If the API request fails or the location is not found.
         """
-        self.logger.info("Fetching weather data for location: %s", location_name)
+        return self._get_view(location_name, lambda snapshot: snapshot.current)
 
-        try:
-            url  = "https://api.openweathermap.org/data/3.0/onecall?"
-            # Construct the API request URL
-            latlong = get_lat_long(location_name)
-            params = {
-                "lat": latlong[0],
-                "lon": latlong[1],
-                "appid": self.api_key,
-                "exclude": "current,minutely,daily",
-                "units": "imperial",  # Use "imperial" for Fahrenheit
-            }
-            response = requests.get(url, params=params)
-            response.raise_for_status()  # Raise an HTTPError for bad responses
+    def get_weather_at(self, latitude: float, longitude: float) -> CurrentConditions:
+        """
+        Fetches the weather overview for a coordinate.
 
-            # Parse and return the weather data
-            
-            weather_data = response.json()
-            self.logger.info("Weather data for %s fetched", location_name)
-            return f"Location: {location_name} \n High: {weather_data['hourly'][0]['temp']['max']}F \n Low: {weather_data['hourly'][0]['temp']['min']}F \n Humidity: {weather_data['hourly'][0]['humidity']}% \n Weather: {weather_data['hourly'][0]['weather'][0]['description']} \n Alerts: {weather_data['alerts'][0]['description']}"
+        Args:
+            latitude (float): The latitude of the location.
+            longitude (float): The longitude of the location.
 
-        except requests.exceptions.RequestException as e:
-            self.logger.error("Failed to fetch weather data for %s: %s", location_name, str(e))
-            raise ValueError(f"Error fetching weather data for location '{location_name}': {str(e)}")
+        Returns:
+            CurrentConditions: The current conditions and a summary of today's weather.
 
-        except KeyError as e:
-            self.logger.error("Unexpected response structure: %s", str(e))
-            raise ValueError("Unexpected response structure from weather API")
+        Raises:
+            ValueError: If the API request fails.
+        """
+        return self._get_view(f"{latitude},{longitude}", lambda snapshot: snapshot.current,
+                              coordinates=(latitude, longitude))
+
+    def get_daily_forecast(self, location_name: str) -> DailyForecast:
+        """
+        Fetches today's forecast for a given location.
+
+        Args:
+            location_name (str): The name of the location (e.g., city name).
+
+        Returns:
+            DailyForecast: Today's high, low, humidity, conditions and alerts.
+
+        Raises:
+            ValueError: If the API request fails or the location is not found.
+        """
+        return self._get_view(location_name, lambda snapshot: snapshot.daily[0])
+
+    def get_hourly_forecast(self, location_name: str) -> HourlyForecast:
+        """
+        Fetches the forecast for the current hour at a given location.
+
+        Args:
+            location_name (str): The name of the location (e.g., city name).
+
+        Returns:
+            HourlyForecast: The hour's temperature, humidity, conditions and alerts.
+
+        Raises:
+            ValueError: If the API request fails or the location is not found.
+        """
+        return self._get_view(location_name, lambda snapshot: snapshot.hourly[0])
+
+    def get_alerts(self, location_name: str) -> List[str]:
+        """
+        Fetches the active weather alerts for a given location.
+
+        Args:
+            location_name (str): The name of the location (e.g., city name).
+
+        Returns:
+            List[str]: The description of every active alert, which may be empty.
+
+        Raises:
+            ValueError: If the API request fails or the location is not found.
+        """
+        return self._get_view(location_name, lambda snapshot: list(snapshot.alerts))
+
+    def get_dashboard(self, location_name: str) -> Dict[str, Any]:
+        """
+        Fetches the overview, daily, hourly and alerts views for a location from one OneCall document.
+
+        Args:
+            location_name (str): The name of the location (e.g., city name).
+
+        Returns:
+            Dict[str, Any]: The four views keyed by name.
+
+        Raises:
+            ValueError: If the API request fails or the location is not found.
+        """
+        return self._get_view(location_name, lambda snapshot: {
+            'overview': snapshot.current,
+            'daily': snapshot.daily[0],
+            'hourly': snapshot.hourly[0],
+            'alerts': list(snapshot.alerts),
+        })
         
-    def get_date_forecast(self, location_name: str, date: str):
+    def get_date_forecast(self, location_name: str, date: str) -> DaySummary:
         """
-        Fetches weather data for a given location.
+        Fetches the weather summary for a given location and date.
 
         Args:
             location_name (str): The name of the location (e.g., city name).
+            date (str): The date in YYYY-MM-DD format.
 
         Returns:
-            Dict[str, Any]: A dictionary containing weather data for the location.
+            DaySummary: The high, low, precipitation and humidity for the date.
 
         Raises:
             ValueError: If the API request fails or the location is not found.
@@ -183,24 +561,14 @@ class WeatherClient:
         self.logger.info("Fetching weather data for location: %s", location_name)
 
         try:
-            url  = "https://api.openweathermap.org/data/3.0/onecall/day_summary?"
-            # Construct the API request URL
-            latlong = get_lat_long(location_name)
+            latitude, longitude = self._resolve_coordinates(location_name)
             params = {
-                "lat": latlong[0],
-                "lon": latlong[1],
-                "appid": self.api_key,
                 "date": date,
                 "units": "imperial",  # Use "imperial" for Fahrenheit
             }
-            response = requests.get(url, params=params)
-            response.raise_for_status()  # Raise an HTTPError for bad responses
-
-            # Parse and return the weather data
-            
-            weather_data = response.json()
+            summary = self._fetch("day_summary", DAY_SUMMARY_URL, latitude, longitude, params, parse_day_summary)
             self.logger.info("Weather data for %s fetched", location_name)
-            return f"Location: {location_name} \n Date: {weather_data['date']} (YYYY-MM-DD) \n High: {weather_data['temperature']['max']}F \n Low: {weather_data['temperature']['min']}F \n Precipitation: {weather_data['precipitation']['total']} inches \n Humidity: {weather_data['humidity']['afternoon']}%"
+            return summary
 
         except requests.exceptions.RequestException as e:
             self.logger.error("Failed to fetch weather data for %s: %s", location_name, str(e))
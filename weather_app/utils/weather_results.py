@@ -0,0 +1,297 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import json
+from typing import Any, Dict, Tuple
+
+from flask.json.provider import DefaultJSONProvider
+
+
+class _FrozenSlots:
+    """
+    Pickle support for frozen dataclasses with explicit __slots__.
+
+    Without a __dict__, unpickling restores fields with setattr, which a frozen
+    dataclass refuses; these restore them with object.__setattr__ instead.
+    """
+    __slots__ = ()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+
+class WeatherResult(_FrozenSlots):
+    """
+    Base class for weather results, with a fast serialization path.
+
+    Results are frozen dataclasses with explicit __slots__, so caches can hold
+    them compactly; WeatherJSONProvider serializes them through to_dict.
+    """
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the result's fields as a dictionary, without the deep copy done by dataclasses.asdict.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_json(self) -> str:
+        """
+        Returns the result serialized as a JSON string.
+        """
+        return json.dumps(self.to_dict())
+
+
+@dataclass(frozen=True)
+class CurrentConditions(WeatherResult):
+    """
+    The current conditions at a location, with a summary of today's weather.
+    """
+    __slots__ = ('date', 'temperature', 'feels_like', 'humidity', 'description', 'summary')
+    date: str
+    temperature: float
+    feels_like: float
+    humidity: int
+    description: str
+    summary: str
+
+
+@dataclass(frozen=True)
+class DailyForecast(WeatherResult):
+    """
+    The forecast for one day at a location.
+    """
+    __slots__ = ('date', 'high', 'low', 'humidity', 'description', 'summary', 'alerts')
+    date: str
+    high: float
+    low: float
+    humidity: int
+    description: str
+    summary: str
+    alerts: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class HourlyForecast(WeatherResult):
+    """
+    The forecast for one hour at a location.
+    """
+    __slots__ = ('time', 'temperature', 'feels_like', 'humidity', 'description', 'alerts')
+    time: str
+    temperature: float
+    feels_like: float
+    humidity: int
+    description: str
+    alerts: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class DaySummary(WeatherResult):
+    """
+    The aggregated weather for one date at a location.
+    """
+    __slots__ = ('date', 'high', 'low', 'precipitation', 'humidity')
+    date: str
+    high: float
+    low: float
+    precipitation: float
+    humidity: float
+
+
+@dataclass(frozen=True)
+class OneCallSnapshot(_FrozenSlots):
+    """
+    The parts of a OneCall document that the app uses; this is what the response cache stores.
+    """
+    __slots__ = ('current', 'hourly', 'daily', 'alerts')
+    current: CurrentConditions
+    hourly: Tuple[HourlyForecast, ...]
+    daily: Tuple[DailyForecast, ...]
+    alerts: Tuple[str, ...]
+
+
+_RESULT_TYPES = {cls.__name__: cls for cls in
+                 (CurrentConditions, DailyForecast, HourlyForecast, DaySummary, OneCallSnapshot)}
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, _FrozenSlots):
+        return {'__result__': type(value).__name__,
+                **{name: _encode(getattr(value, name)) for name in value.__slots__}}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {name: _encode(item) for name, item in value.items()}
+    return value
+
+
+def _decode(value: Any, in_result: bool = False) -> Any:
+    if isinstance(value, dict):
+        if '__result__' not in value:
+            return {name: _decode(item, in_result) for name, item in value.items()}
+        cls = _RESULT_TYPES.get(value['__result__'])
+        if cls is None:
+            raise ValueError(f"Unknown weather result type '{value['__result__']}'")
+        return cls(**{name: _decode(item, True) for name, item in value.items() if name != '__result__'})
+    if isinstance(value, list):
+        items = [_decode(item, in_result) for item in value]
+        return tuple(items) if in_result else items  # Result fields are tuples
+    return value
+
+
+def to_cache_json(value: Any) -> str:
+    """
+    Serializes a cached value (a weather result, or plain data) as JSON that records the result types.
+
+    Args:
+        value (Any): The value to serialize.
+
+    Returns:
+        str: The JSON document.
+    """
+    return json.dumps(_encode(value), separators=(',', ':'))
+
+
+def from_cache_json(document: str) -> Any:
+    """
+    Rebuilds a cached value serialized by to_cache_json.
+
+    Only the weather result types can be rebuilt, so reading a cache entry never runs
+    anything but plain constructors.
+
+    Args:
+        document (str): The JSON document.
+
+    Returns:
+        Any: The value, with weather results rebuilt.
+
+    Raises:
+        ValueError: If the document is not valid JSON or names an unknown result type.
+    """
+    return _decode(json.loads(document))
+
+
+class WeatherJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that serializes weather results through to_dict.
+
+    The default provider turns dataclasses into dictionaries with dataclasses.asdict,
+    which deep-copies every field of every result on each response.
+    """
+
+    @staticmethod
+    def default(o: Any) -> Any:
+        if isinstance(o, WeatherResult):
+            return o.to_dict()
+        if isinstance(o, _FrozenSlots):
+            return o.__getstate__()
+        return DefaultJSONProvider.default(o)
+
+
+def _local_time(timestamp: int, offset_seconds: int, fmt: str) -> str:
+    # OneCall timestamps are UTC; timezone_offset shifts them to the location's local time
+    return datetime.fromtimestamp(timestamp, timezone(timedelta(seconds=offset_seconds))).strftime(fmt)
+
+
+def parse_onecall(weather_data: Dict[str, Any]) -> OneCallSnapshot:
+    """
+    Parses a OneCall document into a OneCallSnapshot.
+
+    Args:
+        weather_data (Dict[str, Any]): The OneCall document.
+
+    Returns:
+        OneCallSnapshot: The parsed snapshot.
+
+    Raises:
+        KeyError: If the document is missing a required field.
+        IndexError: If the document has no daily forecast.
+    """
+    offset = weather_data.get('timezone_offset', 0)
+    alerts = tuple(alert['description'] for alert in weather_data.get('alerts') or [])
+    daily = tuple(
+        DailyForecast(
+            date=_local_time(day['dt'], offset, "%Y-%m-%d"),
+            high=day['temp']['max'],
+            low=day['temp']['min'],
+            humidity=day['humidity'],
+            description=day['weather'][0]['description'],
+            summary=day.get('summary') or day['weather'][0]['description'],
+            alerts=alerts,
+        )
+        for day in weather_data['daily']
+    )
+    hourly = tuple(
+        HourlyForecast(
+            time=_local_time(hour['dt'], offset, "%Y-%m-%dT%H:%M"),
+            temperature=hour['temp'],
+            feels_like=hour['feels_like'],
+            humidity=hour['humidity'],
+            description=hour['weather'][0]['description'],
+            alerts=alerts,
+        )
+        for hour in weather_data.get('hourly') or []
+    )
+    current_data = weather_data['current']
+    current = CurrentConditions(
+        date=_local_time(current_data['dt'], offset, "%Y-%m-%d"),
+        temperature=current_data['temp'],
+        feels_like=current_data['feels_like'],
+        humidity=current_data['humidity'],
+        description=current_data['weather'][0]['description'],
+        summary=daily[0].summary,
+    )
+    return OneCallSnapshot(current=current, hourly=hourly, daily=daily, alerts=alerts)
+
+
+def parse_day_summary(weather_data: Dict[str, Any]) -> DaySummary:
+    """
+    Parses a day_summary document into a DaySummary.
+
+    Args:
+        weather_data (Dict[str, Any]): The day_summary document.
+
+    Returns:
+        DaySummary: The parsed summary.
+
+    Raises:
+        KeyError: If the document is missing a required field.
+    """
+    return DaySummary(
+        date=weather_data['date'],
+        high=weather_data['temperature']['max'],
+        low=weather_data['temperature']['min'],
+        precipitation=weather_data['precipitation']['total'],
+        humidity=weather_data['humidity']['afternoon'],
+    )
+
+
+def _first_alert(result: Any) -> str:
+    return result.alerts[0] if result.alerts else "None"
+
+
+def format_text(location_name: str, result: Any) -> Any:
+    """
+    Renders a weather result as the human-readable text the API used to return.
+
+    Args:
+        location_name (str): The name of the location the result is for.
+        result (Any): A weather result, a list of alerts, or a dictionary of either.
+
+    Returns:
+        Any: The rendered text, or the same container with every result rendered.
+    """
+    if isinstance(result, dict):
+        return {name: format_text(location_name, value) for name, value in result.items()}
+    if isinstance(result, CurrentConditions):
+        return f"Location: {location_name} \n Date: {result.date} \n Overview: {result.summary}"
+    if isinstance(result, DailyForecast):
+        return f"Location: {location_name} \n High: {result.high}F \n Low: {result.low}F \n Humidity: {result.humidity}% \n Weather: {result.description} \n Alerts: {_first_alert(result)}"
+    if isinstance(result, HourlyForecast):
+        return f"Location: {location_name} \n Temperature: {result.temperature}F \n Feels Like: {result.feels_like}F \n Humidity: {result.humidity}% \n Weather: {result.description} \n Alerts: {_first_alert(result)}"
+    if isinstance(result, DaySummary):
+        return f"Location: {location_name} \n Date: {result.date} (YYYY-MM-DD) \n High: {result.high}F \n Low: {result.low}F \n Precipitation: {result.precipitation} inches \n Humidity: {result.humidity}%"
+    return result
@@ -0,0 +1,8 @@
+"""
+Production entry point: gunicorn --config gunicorn.conf.py wsgi:app
+
+APP_CONFIG selects the config (production by default). Create the schema first with `flask --app wsgi db-init`.
+"""
+from app import create_app
+
+app = create_app()